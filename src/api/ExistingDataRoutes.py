@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from controllers.ExistingDataController import ExistingDataController
 from models.api.CreateSingleSimReq import CreateSingleSimReq
@@ -14,3 +14,7 @@ async def get_single_sim_data(req: CreateSingleSimReq) -> JSONResponse:
 @router.get("/data/single_sim/get_formatted")
 async def get_single_sim_data_formatted(req: CreateSingleSimReq) -> JSONResponse:
   return await controller.get_sim_data_formatted(req)
+
+@router.get("/data/single_sim/export/{request_hash}")
+def export_single_sim_data(request_hash: str, file_format: str = "parquet") -> StreamingResponse:
+  return controller.export_sim_data(request_hash, file_format)
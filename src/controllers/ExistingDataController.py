@@ -1,20 +1,27 @@
-from fastapi.responses import JSONResponse
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from models.api.CreateSingleSimReq import CreateSingleSimReq
-from services.DatabaseHandler import DatabaseHandler
+from services.ResultExporter import ResultExporter
+from services.ResultStore import ResultStore
 from services.SimDataTransformer import SimDataTransformer
 
+EXPORT_MEDIA_TYPES = {
+  "parquet": "application/vnd.apache.parquet",
+  "arrow": "application/vnd.apache.arrow.file"
+}
+
 
 class ExistingDataController():
-  __database_handler: DatabaseHandler
+  __result_store: ResultStore | None
   __simulation_data_transformer: SimDataTransformer
 
   def __init__(self):
-    self.__database_handler = DatabaseHandler()
+    self.__result_store = None
     self.__simulation_data_transformer = SimDataTransformer()
 
   async def get_sim_data(self, req: CreateSingleSimReq):
-    results = self.__database_handler.get_all_sim_results(req)
+    results = await self.__get_result_store().get_all_sim_results_async(req)
     if results is None:
       return JSONResponse(status_code=200, content=None)
     return JSONResponse(status_code=200, content=results.model_dump())
@@ -22,7 +29,7 @@ class ExistingDataController():
   async def get_sim_data_formatted(self, req: CreateSingleSimReq):
     hours_per_day = req.time.hours_per_day
     days_per_week = req.time.days_per_week
-    results = self.__database_handler.get_all_sim_results(req)
+    results = await self.__get_result_store().get_all_sim_results_async(req)
     if results is None:
       return JSONResponse(status_code=200, content=None)
     results_formatted = self.__simulation_data_transformer.format_multi_sim_results(
@@ -31,3 +38,23 @@ class ExistingDataController():
       days_per_week
     )
     return JSONResponse(status_code=200, content=results_formatted.model_dump())
+
+  def export_sim_data(self, request_hash: str, file_format: str):
+    result_exporter = ResultExporter(self.__get_result_store())
+    try:
+      chunks = result_exporter.iter_export(request_hash, file_format)
+    except ValueError as e:
+      raise HTTPException(status_code=400, detail=str(e)) from e
+    except RuntimeError as e:
+      raise HTTPException(status_code=501, detail=str(e)) from e
+    return StreamingResponse(
+      chunks,
+      media_type=EXPORT_MEDIA_TYPES[file_format],
+      headers={"Content-Disposition": f'attachment; filename="{request_hash}.{file_format}"'}
+    )
+
+  # Built on first use, since the controller is created before the .env gets loaded
+  def __get_result_store(self) -> ResultStore:
+    if self.__result_store is None:
+      self.__result_store = ResultStore.from_env()
+    return self.__result_store
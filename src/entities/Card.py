@@ -2,6 +2,8 @@ from models.enums.Face import Face
 from models.enums.Suit import Suit
 
 
+# Never changes once built, so one Card per suit and face can be shared by every shoe and hand. An ace's value
+# is always 11 here; a Hand keeps track of which of its aces it counts as 1.
 class Card:
   __suit: Suit
   __face: Face
@@ -31,11 +33,13 @@ class Card:
   def get_value(self) -> int:
     return self.__value
 
-  def calculate_if_value_can_reset(self) -> bool:
-    return self.__value == 11
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, Card):
+      return NotImplemented
+    return self.__suit == other.get_suit() and self.__face == other.get_face() and self.__value == other.get_value()
 
-  def set_value(self, value: int) -> None:
-    self.__value = value
+  def __hash__(self) -> int:
+    return hash((self.__suit, self.__face))
 
   def to_dict(self) -> dict:
     return {
@@ -1,9 +1,10 @@
-from entities.Card import Card, Face, Suit
+from entities.Card import Card
 from entities.Player import Player
 from entities.Shoe import Shoe
 from models.core.player_info.PlayerInfo import PlayerInfo
 from models.core.rules.DealerRules import DealerRules
 from models.enums.PlayerDecision import PlayerDecision
+from services.SimRandom import SimRandom
 
 
 class Dealer(Player):
@@ -11,11 +12,11 @@ class Dealer(Player):
   __blackjack_pays_multiplier: float
   __shoe: Shoe
 
-  def __init__(self, rules: DealerRules):
+  def __init__(self, rules: DealerRules, sim_random: SimRandom | None = None):
     super().__init__(PlayerInfo(bankroll=4000000000.0))
     self.__hits_soft_seventeen = rules.dealer_hits_soft_seventeen
     self.__blackjack_pays_multiplier = rules.blackjack_pays_multiplier
-    self.__shoe = Shoe(rules.deck_count, rules.shoe_reset_percentage)
+    self.__shoe = Shoe(rules.deck_count, rules.shoe_reset_percentage, sim_random)
     self.load_shoe()
     self.shuffle_shoe()
 
@@ -65,15 +66,8 @@ class Dealer(Player):
     self.__shoe.shuffle()
 
   def load_shoe(self) -> None:
-    shoe_deck_count = self.__shoe.get_deck_count()
-    shoe_full_size = self.__shoe.get_full_size()
-    self.__shoe.set_cards([])
-    for _ in range(shoe_deck_count):
-      for suit in Suit:
-        for face in Face:
-          card = Card(suit, face)
-          self.__shoe.add_card(card)
-    assert self.__shoe.get_card_count() == shoe_full_size
+    self.__shoe.load()
+    assert self.__shoe.get_card_count() == self.__shoe.get_full_size()
 
   def to_dict(self) -> dict:
     if self.get_hand_count() == 1:
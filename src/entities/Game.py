@@ -1,5 +1,5 @@
 import asyncio
-from typing import List
+from typing import Dict, List
 
 from entities.Card import Card
 from entities.Dealer import Dealer
@@ -10,12 +10,12 @@ from entities.Players.HumanPlayer import HumanPlayer
 from models.core.player_info.AiPlayerInfo import AiPlayerInfo
 from models.core.player_info.HumanPlayerInfo import HumanPlayerInfo
 from models.core.rules.GameRules import GameRules
-from models.enums.Face import Face
 from models.enums.GameState import GameState
 from models.enums.HandResult import HandResult
 from models.enums.PlayerDecision import PlayerDecision
 from services.BlackjackLogger import BlackjackLogger
 from services.RulesEngine import RulesEngine
+from services.SimRandom import SimRandom
 
 
 class Game:
@@ -24,22 +24,34 @@ class Game:
   __dealer: Dealer
   __human_players: List[HumanPlayer]
   __ai_players: List[AiPlayer]
+  # Every seat in playing order (humans, then AIs) and the same players by ID, kept up to date as players join
+  __players: List[Player]
+  __players_by_id: Dict[str, Player]
+  # Seats before this one have no hands left to play this round
+  __active_seat: int
+  # Hands from finished rounds, handed out again by __new_hand instead of building new ones every round
+  __hand_pool: List[Hand]
+  __sim_random: SimRandom
 
   def __init__(
     self,
     rules: GameRules,
-    ai_player_info: List[AiPlayerInfo] | None
+    ai_player_info: List[AiPlayerInfo] | None,
+    sim_random: SimRandom | None = None
   ):
+    self.__sim_random = sim_random or SimRandom()
     self.__rules_engine = RulesEngine(rules)
     self.__state = GameState.NOT_STARTED
-    self.__dealer = Dealer(rules.dealer_rules)
+    self.__dealer = Dealer(rules.dealer_rules, self.__sim_random)
 
     self.__human_players = []
     self.__ai_players = []
+    self.__hand_pool = []
     if ai_player_info is not None:
       for single_ai_player_info in ai_player_info:
-        ai_player = AiPlayer(single_ai_player_info, self.__rules_engine)
+        ai_player = AiPlayer(single_ai_player_info, self.__rules_engine, self.__sim_random)
         self.__ai_players.append(ai_player)
+    self.__update_seats()
 
   async def monitor_human_states(self) -> None:
     while self.get_state() != GameState.NOT_STARTED:
@@ -93,16 +105,16 @@ class Game:
     return False
 
   def someone_has_bankroll(self) -> bool:
-    for player in self.__human_players + self.__ai_players:
+    for player in self.__players:
       if player.get_bankroll() > 0:
         return True
     return False
 
   def get_player(self, player_id: str) -> Player:
-    for player in self.__human_players + self.__ai_players:
-      if player.get_id() == player_id:
-        return player
-    raise ValueError("Given an ID that matches no existing player")
+    player = self.__players_by_id.get(str(player_id))
+    if player is None:
+      raise ValueError("Given an ID that matches no existing player")
+    return player
 
   def get_dealer(self) -> Dealer:
     return self.__dealer
@@ -114,29 +126,34 @@ class Game:
     state = self.get_state()
     dealer = self.get_dealer()
     if state == GameState.BETTING:
-      for player in self.__human_players + self.__ai_players:
+      for player in self.__players:
         if player.get_hand_count() == 0:
           return player
       raise RuntimeError(f"State is {state} but no Player is active...")
     if state == GameState.INSURANCE:
-      for player in self.__human_players + self.__ai_players:
+      for player in self.__players:
         if player.get_hand(0).is_insured() is None:
           return player
       raise RuntimeError(f"State is {state} but no Player is active...")
     if state == GameState.EARLY_SURRENDER or state == GameState.LATE_SURRENDER:
-      for player in self.__human_players + self.__ai_players:
+      for player in self.__players:
         if player.get_hand(0).is_surrendered() is None:
           return player
       raise RuntimeError(f"State is {state} but no Player is active...")
     if state == GameState.HUMAN_PLAYER_DECISIONS:
-      for human_player in self.__human_players:
-        if human_player.has_active_hand():
-          return human_player
+      active_player = self.__calculate_active_seat_player()
+      if isinstance(active_player, HumanPlayer):
+        return active_player
       raise RuntimeError(f"State is {state} but no Human Player is active...")
     if state == GameState.AI_PLAYER_DECISIONS:
-      for ai_player in self.__ai_players:
-        if ai_player.has_active_hand():
-          return ai_player
+      active_player = self.__calculate_active_seat_player()
+      if isinstance(active_player, HumanPlayer):
+        # A human left hands unplayed, so the AI seats after them have to be searched
+        for ai_player in self.__ai_players:
+          if ai_player.has_active_hand():
+            return ai_player
+      elif active_player is not None:
+        return active_player
       raise RuntimeError(f"State is {state} but no AI Player is active...")
     if state == GameState.DEALER_DECISIONS:
       return dealer
@@ -149,95 +166,74 @@ class Game:
     return self.__ai_players
 
   def get_human_and_ai_players(self) -> List[HumanPlayer | AiPlayer]:
-    return self.__human_players + self.__ai_players
+    return self.__players
 
   def register_human_player(self, human_player_info: HumanPlayerInfo) -> str:
     self.__human_players.append(HumanPlayer(human_player_info))
+    self.__update_seats()
     player_id = self.__human_players[-1].get_id()
     return player_id
 
   def reset_game(self) -> None:
     self.set_state(GameState.NOT_STARTED)
-    for player in self.__human_players + self.__ai_players + [self.__dealer]:
+    for player in self.__players + [self.__dealer]:
       player.reset_bankroll()
 
+  # Puts every random draw from here on onto seed's stream, starting from a freshly shuffled shoe, so a sim played
+  # after this depends on nothing but its seed
+  def reseed(self, seed: int | None = None) -> None:
+    self.__sim_random.reseed(seed)
+    self.__dealer.load_shoe()
+    self.__dealer.shuffle_shoe()
+    for ai_player in self.__ai_players:
+      ai_player.reset_running_count()
+
+  def get_sim_random(self) -> SimRandom:
+    return self.__sim_random
+
   def start_game(self) -> None:
     if len(self.__human_players) > 0:
       asyncio.create_task(self.monitor_human_states())
     self.__to_next_state()
 
   def place_human_player_bet(self, player_id: str, bet: float) -> None:
-    for human_player in self.__human_players:
-      if str(human_player.get_id()) == str(player_id):
-        human_player.add_new_hand(Hand([], bet, False))
-        human_player.decrement_bankroll(bet)
-        return
-    raise ValueError("player_id given does not match any existing player")
+    human_player = self.__get_human_player(player_id)
+    human_player.add_new_hand(self.__new_hand([], bet, False))
+    human_player.decrement_bankroll(bet)
 
   def set_human_player_wants_insurance(self, player_id: str, insurance: bool) -> None:
-    for human_player in self.__human_players:
-      if str(human_player.get_id()) == str(player_id):
-        if insurance:
-          self.__insure_player_hand(human_player)
-          return
-        human_player.get_hand(0).set_insured(False)
-        return
-    raise ValueError("player_id given does not match any existing player")
+    human_player = self.__get_human_player(player_id)
+    if insurance:
+      self.__insure_player_hand(human_player)
+      return
+    human_player.get_hand(0).set_insured(False)
 
   def set_human_player_wants_surrender(self, player_id: str, surrender: bool) -> None:
-    for human_player in self.__human_players:
-      if str(human_player.get_id()) == str(player_id):
-        if surrender:
-          self.__surrender_player_hand(human_player)
-          return
-        else:
-          human_player.get_hand(0).set_surrendered(False)
-          return
-    raise ValueError("player_id given does not match any existing player")
+    human_player = self.__get_human_player(player_id)
+    if surrender:
+      self.__surrender_player_hand(human_player)
+      return
+    human_player.get_hand(0).set_surrendered(False)
 
   def hit_human_player(self, player_id: str) -> None:
-    for human_player in self.__human_players:
-      if str(human_player.get_id()) == str(player_id):
-        for hand in human_player.get_hands():
-          if hand == self.__calculate_active_hand():
-            assert self.calculate_active_player() == human_player
-            assert self.__rules_engine.is_legal_play(PlayerDecision.HIT, human_player, self.get_state())
-            self.__hit_active_hand()
-            return
-    raise ValueError("The given player_id does not match the active player")
+    human_player = self.__get_active_human_player(player_id)
+    assert self.__rules_engine.is_legal_play(PlayerDecision.HIT, human_player, self.get_state())
+    self.__hit_hand(human_player.calculate_active_hand())
 
   def stand_human_player(self, player_id: str) -> None:
-    for human_player in self.__human_players:
-      if str(human_player.get_id()) == str(player_id):
-        for hand in human_player.get_hands():
-          if hand == self.__calculate_active_hand():
-            assert self.calculate_active_player() == human_player
-            assert self.__rules_engine.is_legal_play(PlayerDecision.STAND, human_player, self.get_state())
-            self.__stand_active_hand()
-            return
-    raise ValueError("The given player_id does not match the active player")
+    human_player = self.__get_active_human_player(player_id)
+    assert self.__rules_engine.is_legal_play(PlayerDecision.STAND, human_player, self.get_state())
+    self.__stand_hand(human_player.calculate_active_hand())
 
   def double_down_human_player(self, player_id: str) -> None:
-    for human_player in self.__human_players:
-      if str(human_player.get_id()) == str(player_id):
-        for hand in human_player.get_hands():
-          if hand == self.__calculate_active_hand():
-            assert self.calculate_active_player() == human_player
-            assert self.__rules_engine.is_legal_play(PlayerDecision.DOUBLE_DOWN, human_player, self.get_state())
-            self.__double_down_active_hand()
-            return
-    raise ValueError("The given player_id does not match the active player")
+    human_player = self.__get_active_human_player(player_id)
+    assert self.__rules_engine.is_legal_play(PlayerDecision.DOUBLE_DOWN, human_player, self.get_state())
+    self.__double_down_hand(human_player, human_player.calculate_active_hand())
 
   def split_human_player(self, player_id: str) -> None:
-    for human_player in self.__human_players:
-      if str(human_player.get_id()) == str(player_id):
-        for hand in human_player.get_hands():
-          if hand == self.__calculate_active_hand():
-            assert self.calculate_active_player() == human_player
-            assert self.__rules_engine.is_legal_play(PlayerDecision.SPLIT, human_player, self.get_state())
-            self.__split_active_hand()
-            return
-    raise ValueError("The given player_id does not match the active player")
+    human_player = self.__get_active_human_player(player_id)
+    assert self.__rules_engine.is_legal_play(PlayerDecision.SPLIT, human_player, self.get_state())
+    self.__split_hand(human_player, human_player.calculate_active_hand())
 
   def continue_until_state(self, state: GameState) -> None:
     while True:
@@ -251,7 +247,7 @@ class Game:
     elif self.get_state() == GameState.BETTING:
       self.continue_until_state(GameState.INSURANCE)
     elif self.get_state() == GameState.INSURANCE:
-      for player in self.__human_players + self.__ai_players:
+      for player in self.__players:
         if self.__rules_engine.can_early_surrender(player.get_hand(0)):
           self.continue_until_state(GameState.EARLY_SURRENDER)
           return
@@ -275,8 +271,42 @@ class Game:
     while self.get_state() != GameState.BETTING:
       self.__to_next_state()
 
+  # Plays a whole round at a table of only AI players, from their bets through cleanup, and returns each AI player's
+  # settled hands, which stay as they are until the next round reuses them. Same draws and payouts as stepping the
+  # states round to BETTING, but as one straight run, without the per-state logging and the active player lookups
+  # that only matter while humans are at the table.
+  # checked steps through the states instead, with all of their asserts, as the reference the straight run must match.
+  def play_round(self, checked: bool = False) -> List[List[Hand]]:
+    if len(self.__human_players) > 0:
+      raise RuntimeError("Rounds with Human Players have to be played through the states.")
+    if self.__state == GameState.NOT_STARTED:
+      self.__state = GameState.BETTING
+    elif self.__state != GameState.BETTING:
+      raise RuntimeError(f"This method should not be called in State: {self.get_state()}")
+    if checked:
+      self.continue_until_state(GameState.CLEANUP)
+      settled_hands = [ai_player.get_hands() for ai_player in self.__ai_players]
+      self.finish_round()
+      return settled_hands
+    self.__handle_ai_bets(checked=False)
+    self.__deal_cards()
+    self.__player_blackjack_check()
+    self.__handle_ai_players_insurance(checked=False)
+    if self.__is_any_early_surrender():
+      self.__handle_ai_players_early_surrender(checked=False)
+    if self.__dealer_blackjack_check() == GameState.LATE_SURRENDER:
+      self.__handle_ai_players_late_surrender(checked=False)
+      self.__handle_ai_decisions(checked=False)
+      self.__handle_dealer_decisions()
+    self.__set_results()
+    self.__handle_payouts()
+    settled_hands = [ai_player.get_hands() for ai_player in self.__ai_players]
+    # Cleanup gives everyone a new list of hands, so the settled ones are left as they are
+    self.__cleanup()
+    return settled_hands
+
   def set_state(self, state: GameState) -> None:
-    BlackjackLogger.debug(f"State: {state}")
+    BlackjackLogger.debug("State: %s", state)
     self.__state = state
 
   def to_dict(self) -> dict:
@@ -287,15 +317,34 @@ class Game:
       "state": self.__state.name,
     }
 
-  def __is_unhandled_active_player_hand(self) -> bool:
-    try:
-      self.__calculate_active_hand()
-      return True
-    except RuntimeError:
-      return False
+  def __update_seats(self) -> None:
+    self.__players = self.__human_players + self.__ai_players
+    self.__players_by_id = {player.get_id(): player for player in self.__players}
+    self.__active_seat = 0
+
+  def __get_human_player(self, player_id: str) -> HumanPlayer:
+    player = self.__players_by_id.get(str(player_id))
+    if not isinstance(player, HumanPlayer):
+      raise ValueError("player_id given does not match any existing player")
+    return player
+
+  def __get_active_human_player(self, player_id: str) -> HumanPlayer:
+    player = self.__players_by_id.get(str(player_id))
+    if not isinstance(player, HumanPlayer) or player != self.calculate_active_player():
+      raise ValueError("The given player_id does not match the active player")
+    return player
+
+  # Moves the active seat past anyone who has played out their hands, so each seat is only passed over once a round
+  def __calculate_active_seat_player(self) -> Player | None:
+    while self.__active_seat < len(self.__players):
+      player = self.__players[self.__active_seat]
+      if player.has_active_hand():
+        return player
+      self.__active_seat += 1
+    return None
 
   def __is_any_competing_hand(self) -> bool:
-    for player in self.__human_players + self.__ai_players:
+    for player in self.__players:
       for hand in player.get_hands():
         hand_value = hand.get_value()
         hand_is_blackjack = hand_value == 21 and hand.get_card_count() == 2
@@ -381,9 +430,10 @@ class Game:
     hand.set_surrendered()
     hand.set_result(HandResult.SURRENDERED)
 
-  def __update_running_counts(self, card: Card) -> None:
+  # Takes the value a card settled at in the hand it was dealt to, so an ace that drops to 1 straight away counts as 1
+  def __update_running_counts(self, card_value: int) -> None:
     for ai_player in self.__ai_players:
-      ai_player.update_running_count(card.get_value())
+      ai_player.update_running_count(card_value)
 
 ###############################
 # State-Related Private Methods
@@ -404,10 +454,9 @@ class Game:
       self.set_state(GameState.INSURANCE)
     elif self.get_state() == GameState.INSURANCE:
       self.__handle_ai_players_insurance()
-      for player in self.__human_players + self.__ai_players:
-        if self.__rules_engine.can_early_surrender(player.get_hand(0)):
-          self.set_state(GameState.EARLY_SURRENDER)
-          return
+      if self.__is_any_early_surrender():
+        self.set_state(GameState.EARLY_SURRENDER)
+        return
       self.set_state(GameState.DEALER_BLACKJACK_CHECK)
 
     elif self.get_state() == GameState.EARLY_SURRENDER:
@@ -426,6 +475,7 @@ class Game:
       self.__handle_ai_decisions()
       self.set_state(GameState.DEALER_DECISIONS)
     elif self.get_state() == GameState.DEALER_DECISIONS:
+      assert self.calculate_active_player() == self.__dealer
       self.__handle_dealer_decisions()
       self.set_state(GameState.RESULTS)
     elif self.get_state() == GameState.RESULTS:
@@ -448,80 +498,98 @@ class Game:
     self.__deal_to_players()
     self.__deal_to_dealer()
 
+  def __new_hand(self, cards: List[Card], bet: float, from_split: bool) -> Hand:
+    if len(self.__hand_pool) > 0:
+      hand = self.__hand_pool.pop()
+      hand.reset(cards, bet, from_split)
+      return hand
+    return Hand(cards, bet, from_split)
+
+  def __is_any_early_surrender(self) -> bool:
+    for player in self.__players:
+      if self.__rules_engine.can_early_surrender(player.get_hand(0)):
+        return True
+    return False
+
   def __deal_to_players(self) -> None:
-    for player in self.__human_players + self.__ai_players:
-      BlackjackLogger.debug(f"\tPlayer-{player.get_id()}")
+    for player in self.__players:
+      BlackjackLogger.debug("\tPlayer-%s", player.get_id())
       for _ in range(2):
         card = self.__dealer.draw()
-        player.add_to_active_hand(card)
-        BlackjackLogger.debug(f"\t\tDealt: {card.get_value()}")
-        self.__update_running_counts(card)
+        player_hand = player.calculate_active_hand()
+        player_hand.add_card(card)
+        card_value = player_hand.get_last_card_value()
+        BlackjackLogger.debug("\t\tDealt: %s", card_value)
+        self.__update_running_counts(card_value)
       player_hand_value = player.calculate_active_hand().get_value()
-      BlackjackLogger.debug(f"\t\tHand: {player_hand_value}")
+      BlackjackLogger.debug("\t\tHand: %s", player_hand_value)
       if player_hand_value == 21:
         BlackjackLogger.debug("\t\tBlackjack!")
 
   def __deal_to_dealer(self) -> None:
-    self.__dealer.set_hands([Hand([], 0, False)])
+    self.__dealer.set_hands([self.__new_hand([], 0, False)])
     dealer_hand = self.__dealer.get_hand(0)
     BlackjackLogger.debug("\tDealer")
     for _ in range(2):
       card = self.__dealer.draw()
       dealer_hand.add_card(card)
-      BlackjackLogger.debug(f"\t\tDealt: {card.get_value()}")
-      self.__update_running_counts(card)
+      card_value = dealer_hand.get_last_card_value()
+      BlackjackLogger.debug("\t\tDealt: %s", card_value)
+      self.__update_running_counts(card_value)
     dealer_hand_value = dealer_hand.get_value()
-    BlackjackLogger.debug(f"\t\tHand: {dealer_hand_value}")
+    BlackjackLogger.debug("\t\tHand: %s", dealer_hand_value)
     if dealer_hand_value == 21:
       BlackjackLogger.debug("\t\tBlackjack!")
 
-  def __handle_ai_bets(self) -> None:
+  # The checked flag on these AI handlers is for the state machine, which also asserts each AI player is the one
+  # the table is waiting on. play_round already goes through them in seat order, so it turns that off.
+  def __handle_ai_bets(self, checked: bool = True) -> None:
     # Note: human players should set their bets before this via the API
     # if this is triggered before then, their bets will remain the same
     for ai_player in self.__ai_players:
-      BlackjackLogger.debug(f"\tPlayer-{ai_player.get_id()}")
-      BlackjackLogger.debug(f"\t\tDecks Remaining: {self.__dealer.get_decks_remaining()}")
-      BlackjackLogger.debug(f"\t\tCards Remaining: {self.__dealer.get_decks_remaining()}")
-      assert self.calculate_active_player() == ai_player
+      BlackjackLogger.debug("\tPlayer-%s", ai_player.get_id())
+      BlackjackLogger.debug("\t\tDecks Remaining: %s", self.__dealer.get_decks_remaining())
+      BlackjackLogger.debug("\t\tCards Remaining: %s", self.__dealer.get_decks_remaining())
+      assert not checked or self.calculate_active_player() == ai_player
       bet = ai_player.calculate_bet(self.__rules_engine, self.__dealer.get_decks_remaining())
-      ai_player.add_new_hand(Hand([], bet, False))
+      ai_player.add_new_hand(self.__new_hand([], bet, False))
       ai_player.decrement_bankroll(bet)
 
   def __player_blackjack_check(self) -> None:
-    for player in self.__human_players + self.__ai_players:
+    for player in self.__players:
       if player.has_blackjack():
         blackjack_hand = player.get_hand(0)
         bet = blackjack_hand.get_bet()
         if not self.__dealer.has_blackjack():
-          BlackjackLogger.debug(f"\t\tPlayer-{player.get_id()}")
+          BlackjackLogger.debug("\t\tPlayer-%s", player.get_id())
           BlackjackLogger.debug("\t\tBlackjack! Win!")
           blackjack_hand.set_finalized()
           blackjack_hand.set_result(HandResult.BLACKJACK)
           blackjack_hand.set_payout(bet * self.__dealer.get_blackjack_pays_multiplier())
         else:
-          BlackjackLogger.debug(f"\t\tDealer & Player-{player.get_id()} have Blackjack!")
+          BlackjackLogger.debug("\t\tDealer & Player-%s have Blackjack!", player.get_id())
           BlackjackLogger.debug("\t\tDraw!")
           blackjack_hand.set_finalized()
           blackjack_hand.set_result(HandResult.DRAW)
           blackjack_hand.set_payout(0)
 
-  def __handle_ai_players_insurance(self) -> None:
+  def __handle_ai_players_insurance(self, checked: bool = True) -> None:
     for ai_player in self.__ai_players:
-      assert self.calculate_active_player() == ai_player
+      assert not checked or self.calculate_active_player() == ai_player
       if self.__rules_engine.can_insure(ai_player.get_hands(), self.__dealer.get_facecard().get_face()):
         if ai_player.wants_insurance(self.__dealer.get_facecard()):
           self.__insure_player_hand(ai_player)
           return
       ai_player.get_hand(0).set_insured(False)
 
-  def __handle_ai_players_early_surrender(self) -> None:
+  def __handle_ai_players_early_surrender(self, checked: bool = True) -> None:
     for ai_player in self.__ai_players:
       hand = ai_player.get_hand(0)
       if ai_player.get_hand_count() != 1:
         return
       if self.__rules_engine.can_late_surrender(hand):
         if ai_player.wants_to_surrender(self.__dealer.get_facecard(), self.__dealer.get_decks_remaining()):
-          assert self.calculate_active_player() == ai_player
+          assert not checked or self.calculate_active_player() == ai_player
           self.__surrender_player_hand(ai_player)
           return
       ai_player.get_hand(0).set_surrendered(False)
@@ -534,7 +602,7 @@ class Game:
       return GameState.LATE_SURRENDER
 
   def __handle_players_insurance_payouts(self) -> None:
-    for player in self.__human_players + self.__ai_players:
+    for player in self.__players:
       for hand in player.get_hands():
         if hand.is_insured():
           if self.__dealer.has_blackjack():
@@ -544,7 +612,7 @@ class Game:
             # so payout here also covers refunding the original bet.
             hand.set_payout(hand.get_insurance_bet() * 3)
 
-  def __handle_ai_players_late_surrender(self) -> None:
+  def __handle_ai_players_late_surrender(self, checked: bool = True) -> None:
     for ai_player in self.__ai_players:
       if not ai_player.get_hand(0).is_surrendered():
         hand = ai_player.get_hand(0)
@@ -552,26 +620,27 @@ class Game:
           return
         if self.__rules_engine.can_late_surrender(hand):
           if ai_player.wants_to_surrender(self.__dealer.get_facecard(), self.__dealer.get_decks_remaining()):
-            assert self.calculate_active_player() == ai_player
+            assert not checked or self.calculate_active_player() == ai_player
             self.__surrender_player_hand(ai_player)
             return
         ai_player.get_hand(0).set_surrendered(False)
 
-  def __handle_ai_decisions(self) -> None:
+  def __handle_ai_decisions(self, checked: bool = True) -> None:
     for ai_player in self.__ai_players:
       for hand in ai_player.get_hands():
         while not hand.is_finalized():
-          assert self.calculate_active_player() == ai_player
-          BlackjackLogger.debug(f"\tPlayer-{ai_player.get_id()}")
-          if not ai_player:
-            break
-          assert isinstance(ai_player, AiPlayer), (
-            "System is most likely trying to run AI decisions against a human player."
-          )
-          active_hand = self.__calculate_active_hand()
-          assert isinstance(active_hand, Hand)
+          BlackjackLogger.debug("\tPlayer-%s", ai_player.get_id())
+          # Earlier hands are all finalized by now, so this hand is the active one
+          active_hand = hand
+          if checked:
+            assert self.calculate_active_player() == ai_player
+            assert isinstance(ai_player, AiPlayer), (
+              "System is most likely trying to run AI decisions against a human player."
+            )
+            active_hand = self.__calculate_active_hand()
+            assert active_hand is hand
           hand_index = ai_player.get_hand_index(active_hand)
-          BlackjackLogger.debug(f"\tHand-{hand_index}")
+          BlackjackLogger.debug("\tHand-%s", hand_index)
           decisions = ai_player.get_decisions(
             active_hand,
             self.__dealer.get_facecard().get_value(),
@@ -581,87 +650,78 @@ class Game:
             if self.__rules_engine.is_legal_play(
               decision,
               ai_player,
-              self.get_state()
+              GameState.AI_PLAYER_DECISIONS
             ):
-              self.__execute_decision(decision)
+              self.__execute_decision(decision, ai_player, active_hand)
               break
 
-  def __execute_decision(self, decision: PlayerDecision) -> None:
-    assert self.__is_unhandled_active_player_hand()
+  def __execute_decision(self, decision: PlayerDecision, player: Player, hand: Hand) -> None:
     match decision:
       case PlayerDecision.HIT:
-        self.__hit_active_hand()
+        self.__hit_hand(hand)
       case PlayerDecision.STAND:
-        self.__stand_active_hand()
+        self.__stand_hand(hand)
       case PlayerDecision.DOUBLE_DOWN:
-        self.__double_down_active_hand()
+        self.__double_down_hand(player, hand)
       case PlayerDecision.SPLIT:
-        self.__split_active_hand()
+        self.__split_hand(player, hand)
       case PlayerDecision.SURRENDER:
-        self.__surrender_active_hand()
+        self.__surrender_hand(player, hand)
 
-  def __hit_active_hand(self) -> None:
-    active_hand = self.__calculate_active_hand()
+  def __hit_hand(self, hand: Hand) -> None:
     card = self.__dealer.draw()
-    active_hand.add_card(card)
-    BlackjackLogger.debug(f"\t\tHit: {card.get_value()}")
-    self.__update_running_counts(card)
-    BlackjackLogger.debug(f"\t\tCurrent Value: {active_hand.get_value()}")
-    self.__handle_potential_bust(active_hand)
-    self.__handle_potential_21(active_hand)
-
-  def __stand_active_hand(self, silent=False) -> None:
-    active_hand = self.__calculate_active_hand()
+    hand.add_card(card)
+    card_value = hand.get_last_card_value()
+    BlackjackLogger.debug("\t\tHit: %s", card_value)
+    self.__update_running_counts(card_value)
+    BlackjackLogger.debug("\t\tCurrent Value: %s", hand.get_value())
+    self.__handle_potential_bust(hand)
+    self.__handle_potential_21(hand)
+
+  def __stand_hand(self, hand: Hand, silent=False) -> None:
     if not silent:
       BlackjackLogger.debug("\t\tStand")
-      BlackjackLogger.debug(f"\t\tFinal Value: {active_hand.get_value()}")
-    active_hand.set_finalized()
+      BlackjackLogger.debug("\t\tFinal Value: %s", hand.get_value())
+    hand.set_finalized()
 
-  def __double_down_active_hand(self) -> None:
-    assert self.__is_unhandled_active_player_hand()
-    active_player = self.calculate_active_player()
-    active_hand = active_player.calculate_active_hand()
-    active_player.decrement_bankroll(active_hand.get_bet())
-    active_hand.set_finalized()
-    active_hand.double_down()
+  def __double_down_hand(self, player: Player, hand: Hand) -> None:
+    player.decrement_bankroll(hand.get_bet())
+    hand.set_finalized()
+    hand.double_down()
     card = self.__dealer.draw()
-    active_hand.add_card(card)
-    BlackjackLogger.debug(f"\t\tDouble Down: {card.get_value()}")
-    self.__update_running_counts(card)
-    BlackjackLogger.debug(f"\t\tFinal Value: {active_hand.get_value()}")
-    self.__handle_potential_bust(active_hand)
-    self.__handle_potential_21(active_hand)
-
-  def __split_active_hand(self) -> None:
+    hand.add_card(card)
+    card_value = hand.get_last_card_value()
+    BlackjackLogger.debug("\t\tDouble Down: %s", card_value)
+    self.__update_running_counts(card_value)
+    BlackjackLogger.debug("\t\tFinal Value: %s", hand.get_value())
+    self.__handle_potential_bust(hand)
+    self.__handle_potential_21(hand)
+
+  def __split_hand(self, player: Player, split_hand: Hand) -> None:
     BlackjackLogger.debug("\t\tSplit")
-    active_player = self.calculate_active_player()
-    active_hand = self.__calculate_active_hand()
-    for card in active_hand.get_cards():
-      if card.get_face() == Face.ACE:
-        card.set_value(11)
-    bet = active_hand.get_bet()
-    active_player.decrement_bankroll(bet)
-    active_hand.set_from_split(True)
-    card = active_hand.pop_card()
-    new_hand = Hand([card], bet, True)
-    active_player.add_new_hand(new_hand)
-    for i, hand in enumerate(active_player.get_hands()):
+    split_hand.restore_aces()
+    bet = split_hand.get_bet()
+    player.decrement_bankroll(bet)
+    split_hand.set_from_split(True)
+    card = split_hand.pop_card()
+    new_hand = self.__new_hand([card], bet, True)
+    player.add_new_hand(new_hand)
+    for i, hand in enumerate(player.get_hands()):
       if hand.get_card_count() == 1:
         card = self.__dealer.draw()
         hand.add_card(card)
-        BlackjackLogger.debug(f"\tHand {i}: {hand.get_card_value(0)}, {hand.get_card_value(1)} -- {hand.get_value()}")
-        self.__update_running_counts(card)
+        BlackjackLogger.debug(
+          "\tHand %s: %s, %s -- %s", i, hand.get_card_value(0), hand.get_card_value(1), hand.get_value()
+        )
+        self.__update_running_counts(hand.get_last_card_value())
 
-  def __surrender_active_hand(self) -> None:
-    active_hand = self.__calculate_active_hand()
-    active_player = self.calculate_active_player()
+  def __surrender_hand(self, player: Player, hand: Hand) -> None:
     BlackjackLogger.debug("\t\tSurrender")
-    active_player.increment_bankroll(active_hand.get_bet() / 2)
-    active_player.get_hands().remove(active_hand)
+    player.increment_bankroll(hand.get_bet() / 2)
+    player.remove_hand(hand)
 
   def __handle_dealer_decisions(self) -> None:
     dealer = self.get_dealer()
-    assert self.calculate_active_player() == dealer
     if self.__is_any_competing_hand():
       dealer_hand = self.__dealer.get_hand(0)
       assert dealer_hand.get_card_count() == 2
@@ -673,28 +733,28 @@ class Game:
         decision = self.__dealer.get_decision()
         match decision:
           case PlayerDecision.HIT:
-            self.__hit_active_hand()
+            self.__hit_hand(dealer_hand)
       if decision == PlayerDecision.STAND:
-        self.__stand_active_hand()
+        self.__stand_hand(dealer_hand)
       return
 
   def __set_results(self) -> None:
-    for player in self.__human_players + self.__ai_players:
+    for player in self.__players:
       for player_hand in player.get_hands():
-        BlackjackLogger.debug(f"\tPlayer-{player.get_id()}")
+        BlackjackLogger.debug("\tPlayer-%s", player.get_id())
         player_hand_value = player_hand.get_value()
-        BlackjackLogger.debug(f"\t\t{player_hand_value}")
+        BlackjackLogger.debug("\t\t%s", player_hand_value)
         if player_hand.get_result() == HandResult.UNDETERMINED:
           result = self.__calculate_hand_result(player_hand)
           player_hand.set_result(result)
     dealer_hand_value = self.__dealer.get_hand(0).get_value()
     BlackjackLogger.debug("\tDealer")
-    BlackjackLogger.debug(f"\t\t{dealer_hand_value}")
+    BlackjackLogger.debug("\t\t%s", dealer_hand_value)
     if dealer_hand_value > 21:
       BlackjackLogger.debug("\t\tDealer busted!")
 
   def __handle_payouts(self) -> None:
-    for player in self.__human_players + self.__ai_players:
+    for player in self.__players:
       for player_hand in player.get_hands():
         result = player_hand.get_result()
         bet = player_hand.get_bet()
@@ -727,11 +787,14 @@ class Game:
     self.__reset_hands()
 
   def __reset_hands(self) -> None:
-    for player in self.__human_players + self.__ai_players:
-      BlackjackLogger.debug(f"\tPlayer-{player.get_id()}")
+    self.__active_seat = 0
+    for player in self.__players:
+      BlackjackLogger.debug("\tPlayer-%s", player.get_id())
+      self.__hand_pool.extend(player.get_hands())
       player.set_hands([])
       BlackjackLogger.debug("\t\tReset hand to: []")
 
     BlackjackLogger.debug("\tDealer")
+    self.__hand_pool.extend(self.__dealer.get_hands())
     self.__dealer.set_hands([])
     BlackjackLogger.debug("\t\tReset hand to: []\n\n")
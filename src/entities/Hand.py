@@ -16,8 +16,19 @@ class Hand():
   __payout: float
   __result: HandResult
   __cards: List[Card]
+  __value: int
+  # Cards are shared and never change, so whether an ace counts as 11 or 1 is kept here. The aces counted as 1 are
+  # always the hand's first ones, since an ace only ever drops to 1 from the front.
+  __ace_count: int
+  __soft_ace_count: int
+  __pair: bool
 
   def __init__(self, cards: List[Card], bet: float, from_split: bool):
+    self.__cards = []
+    self.reset(cards, bet, from_split)
+
+  # Leaves the hand as it would be if it were new, so a Game can reuse it rather than build another
+  def reset(self, cards: List[Card], bet: float, from_split: bool) -> None:
     self.__doubled_down = False
     self.__finalized = False
     self.__from_split = from_split
@@ -27,14 +38,17 @@ class Hand():
     self.__insurance_bet = 0
     self.__payout = 0
     self.__result = HandResult.UNDETERMINED
-    self.__cards = cards
+    self.__cards.clear()
+    self.__value = 0
+    self.__ace_count = 0
+    self.__soft_ace_count = 0
+    for card in cards:
+      self.__cards.append(card)
+      self.__count_card(card)
+    self.__update_pair()
 
   def is_soft(self) -> bool:
-    for card in self.__cards:
-      if card.get_face() == Face.ACE:
-        if card.get_value() == 11:
-          return True
-    return False
+    return self.__soft_ace_count > 0
 
   def is_from_split(self) -> bool:
     return self.__from_split
@@ -46,10 +60,7 @@ class Hand():
     return self.__finalized
 
   def is_pair(self) -> bool:
-    return (
-      len(self.__cards) == 2
-      and self.__cards[0].get_value() == self.__cards[1].get_value()
-    )
+    return self.__pair
 
   def is_insured(self) -> bool | None:
     return self.__insured
@@ -58,15 +69,9 @@ class Hand():
     return self.__surrendered
 
   def get_value(self) -> int:
-    card_values = [card.get_value() for card in self.__cards]
-    total = sum(card_values)
-    if total > 21 and self.is_soft():
-      for i, card in enumerate(self.__cards):
-        if card.calculate_if_value_can_reset():
-          card.set_value(1)
-          total = total - card_values[i] + 1
-          break
-    return total
+    if self.__value > 21 and self.__soft_ace_count > 0:
+      self.__reset_first_ace()
+    return self.__value
 
   def get_bet(self) -> float:
     return self.__bet
@@ -80,14 +85,32 @@ class Hand():
   def get_card_count(self) -> int:
     return len(self.__cards)
 
+  # The value this card counts for in this hand, which is 1 for an ace that has been dropped to 1
   def get_card_value(self, card_index: int) -> int:
-    return self.__cards[card_index].get_value()
+    card = self.__cards[card_index]
+    if card.get_face() == Face.ACE and self.__get_ace_position(card_index) < self.__ace_count - self.__soft_ace_count:
+      return 1
+    return card.get_value()
+
+  def get_last_card_value(self) -> int:
+    return self.get_card_value(len(self.__cards) - 1)
 
   def get_payout(self) -> float:
     return self.__payout
 
   def pop_card(self) -> Card:
     card = self.__cards.pop()
+    if card.get_face() == Face.ACE:
+      # The last ace is the last to drop to 1, so it's only counted as 1 if every ace is
+      if self.__soft_ace_count > 0:
+        self.__value -= card.get_value()
+        self.__soft_ace_count -= 1
+      else:
+        self.__value -= 1
+      self.__ace_count -= 1
+    else:
+      self.__value -= card.get_value()
+    self.__update_pair()
     return card
 
   def get_card_face(self, card_index: int) -> Face:
@@ -101,7 +124,9 @@ class Hand():
 
   def add_card(self, card: Card) -> None:
     self.__cards.append(card)
-    if self.is_soft():
+    self.__count_card(card)
+    self.__update_pair()
+    if self.__soft_ace_count > 0:
       if self.get_value() > 21:
         self.reset_an_ace()
 
@@ -124,11 +149,13 @@ class Hand():
 
   def reset_an_ace(self) -> None:
     if self.get_value() > 21:
-      if self.is_soft():
-        for card in self.__cards:
-          if card.calculate_if_value_can_reset():
-            card.set_value(1)
-            break
+      if self.__soft_ace_count > 0:
+        self.__reset_first_ace()
+
+  def restore_aces(self) -> None:
+    self.__value += 10 * (self.__ace_count - self.__soft_ace_count)
+    self.__soft_ace_count = self.__ace_count
+    self.__update_pair()
 
   def set_bet(self, bet: float) -> None:
     self.__bet = bet
@@ -143,6 +170,30 @@ class Hand():
     self.__result = result
     self.set_finalized()
 
+  def __count_card(self, card: Card) -> None:
+    self.__value += card.get_value()
+    if card.get_face() == Face.ACE:
+      self.__ace_count += 1
+      self.__soft_ace_count += 1
+
+  def __reset_first_ace(self) -> None:
+    self.__value -= 10
+    self.__soft_ace_count -= 1
+    self.__update_pair()
+
+  def __get_ace_position(self, card_index: int) -> int:
+    ace_position = 0
+    for card in self.__cards[:card_index]:
+      if card.get_face() == Face.ACE:
+        ace_position += 1
+    return ace_position
+
+  def __update_pair(self) -> None:
+    self.__pair = (
+      len(self.__cards) == 2
+      and self.get_card_value(0) == self.get_card_value(1)
+    )
+
   def to_dict(self) -> dict:
     return {
       "doubled_down": self.__doubled_down,
@@ -153,7 +204,7 @@ class Hand():
       "insurance_bet": self.__insurance_bet,
       "payout": self.__payout,
       "result": self.__result.name,
-      "cards": [card.to_dict() for card in self.__cards],
+      "cards": [dict(card.to_dict(), value=self.get_card_value(i)) for i, card in enumerate(self.__cards)],
       "value": self.get_value(),
       "soft": self.is_soft(),
     }
@@ -1,6 +1,6 @@
 from abc import ABC
 from typing import List
-from uuid import UUID, uuid4
+from uuid import uuid4
 
 from entities.Card import Card
 from entities.Hand import Hand
@@ -12,20 +12,21 @@ from services.BlackjackLogger import BlackjackLogger
 class Player(ABC):
   __starting_bankroll: float
   __bankroll: float
-  __id: UUID
+  # Kept as a string, since that's how it's logged and looked up
+  __id: str
   __hands: List[Hand]
+  # Hands are played in order and stay finalized, so every hand before this one is done with
+  __active_hand_index: int
 
   def __init__(self, player_info: PlayerInfo):
     self.__starting_bankroll = float(player_info.bankroll)
     self.__bankroll = float(player_info.bankroll)
-    self.__id = uuid4()
+    self.__id = str(uuid4())
     self.__hands = []
+    self.__active_hand_index = 0
 
   def has_active_hand(self) -> bool:
-    for hand in self.__hands:
-      if not hand.is_finalized():
-        return True
-    return False
+    return self.__find_active_hand() is not None
 
   def has_blackjack(self) -> bool:
     if self.get_hand_count() == 1:
@@ -50,7 +51,7 @@ class Player(ABC):
         return i
 
   def get_id(self) -> str:
-    return str(self.__id)
+    return self.__id
 
   def get_hand(self, hand_index: int) -> Hand:
     return self.__hands[hand_index]
@@ -59,14 +60,15 @@ class Player(ABC):
     return self.__hands
 
   def calculate_active_hand(self) -> Hand:
-    for hand in self.__hands:
-      if not hand.is_finalized():
-        assert hand.get_result() == HandResult.UNDETERMINED
-        return hand
-    raise RuntimeError("Tried to calculate the active_hand of a player with no active_hand")
+    hand = self.__find_active_hand()
+    if hand is None:
+      raise RuntimeError("Tried to calculate the active_hand of a player with no active_hand")
+    assert hand.get_result() == HandResult.UNDETERMINED
+    return hand
 
   def set_hands(self, hands: List[Hand]) -> None:
     self.__hands = hands
+    self.__active_hand_index = 0
 
   def add_to_active_hand(self, card: Card) -> None:
     active_hand = self.calculate_active_hand()
@@ -75,24 +77,38 @@ class Player(ABC):
   def add_new_hand(self, hand: Hand) -> None:
     self.__hands.append(hand)
 
+  def remove_hand(self, hand: Hand) -> None:
+    hand_index = self.__hands.index(hand)
+    del self.__hands[hand_index]
+    if hand_index < self.__active_hand_index:
+      self.__active_hand_index -= 1
+
   def increment_bankroll(self, amount: float, silent=False) -> None:
     if amount != 0:
       if not silent:
-        BlackjackLogger.debug(f"\t\tAdjusting bankroll from: {self.__bankroll} -> {self.__bankroll + amount}")
+        BlackjackLogger.debug("\t\tAdjusting bankroll from: %s -> %s", self.__bankroll, self.__bankroll + amount)
       self.__bankroll += amount
 
   def decrement_bankroll(self, amount: float, silent=False) -> None:
     if amount != 0:
       if not silent:
-        BlackjackLogger.debug(f"\t\tAdjusting bankroll from: {self.__bankroll} -> {self.__bankroll - amount}")
+        BlackjackLogger.debug("\t\tAdjusting bankroll from: %s -> %s", self.__bankroll, self.__bankroll - amount)
       self.__bankroll -= amount
 
   def reset_bankroll(self) -> None:
     self.__bankroll = self.__starting_bankroll
 
+  def __find_active_hand(self) -> Hand | None:
+    while self.__active_hand_index < len(self.__hands):
+      hand = self.__hands[self.__active_hand_index]
+      if not hand.is_finalized():
+        return hand
+      self.__active_hand_index += 1
+    return None
+
   def to_dict(self) -> dict:
     return {
-      "id": str(self.__id),
+      "id": self.__id,
       "bankroll": self.__bankroll,
       "hands": [hand.to_dict() for hand in self.__hands]
     }
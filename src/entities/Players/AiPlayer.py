@@ -11,6 +11,7 @@ from services.BasicStrategyEngine import BasicStrategyEngine
 from services.BlackjackLogger import BlackjackLogger
 from services.CardCountingEngine import CardCountingEngine
 from services.RulesEngine import RulesEngine
+from services.SimRandom import SimRandom
 
 
 class AiPlayer(Player):
@@ -21,7 +22,7 @@ class AiPlayer(Player):
   __card_counting_engine: CardCountingEngine
   __bet_spread: BetSpread
 
-  def __init__(self, ai_player_info: AiPlayerInfo, rules_engine: RulesEngine):
+  def __init__(self, ai_player_info: AiPlayerInfo, rules_engine: RulesEngine, sim_random: SimRandom | None = None):
     super().__init__(ai_player_info)
     self.__counts_cards = ai_player_info.counts_cards
     self.__plays_deviations = ai_player_info.plays_deviations
@@ -29,9 +30,10 @@ class AiPlayer(Player):
     self.__basic_strategy_engine = BasicStrategyEngine(
       ai_player_info.basic_strategy_skill_level,
       ai_player_info.deviations_skill_level,
-      rules_engine
+      rules_engine,
+      sim_random
     )
-    self.__card_counting_engine = CardCountingEngine(ai_player_info.card_counting_skill_level)
+    self.__card_counting_engine = CardCountingEngine(ai_player_info.card_counting_skill_level, sim_random)
     self.__bet_spread = ai_player_info.bet_spread
 
   def counts_cards(self) -> bool:
@@ -65,7 +67,7 @@ class AiPlayer(Player):
 
   def calculate_true_count(self, decks_remaining: float) -> int:
     genuine_true_count = floor(self.get_running_count() / ceil(decks_remaining))
-    BlackjackLogger.debug(f"\t\tGenuine true count is: {genuine_true_count}")
+    BlackjackLogger.debug("\t\tGenuine true count is: %s", genuine_true_count)
     return genuine_true_count
 
   def get_running_count(self) -> int:
@@ -75,7 +77,7 @@ class AiPlayer(Player):
     if self.counts_cards():
       count_adjustment = self.__card_counting_engine.get_count_adjustment(card_value)
       self.__running_count += count_adjustment
-    BlackjackLogger.debug(f"\t\t\tRunning count is: {self.get_running_count()}")
+    BlackjackLogger.debug("\t\t\tRunning count is: %s", self.get_running_count())
 
   def get_bet_spread(self) -> BetSpread:
     return self.__bet_spread
@@ -91,7 +93,7 @@ class AiPlayer(Player):
       dealer_facecard_value,
       true_count
     )
-    BlackjackLogger.debug(f"\t\tWants: {[d.name for d in decisions]}")
+    BlackjackLogger.debug(lambda: f"\t\tWants: {[d.name for d in decisions]}")
     return decisions
 
   def get_insurance_bet(self) -> float:
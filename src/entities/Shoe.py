@@ -1,23 +1,41 @@
-from random import shuffle
 from typing import List
 
+import numpy as np
+
 from entities.Card import Card
+from models.enums.Face import Face
+from models.enums.Suit import Suit
+from services.SimRandom import SimRandom
+
+# Cards live in the shoe as int8 codes (suit index * 13 + face index), and drawing one hands out the shared Card for
+# that code
+CARDS_BY_CODE = tuple(Card(suit, face) for suit in Suit for face in Face)
+CODES_BY_CARD = {(card.get_suit(), card.get_face()): code for code, card in enumerate(CARDS_BY_CODE)}
 
 
 class Shoe:
   __deck_count: int
   __full_size: int
   __reset_percentage: int
-  __cards: List[Card]
+  __shuffle_point: int
+  __sorted_cards: np.ndarray
+  __cards: np.ndarray
+  __card_count: int
+  __sim_random: SimRandom
 
-  def __init__(self, deck_count: int, reset_percentage: int):
+  def __init__(self, deck_count: int, reset_percentage: int, sim_random: SimRandom | None = None):
     self.__deck_count = deck_count
     self.__full_size = deck_count * 52
     self.__reset_percentage = reset_percentage
-    self.__cards = []
+    self.__shuffle_point = int(self.__full_size * (reset_percentage / 100))
+    self.__sorted_cards = np.tile(np.arange(len(CARDS_BY_CODE), dtype=np.int8), deck_count)
+    self.__cards = np.empty(self.__full_size, dtype=np.int8)
+    # Cards are drawn from the end, so cards[:card_count] is what's left in the shoe
+    self.__card_count = 0
+    self.__sim_random = sim_random or SimRandom()
 
   def get_card_count(self) -> int:
-    return len(self.__cards)
+    return self.__card_count
 
   def get_deck_count(self) -> int:
     return self.__deck_count
@@ -31,22 +49,42 @@ class Shoe:
   def get_reset_percentage(self) -> int:
     return self.__reset_percentage
 
+  def get_shuffle_point(self) -> int:
+    return self.__shuffle_point
+
+  def must_be_shuffled(self) -> bool:
+    return self.__card_count <= self.__shuffle_point
+
   def draw(self) -> Card:
-    return self.__cards.pop()
+    if self.__card_count == 0:
+      raise IndexError("Tried to draw from an empty shoe.")
+    self.__card_count -= 1
+    return CARDS_BY_CODE[self.__cards[self.__card_count]]
 
   def add_card(self, card: Card) -> None:
-    self.__cards.append(card)
+    if self.__card_count == len(self.__cards):
+      self.__cards = np.resize(self.__cards, max(1, len(self.__cards) * 2))
+    self.__cards[self.__card_count] = CODES_BY_CARD[(card.get_suit(), card.get_face())]
+    self.__card_count += 1
 
   def set_cards(self, cards: List[Card]) -> None:
-    self.__cards = cards
+    self.__card_count = 0
+    for card in cards:
+      self.add_card(card)
+
+  def load(self) -> None:
+    if len(self.__cards) < self.__full_size:
+      self.__cards = np.empty(self.__full_size, dtype=np.int8)
+    self.__cards[:self.__full_size] = self.__sorted_cards
+    self.__card_count = self.__full_size
 
   def shuffle(self) -> None:
-    shuffle(self.__cards)
+    self.__sim_random.shuffle(self.__cards[:self.__card_count])
 
   def to_dict(self) -> dict:
     return {
       "full_size": self.__full_size,
       "previous_deck_count": self.__deck_count,
       "reset_percentage": self.__reset_percentage,
-      "cards": [c.to_dict() for c in self.__cards]
+      "cards": [CARDS_BY_CODE[code].to_dict() for code in self.__cards[:self.__card_count]]
     }
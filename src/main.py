@@ -1,17 +1,38 @@
 #!/usr/bin/env python3
 
+import asyncio
 import os
+from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
 
 from api import ExistingDataRoutes, GameRoutes, SessionRoutes, SimRoutes
+from services.BlackjackLogger import BlackjackLogger
+from services.DatabaseEngineSingleton import DatabaseEngineSingleton
+from services.ResultStore import ResultStore
+from services.SessionManagerSingleton import SessionManagerSingleton
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+  sim_worker_pool = SessionManagerSingleton().get_sim_worker_pool()
+  result_buffer = SessionManagerSingleton().get_result_buffer()
+  # Workers are forked before the first DB connection is opened
+  await asyncio.to_thread(sim_worker_pool.warm_up)
+  await asyncio.to_thread(ResultStore.from_env().create_schema)
+  result_buffer.start()
+  yield
+  sim_worker_pool.shutdown()
+  await asyncio.to_thread(result_buffer.stop)
+  await DatabaseEngineSingleton().dispose()
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(ExistingDataRoutes.router)
 app.include_router(GameRoutes.router)
 app.include_router(SessionRoutes.router)
 app.include_router(SimRoutes.router)
 
 load_dotenv()
+BlackjackLogger.set_level(os.getenv("BJE_LOG_LEVEL", "INFO"))
 assert os.getenv('BJE_YIELD_EVERY_X_HANDS') is not None
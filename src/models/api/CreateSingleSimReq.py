@@ -13,3 +13,6 @@ class CreateSingleSimReq(BaseModel):
   time: HumanTime
   rules: GameRules
   ai_player_info: List[AiPlayerInfo]
+  fast_kernel: bool = False
+  # Seeds a single sim directly, or a multi sim run's root seed that every sim's own seed is derived from
+  seed: int | None = None
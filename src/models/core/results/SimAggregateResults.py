@@ -0,0 +1,18 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from models.core.results.SimSingleResults import SimSingleResults
+
+
+class SimAggregateResults(BaseModel):
+  sims_run: int = 0
+  sims_won: int = 0
+  sims_lost: int = 0
+  sims_unfinished: int = 0
+  summed: SimSingleResults = Field(default_factory=SimSingleResults)
+  profit_mean: float = 0.0
+  profit_m2: float = 0.0
+  profit_lowest: float = 0.0
+  profit_highest: float = 0.0
+  rows: List[SimSingleResults] = Field(default_factory=list)
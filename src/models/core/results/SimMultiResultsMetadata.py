@@ -11,3 +11,7 @@ class SimMultiResultsMetadata(BaseModel):
   total_hands: int = 0
   simulation_time: float = 0.0
   human_time: float = 0.0
+  profit_std_dev: float = 0.0
+  profit_lowest: float = 0.0
+  profit_highest: float = 0.0
+  seed: int | None = None
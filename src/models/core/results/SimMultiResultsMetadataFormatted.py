@@ -11,3 +11,7 @@ class SimMultiResultsMetadataFormatted(BaseModel):
   total_hands: str = ""
   simulation_time: str = ""
   human_time: str = ""
+  profit_std_dev: str = ""
+  profit_lowest: str = ""
+  profit_highest: str = ""
+  seed: str = ""
@@ -12,3 +12,5 @@ class SimSingleResults(BaseModel):
   hands: HandResults = Field(default_factory=HandResults)
   bankroll: BankrollResults = Field(default_factory=BankrollResults)
   time: TimeResults = Field(default_factory=TimeResults)
+  # Replays this exact sim when passed back as the request's seed
+  seed: Optional[int] = None
@@ -12,7 +12,7 @@ class CreateSingleSimReqORM(Base):
   bounds_id = Column(Integer, ForeignKey("single_sim_bounds.id"))
   time_id = Column(Integer, ForeignKey("human_time.id"))
   rules_id = Column(Integer, ForeignKey("game_rules.id"))
-  request_hash = Column(String, index=True, nullable=False)
+  request_hash = Column(String, index=True, unique=True, nullable=False)
   request_json = Column(JSONB, nullable=False)
 
   bounds = relationship("SingleSimBoundsORM", uselist=False)
@@ -0,0 +1,34 @@
+from sqlalchemy import BigInteger, Column, Float, String
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from models.db.Base import Base
+
+
+class SimRequestRollupORM(Base):
+  __tablename__ = "sim_request_rollups"
+
+  request_hash = Column(String, primary_key=True)
+  sims_run = Column(BigInteger, default=0)
+  sims_won = Column(BigInteger, default=0)
+  sims_lost = Column(BigInteger, default=0)
+  sims_unfinished = Column(BigInteger, default=0)
+  hands_total = Column(BigInteger, default=0)
+  hands_blackjack = Column(BigInteger, default=0)
+  hands_won = Column(BigInteger, default=0)
+  hands_drawn = Column(BigInteger, default=0)
+  hands_lost = Column(BigInteger, default=0)
+  hands_surrendered = Column(BigInteger, default=0)
+  bankroll_starting = Column(Float, default=0)
+  bankroll_ending = Column(Float, default=0)
+  bankroll_highest = Column(Float, default=0)
+  bankroll_lowest = Column(Float, default=0)
+  profit_total = Column(Float, default=0)
+  profit_from_true = Column(ARRAY(Float), default=lambda: [0.0] * 7)
+  profit_per_hand = Column(Float, default=0)
+  profit_per_hour = Column(Float, default=0)
+  profit_mean = Column(Float, default=0)
+  profit_m2 = Column(Float, default=0)
+  profit_lowest = Column(Float, default=0)
+  profit_highest = Column(Float, default=0)
+  human_time = Column(Float, default=0)
+  simulation_time = Column(Float, default=0)
@@ -0,0 +1,35 @@
+from sqlalchemy import BigInteger, Boolean, Column, Float, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from models.db.Base import Base
+
+
+# One row per stored sim, replacing the simulation_single_results -> hand_results / bankroll_results / ... chain
+class SimResultRowORM(Base):
+  __tablename__ = "simulation_result_rows"
+
+  id = Column(Integer, primary_key=True, autoincrement=True)
+  request_id = Column(Integer, ForeignKey("create_single_sim_req.id"), index=True, nullable=False)
+  won = Column(Boolean, nullable=True)
+  hands_total = Column(Integer, default=0)
+  hands_blackjack = Column(Integer, default=0)
+  hands_won = Column(Integer, default=0)
+  hands_drawn = Column(Integer, default=0)
+  hands_lost = Column(Integer, default=0)
+  hands_surrendered = Column(Integer, default=0)
+  percentage_blackjack = Column(Float, default=0.0)
+  percentage_won = Column(Float, default=0.0)
+  percentage_drawn = Column(Float, default=0.0)
+  percentage_lost = Column(Float, default=0.0)
+  percentage_surrendered = Column(Float, default=0.0)
+  bankroll_starting = Column(Float, default=0)
+  bankroll_ending = Column(Float, default=0)
+  bankroll_highest = Column(Float, default=0)
+  bankroll_lowest = Column(Float, default=0)
+  profit_total = Column(Float, default=0)
+  profit_from_true = Column(ARRAY(Float, zero_indexes=True), default=lambda: [0.0] * 7)
+  profit_per_hand = Column(Float, default=0)
+  profit_per_hour = Column(Float, default=0)
+  human_time = Column(Float, default=0)
+  simulation_time = Column(Float, default=0)
+  seed = Column(BigInteger, nullable=True)
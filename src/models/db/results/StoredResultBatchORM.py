@@ -0,0 +1,9 @@
+from sqlalchemy import Column, String
+
+from models.db.Base import Base
+
+
+class StoredResultBatchORM(Base):
+  __tablename__ = "stored_result_batches"
+
+  batch_id = Column(String, primary_key=True)
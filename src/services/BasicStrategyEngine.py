@@ -1,29 +1,32 @@
-import random
 from typing import List
 
+import services.StrategyTables as StrategyTables
 from entities.Hand import Hand
-from models.core.BasicStrategy import BasicStrategy
 from models.enums.Face import Face
 from models.enums.PairSplittingDecision import PairSplittingDecision
 from models.enums.PlayerDecision import PlayerDecision
 from services.BlackjackLogger import BlackjackLogger
 from services.RulesEngine import RulesEngine
+from services.SimRandom import SimRandom
 
 
 class BasicStrategyEngine():
   __basic_strategy_skill_level: int
   __deviations_skill_level: int
   __rules_engine: RulesEngine
+  __sim_random: SimRandom
 
   def __init__(
     self,
     basic_strategy_skill_level: int,
     deviations_skill_level: int,
-    rules_engine: RulesEngine
+    rules_engine: RulesEngine,
+    sim_random: SimRandom | None = None
   ):
     self.__basic_strategy_skill_level = basic_strategy_skill_level
     self.__deviations_skill_level = deviations_skill_level
     self.__rules_engine = rules_engine
+    self.__sim_random = sim_random or SimRandom()
 
   def get_play(
     self,
@@ -33,35 +36,36 @@ class BasicStrategyEngine():
     true_count: int | None
   ) -> List[PlayerDecision]:
     assert isinstance(dealer_face_card_value, int)
-    decisions = []
+    decisions = 0
     if self.__rules_engine.can_split(active_player_hand, len(player_hands)):
       wants_split = self.__check_for_split(player_hands, active_player_hand, dealer_face_card_value, true_count)
       if wants_split:
-        decisions.append(PlayerDecision.SPLIT)
+        decisions |= StrategyTables.SPLIT
 
     adjusted_true_count = self.__get_adjusted_true_count(true_count)
-    BlackjackLogger.debug(f"\t\tActual true count: {true_count}")
-    BlackjackLogger.debug(f"\t\tAdjusted true count: {adjusted_true_count}")
+    BlackjackLogger.debug("\t\tActual true count: %s", true_count)
+    BlackjackLogger.debug("\t\tAdjusted true count: %s", adjusted_true_count)
 
     adjusted_player_hand_value = self.__get_adjusted_player_hand_value(active_player_hand)
-    BlackjackLogger.debug(f"\t\tActual hand value: {active_player_hand.get_value()}")
-    BlackjackLogger.debug(f"\t\tAdjusted hand value: {adjusted_player_hand_value}")
+    BlackjackLogger.debug("\t\tActual hand value: %s", active_player_hand.get_value())
+    BlackjackLogger.debug("\t\tAdjusted hand value: %s", adjusted_player_hand_value)
 
+    tables = StrategyTables.get_tables()
+    true_count_index = StrategyTables.get_true_count_index(adjusted_true_count)
     if active_player_hand.is_soft():
-      decisions.extend(
-        BasicStrategy.soft_totals[(adjusted_true_count, dealer_face_card_value, adjusted_player_hand_value)]
-      )
+      decisions |= tables.soft_totals[true_count_index, dealer_face_card_value, adjusted_player_hand_value]
     else:
-      decisions.extend(
-        BasicStrategy.hard_totals[(adjusted_true_count, dealer_face_card_value, adjusted_player_hand_value)]
-      )
-    return decisions
+      decisions |= tables.hard_totals[true_count_index, dealer_face_card_value, adjusted_player_hand_value]
+    return StrategyTables.get_decisions(int(decisions))
 
   # We're proceeding on the assumption that insurance is always bad.
   def wants_insurance(self, hands: List[Hand], dealer_facecard_face: Face) -> bool:
     if not self.__rules_engine.can_insure(hands, dealer_facecard_face):
       return False
-    accuracy_roll = random.randint(self.__basic_strategy_skill_level, 100)
+    # The roll can't come in at 10 or under for anyone more skilled than that
+    if self.__basic_strategy_skill_level > 10:
+      return False
+    accuracy_roll = self.__sim_random.randint(self.__basic_strategy_skill_level, 100)
     if accuracy_roll > 10:
       return False
     return True
@@ -69,9 +73,11 @@ class BasicStrategyEngine():
   def wants_to_surrender(self, dealer_facecard_value: int, player_hand: Hand, true_count: int | None) -> bool:
     adjusted_true_count = self.__get_adjusted_true_count(true_count)
     adjusted_player_hand_value = self.__get_adjusted_player_hand_value(player_hand)
-    return BasicStrategy.surrender[
-      (adjusted_true_count, dealer_facecard_value, adjusted_player_hand_value)
-    ]
+    return bool(StrategyTables.get_tables().surrender[
+      StrategyTables.get_true_count_index(adjusted_true_count),
+      dealer_facecard_value,
+      adjusted_player_hand_value
+    ])
 
   def __check_for_split(
     self,
@@ -85,9 +91,11 @@ class BasicStrategyEngine():
       adjusted_true_count = self.__get_adjusted_true_count(true_count)
       adjusted_player_hand_value = self.__get_adjusted_player_hand_value(active_player_hand)
       half_adjusted_player_hand_value = adjusted_player_hand_value // 2
-      splitting_decision = BasicStrategy.pair_splitting[
-        (adjusted_true_count, dealer_face_card_value, half_adjusted_player_hand_value)
-      ]
+      splitting_decision = StrategyTables.PAIR_SPLITTING_DECISIONS[StrategyTables.get_tables().pair_splitting[
+        StrategyTables.get_true_count_index(adjusted_true_count),
+        dealer_face_card_value,
+        half_adjusted_player_hand_value
+      ]]
       if splitting_decision == PairSplittingDecision.YES:
         return True
       if splitting_decision == PairSplittingDecision.IF_DOUBLE_AFTER_SPLITTING_ALLOWED:
@@ -122,11 +130,14 @@ class BasicStrategyEngine():
     )
 
   def __get_some_adjusted_value(self, skill_level: int, some_val: int, minimum: int, maximum: int) -> int:
-    accuracy_roll = random.randint(skill_level, 100)
-    BlackjackLogger.debug(f"\t\tAccuracy roll: {accuracy_roll}")
+    # Perfect skill always rolls 100, which adjusts nothing
+    if skill_level == 100:
+      return min(max(some_val, minimum), maximum)
+    accuracy_roll = self.__sim_random.randint(skill_level, 100)
+    BlackjackLogger.debug("\t\tAccuracy roll: %s", accuracy_roll)
     spread = (100 - accuracy_roll) / 10
 
-    plus_or_minimumus_roll = random.randint(1, 2)
+    plus_or_minimumus_roll = self.__sim_random.randint(1, 2)
     if plus_or_minimumus_roll == 1:
       adjusted_player_hand_value = int(some_val + spread)
     else:
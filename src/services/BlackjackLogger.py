@@ -1,10 +1,37 @@
 import logging
+import os
+from typing import Any, Callable
 
 logging.basicConfig(level=logging.INFO, force=True)
 logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("BJE_LOG_LEVEL", "INFO").upper())
+
+# Resolved once from the logger's effective level, so a debug call that won't be logged returns before anything is
+# formatted. Goes through BlackjackLogger.set_level if the level changes later. This module is usually imported
+# before the .env is loaded, so the app and each sim worker set BJE_LOG_LEVEL again once it has been.
+DEBUG_ENABLED = logger.isEnabledFor(logging.DEBUG)
+
 
 class BlackjackLogger:
+  # Messages are formatted with their args %-style, and only once they're going to be logged. A message that takes
+  # real work to build can be passed as a callable instead, which is only called then too.
+  @staticmethod
+  def debug(msg: str | Callable[[], str], *args: Any) -> None:
+    if DEBUG_ENABLED:
+      if callable(msg):
+        msg = msg()
+      logger.debug("\t" + msg, *args)
+
+  @staticmethod
+  def warning(msg: str, *args: Any) -> None:
+    logger.warning("\t" + msg, *args)
+
+  @staticmethod
+  def is_debug_enabled() -> bool:
+    return DEBUG_ENABLED
+
   @staticmethod
-  def debug(msg) -> None:
-    if logger.level == logging.DEBUG:
-      logger.debug("\t%s", msg)
+  def set_level(level: int | str) -> None:
+    global DEBUG_ENABLED # pylint: disable=global-statement
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    DEBUG_ENABLED = logger.isEnabledFor(logging.DEBUG)
@@ -1,11 +1,13 @@
-import random
+from services.SimRandom import SimRandom
 
 
 class CardCountingEngine():
   __skill_level: int
+  __sim_random: SimRandom
 
-  def __init__(self, skill_level: int):
+  def __init__(self, skill_level: int, sim_random: SimRandom | None = None):
     self.__skill_level = skill_level
+    self.__sim_random = sim_random or SimRandom()
 
   def get_count_adjustment(self, card_value: int) -> int:
     if card_value <= 6:
@@ -18,14 +20,17 @@ class CardCountingEngine():
     return adjusted_adjustment
 
   def __get_adjusted_count_adjustment(self, actual_adjustment: int) -> int:
-    accuracy_roll = random.randint(self.__skill_level, 100)
+    # The roll can't come in under 66 for anyone at least that skilled
+    if self.__skill_level >= 66:
+      return actual_adjustment
+    accuracy_roll = self.__sim_random.randint(self.__skill_level, 100)
     if accuracy_roll >= 66:
       return actual_adjustment
     elif accuracy_roll >= 33:
       if actual_adjustment == 1 or actual_adjustment == -1:
         return 0
       else:
-        even_odd_roll = random.randint(0, 1)
+        even_odd_roll = self.__sim_random.randint(0, 1)
         if even_odd_roll == 0:
           return 1
         else:
@@ -36,7 +41,7 @@ class CardCountingEngine():
       elif actual_adjustment == -1:
         return 1
       else:
-        even_odd_roll = random.randint(0, 1)
+        even_odd_roll = self.__sim_random.randint(0, 1)
         if even_odd_roll == 0:
           return 1
         else:
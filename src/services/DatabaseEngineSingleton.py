@@ -0,0 +1,90 @@
+import os
+from urllib.parse import quote_plus
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+
+# One sync and one async engine per process, shared by every DatabaseHandler. They're created on first use rather
+# than at import, since the .env is loaded after the routes (and so their handlers) are imported.
+class DatabaseEngineSingleton:
+  _engine: Engine | None
+  _async_engine: AsyncEngine | None
+  _session_maker: sessionmaker[Session] | None
+  _async_session_maker: async_sessionmaker[AsyncSession] | None
+  __instance: "DatabaseEngineSingleton" = None # type: ignore
+
+  def __new__(cls) -> "DatabaseEngineSingleton":
+    if cls.__instance is None:
+      cls.__instance = super().__new__(cls)
+      cls.__instance._engine = None
+      cls.__instance._async_engine = None
+      cls.__instance._session_maker = None
+      cls.__instance._async_session_maker = None
+      # A forked sim worker must never reuse (or close) the parent's pooled connections
+      os.register_at_fork(after_in_child=cls.__instance.__forget_engines)
+    return cls.__instance
+
+  def get_engine(self) -> Engine:
+    if self._engine is None:
+      self._engine = create_engine(self.__get_db_url(), echo=False, **self.__get_pool_options())
+    return self._engine
+
+  def get_async_engine(self) -> AsyncEngine:
+    if self._async_engine is None:
+      # psycopg 3 speaks asyncio natively, so the same URL works for the async engine
+      self._async_engine = create_async_engine(self.__get_db_url(), echo=False, **self.__get_pool_options())
+    return self._async_engine
+
+  def get_session_maker(self) -> sessionmaker[Session]:
+    if self._session_maker is None:
+      self._session_maker = sessionmaker(bind=self.get_engine())
+    return self._session_maker
+
+  def get_async_session_maker(self) -> async_sessionmaker[AsyncSession]:
+    if self._async_session_maker is None:
+      self._async_session_maker = async_sessionmaker(bind=self.get_async_engine())
+    return self._async_session_maker
+
+  async def dispose(self) -> None:
+    if self._async_engine is not None:
+      await self._async_engine.dispose()
+    if self._engine is not None:
+      self._engine.dispose()
+    self._engine = None
+    self._async_engine = None
+    self._session_maker = None
+    self._async_session_maker = None
+
+  def __forget_engines(self) -> None:
+    if self._engine is not None:
+      self._engine.dispose(close=False)
+    if self._async_engine is not None:
+      self._async_engine.sync_engine.dispose(close=False)
+    self._engine = None
+    self._async_engine = None
+    self._session_maker = None
+    self._async_session_maker = None
+
+  def __get_pool_options(self) -> dict:
+    return {
+      "pool_size": int(os.getenv("BJE_POSTGRES_POOL_SIZE", "10")),
+      "max_overflow": int(os.getenv("BJE_POSTGRES_MAX_OVERFLOW", "10")),
+      "pool_timeout": int(os.getenv("BJE_POSTGRES_POOL_TIMEOUT", "30")),
+      "pool_pre_ping": True
+    }
+
+  def __get_db_url(self) -> str:
+    user = os.getenv("BJE_POSTGRES_USER")
+    password = quote_plus(os.getenv("BJE_POSTGRES_PASS", ""))
+    host = os.getenv("BJE_POSTGRES_HOST")
+    port = os.getenv("BJE_POSTGRES_PORT")
+    db_name = os.getenv("BJE_POSTGRES_DB_NAME")
+    if user is None or password is None or host is None or port is None or db_name is None:
+      raise RuntimeError(
+        "BJE_POSTGRES_USER, BJE_POSTGRES_PASS, BJE_POSTGRES_HOST, BJE_POSTGRES_PORT, or " +
+        "BJE_POSTGRES_DB_NAME are not in env."
+      )
+    return f"postgresql+psycopg://{user}:{password}@{host}:{port}/{db_name}"
@@ -1,13 +1,15 @@
-import hashlib
-import json
 import os
-from urllib.parse import quote_plus
+from collections import OrderedDict
+from typing import Iterator, List
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
-from sqlalchemy.orm import selectinload, sessionmaker
+from sqlalchemy import func, insert, inspect, literal_column, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
 from models.api.CreateSingleSimReq import CreateSingleSimReq
+from models.core.results.HandResultsCounts import HandResultsCounts
+from models.core.results.SimAggregateResults import SimAggregateResults
 from models.core.results.SimMultiResults import SimMultiResults
 from models.core.results.SimSingleResults import SimSingleResults
 from models.db.api.CreateSingleSimReqORM import CreateSingleSimReqORM
@@ -28,16 +30,34 @@ from models.db.results.HandResultsCountsORM import HandResultsCountsORM
 from models.db.results.HandResultsORM import HandResultsORM
 from models.db.results.HandResultsPercentagesORM import HandResultsPercentagesORM
 from models.db.results.ProfitResultsORM import ProfitResultsORM
+from models.db.results.SimRequestRollupORM import SimRequestRollupORM
+from models.db.results.SimResultRowORM import SimResultRowORM
 from models.db.results.SimSingleResultsORM import SimSingleResultsORM
+from models.db.results.StoredResultBatchORM import StoredResultBatchORM
 from models.db.results.TimeResultsORM import TimeResultsORM
+from services.DatabaseEngineSingleton import DatabaseEngineSingleton
+from services.ResultStore import ResultStore
 from services.SimDataTransformer import SimDataTransformer
+from services.SimResultsAccumulator import SimResultsAccumulator
 
 
-class DatabaseHandler():
-  __engine: Engine
+# Postgres' SQLSTATE for a foreign key violation
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+# The Postgres result store
+class DatabaseHandler(ResultStore):
+  __database_engine: DatabaseEngineSingleton
   __simulation_data_transformer: SimDataTransformer
+  # Lives for the whole process: request hash -> request row id, least recently used first
+  __request_ids: "OrderedDict[str, int]" = OrderedDict()
 
   def __init__(self):
+    self.__database_engine = DatabaseEngineSingleton()
+    self.__simulation_data_transformer = SimDataTransformer()
+
+  # Creates any missing tables and runs the startup migrations. Called once at app startup, not per handler.
+  def create_schema(self) -> None:
     _ = (
       PlayerInfoORM,
       SingleSimBoundsORM,
@@ -57,90 +77,452 @@ class DatabaseHandler():
       HandResultsORM,
       TimeResultsORM,
       SimSingleResultsORM,
+      SimResultRowORM,
+      SimRequestRollupORM,
+      StoredResultBatchORM,
       BetSpreadORM,
     )
-    user = os.getenv("BJE_POSTGRES_USER")
-    password = quote_plus(os.getenv("BJE_POSTGRES_PASS", ""))
-    host = os.getenv("BJE_POSTGRES_HOST")
-    port = os.getenv("BJE_POSTGRES_PORT")
-    db_name = os.getenv("BJE_POSTGRES_DB_NAME")
-    if user is None or password is None or host is None or port is None or db_name is None:
-      raise RuntimeError(
-        "BJE_POSTGRES_USER, BJE_POSTGRES_PASS, BJE_POSTGRES_HOST, BJE_POSTGRES_PORT, or " +
-        "BJE_POSTGRES_DB_NAME are not in env."
-      )
-    db_url = f"postgresql+psycopg://{user}:{password}@{host}:{port}/{db_name}"
-    self.__engine = create_engine(
-      db_url,
-      echo=False,
-      pool_size=500,
-      pool_timeout=120
-    )
-    self.__session_maker = sessionmaker(bind=self.__engine)
-    self.__simulation_data_transformer = SimDataTransformer()
-    Base.metadata.create_all(bind=self.__engine)
+    engine = self.__database_engine.get_engine()
+    result_rows_existed = inspect(engine).has_table(SimResultRowORM.__tablename__)
+    rollups_existed = inspect(engine).has_table(SimRequestRollupORM.__tablename__)
+    Base.metadata.create_all(bind=engine)
+    self.__migrate_unique_request_hash()
+    if not result_rows_existed:
+      self.__migrate_result_rows()
+    if not rollups_existed:
+      self.__backfill_rollups()
 
-  def store_simulation_single_result(self, sim_result: SimSingleResults, request: CreateSingleSimReq) -> None:
-    session = self.__session_maker()
+  def store_simulation_results_bulk(
+    self,
+    sim_results: List[SimSingleResults],
+    request: CreateSingleSimReq,
+    batch_ids: List[str] | None = None
+  ) -> None:
+    if not sim_results:
+      return
+    request_dict = self.__simulation_data_transformer.get_request_dict(request)
+    request_hash = self.__simulation_data_transformer.get_request_hash(request_dict)
     try:
-      request_dict = request.model_dump()
-      request_json = json.dumps(request_dict, sort_keys=True)
-      request_hash = hashlib.sha256(request_json.encode()).hexdigest()
+      request_id = self.__store_results_in_new_session(sim_results, request_dict, request_hash, batch_ids)
+    except IntegrityError as e:
+      if not self.__forget_stale_request_id(e, request_hash):
+        raise
+      request_id = self.__store_results_in_new_session(sim_results, request_dict, request_hash, batch_ids)
+    # Only cached once committed, so a rolled back insert can't leave a dangling id behind
+    self.__cache_request_id(request_hash, request_id)
 
-      request_orm = CreateSingleSimReqORM(
-        request_json=request_dict,
-        request_hash=request_hash
-      )
-      session.add(request_orm)
-      session.flush()
-
-      counts_orm = HandResultsCountsORM(**sim_result.hands.counts.model_dump())
-      percentages_orm = HandResultsPercentagesORM(**sim_result.hands.percentages.model_dump())
-      hands_orm = HandResultsORM(counts=counts_orm, percentages=percentages_orm)
-      profit_orm = ProfitResultsORM(**sim_result.bankroll.profit.model_dump())
-      bankroll_orm = BankrollResultsORM(
-          starting=sim_result.bankroll.starting,
-          ending=sim_result.bankroll.ending,
-          highest=sim_result.bankroll.highest,
-          lowest=sim_result.bankroll.lowest,
-          profit=profit_orm
+  async def store_simulation_results_bulk_async(
+    self,
+    sim_results: List[SimSingleResults],
+    request: CreateSingleSimReq
+  ) -> None:
+    if not sim_results:
+      return
+    request_dict = self.__simulation_data_transformer.get_request_dict(request)
+    request_hash = self.__simulation_data_transformer.get_request_hash(request_dict)
+    try:
+      request_id = await self.__store_results_in_new_session_async(sim_results, request_dict, request_hash)
+    except IntegrityError as e:
+      if not self.__forget_stale_request_id(e, request_hash):
+        raise
+      request_id = await self.__store_results_in_new_session_async(sim_results, request_dict, request_hash)
+    self.__cache_request_id(request_hash, request_id)
+
+  def is_batch_stored(self, batch_id: str) -> bool:
+    session = self.__database_engine.get_session_maker()()
+    try:
+      return session.get(StoredResultBatchORM, batch_id) is not None
+    finally:
+      session.close()
+
+  # Reads the request's rollup row, so the cost doesn't grow with the number of stored sims
+  def get_all_sim_results(self, request: CreateSingleSimReq) -> SimMultiResults | None:
+    request_dict = self.__simulation_data_transformer.get_request_dict(request)
+    request_hash = self.__simulation_data_transformer.get_request_hash(request_dict)
+    session = self.__database_engine.get_session_maker()()
+    try:
+      rollup = session.get(SimRequestRollupORM, request_hash)
+      return self.__get_rollup_results(rollup)
+    finally:
+      session.close()
+
+  async def get_all_sim_results_async(self, request: CreateSingleSimReq) -> SimMultiResults | None:
+    request_dict = self.__simulation_data_transformer.get_request_dict(request)
+    request_hash = self.__simulation_data_transformer.get_request_hash(request_dict)
+    async with self.__database_engine.get_async_session_maker()() as session:
+      rollup = await session.get(SimRequestRollupORM, request_hash)
+      return self.__get_rollup_results(rollup)
+
+  def get_sim_results(self, request: CreateSingleSimReq) -> List[SimSingleResults]:
+    session = self.__database_engine.get_session_maker()()
+    try:
+      request_dict = self.__simulation_data_transformer.get_request_dict(request)
+      request_hash = self.__simulation_data_transformer.get_request_hash(request_dict)
+      request_id = self.__get_request_id(session, request_hash)
+      if request_id is None:
+        return []
+      rows = session.scalars(
+        select(SimResultRowORM).where(SimResultRowORM.request_id == request_id).order_by(SimResultRowORM.id)
       )
-      time_orm_result = TimeResultsORM(**sim_result.time.model_dump())
+      return [self.__simulation_data_transformer.orm_to_pydantic(row) for row in rows]
+    finally:
+      session.close()
 
-      session.add_all([counts_orm, percentages_orm, hands_orm, bankroll_orm, time_orm_result])
-      session.flush()
+  # yield_per makes psycopg use a server-side cursor, so only one chunk of rows is ever held
+  def iter_result_rows(self, request_hash: str, chunk_size: int) -> Iterator[List[dict]]:
+    session = self.__database_engine.get_session_maker()()
+    try:
+      request_id = self.__get_request_id(session, request_hash)
+      if request_id is None:
+        return
+      columns = [c for c in SimResultRowORM.__table__.columns if c.key not in ("id", "request_id")]
+      result = session.execute(
+        select(*columns)
+        .where(SimResultRowORM.request_id == request_id)
+        .order_by(SimResultRowORM.id)
+        .execution_options(yield_per=chunk_size)
+      )
+      for partition in result.mappings().partitions():
+        yield [dict(row) for row in partition]
+    finally:
+      session.close()
 
-      sim_orm = SimSingleResultsORM(
-        won=sim_result.won,
-        hands=hands_orm,
-        bankroll=bankroll_orm,
-        time=time_orm_result,
-        request=request_orm
+  def __get_sim_results_aggregate(self, session: Session, request_id: int) -> SimAggregateResults:
+    rows = SimResultRowORM
+    statement = (
+      select(
+        func.count().label("sims_run"),
+        func.count().filter(rows.won.is_(True)).label("sims_won"),
+        func.count().filter(rows.won.is_(False)).label("sims_lost"),
+        func.count().filter(rows.won.is_(None)).label("sims_unfinished"),
+        func.sum(rows.hands_total).label("total"),
+        func.sum(rows.hands_blackjack).label("blackjack"),
+        func.sum(rows.hands_won).label("won"),
+        func.sum(rows.hands_drawn).label("drawn"),
+        func.sum(rows.hands_lost).label("lost"),
+        func.sum(rows.hands_surrendered).label("surrendered"),
+        func.sum(rows.bankroll_starting).label("starting"),
+        func.sum(rows.bankroll_ending).label("ending"),
+        func.sum(rows.bankroll_highest).label("highest"),
+        func.sum(rows.bankroll_lowest).label("lowest"),
+        func.sum(rows.profit_total).label("profit_total"),
+        func.sum(rows.profit_per_hand).label("per_hand"),
+        func.sum(rows.profit_per_hour).label("per_hour"),
+        func.var_samp(rows.profit_total).label("profit_variance"),
+        func.min(rows.profit_total).label("profit_lowest"),
+        func.max(rows.profit_total).label("profit_highest"),
+        func.sum(rows.human_time).label("human_time"),
+        func.sum(rows.simulation_time).label("simulation_time"),
+        *(func.sum(rows.profit_from_true[i]).label(f"from_true_{i}") for i in range(7))
       )
-      session.add(sim_orm)
+      .where(rows.request_id == request_id)
+    )
+    row = session.execute(statement).one()
+    aggregate = SimAggregateResults.model_validate({})
+    if row.sims_run == 0:
+      return aggregate
+    aggregate.sims_run = row.sims_run
+    aggregate.sims_won = row.sims_won
+    aggregate.sims_lost = row.sims_lost
+    aggregate.sims_unfinished = row.sims_unfinished
+    summed = aggregate.summed
+    summed.hands.counts = HandResultsCounts.model_construct(
+      total=int(row.total or 0),
+      blackjack=int(row.blackjack or 0),
+      won=int(row.won or 0),
+      drawn=int(row.drawn or 0),
+      lost=int(row.lost or 0),
+      surrendered=int(row.surrendered or 0)
+    )
+    summed.bankroll.starting = float(row.starting or 0)
+    summed.bankroll.ending = float(row.ending or 0)
+    summed.bankroll.highest = float(row.highest or 0)
+    summed.bankroll.lowest = float(row.lowest or 0)
+    summed.bankroll.profit.total = float(row.profit_total or 0)
+    summed.bankroll.profit.from_true = [float(getattr(row, f"from_true_{i}") or 0) for i in range(7)]
+    summed.bankroll.profit.per_hand = float(row.per_hand or 0)
+    summed.bankroll.profit.per_hour = float(row.per_hour or 0)
+    summed.time.human_time = float(row.human_time or 0)
+    summed.time.simulation_time = float(row.simulation_time or 0)
+    # Rebuild the Welford state the accumulator expects from the sample variance
+    aggregate.profit_mean = summed.bankroll.profit.total / row.sims_run
+    aggregate.profit_m2 = float(row.profit_variance or 0) * (row.sims_run - 1)
+    aggregate.profit_lowest = float(row.profit_lowest)
+    aggregate.profit_highest = float(row.profit_highest)
+    return aggregate
+
+  def __store_results_in_new_session(
+    self,
+    sim_results: List[SimSingleResults],
+    request_dict: dict,
+    request_hash: str,
+    batch_ids: List[str] | None
+  ) -> int:
+    session = self.__database_engine.get_session_maker()()
+    try:
+      if batch_ids:
+        session.execute(insert(StoredResultBatchORM), [{"batch_id": batch_id} for batch_id in batch_ids])
+      request_id = self.__store_results(session, sim_results, request_dict, request_hash)
       session.commit()
+      return request_id
     except Exception:
       session.rollback()
       raise
     finally:
       session.close()
 
-  def get_all_sim_results(self, request: CreateSingleSimReq) -> SimMultiResults | None:
-    session = self.__session_maker()
-    try:
-      request_dict = request.model_dump()
-      request_json = json.dumps(request_dict, sort_keys=True)
-      request_hash = hashlib.sha256(request_json.encode()).hexdigest()
-      base_query = session.query(SimSingleResultsORM).join(SimSingleResultsORM.request)
-      base_query = base_query.filter(CreateSingleSimReqORM.request_hash == request_hash)
-      base_query = base_query.options(
-        selectinload(SimSingleResultsORM.hands).selectinload(HandResultsORM.counts),
-        selectinload(SimSingleResultsORM.hands).selectinload(HandResultsORM.percentages),
-        selectinload(SimSingleResultsORM.bankroll),
-        selectinload(SimSingleResultsORM.time),
+  async def __store_results_in_new_session_async(
+    self,
+    sim_results: List[SimSingleResults],
+    request_dict: dict,
+    request_hash: str
+  ) -> int:
+    async with self.__database_engine.get_async_session_maker()() as session:
+      try:
+        request_id = await session.run_sync(self.__store_results, sim_results, request_dict, request_hash)
+        await session.commit()
+        return request_id
+      except Exception:
+        await session.rollback()
+        raise
+
+  # A cached request id outlives its row if the row is deleted or the database is reset while the app runs, and then
+  # every insert for that hash fails on the foreign key. Drops the cached id in that case, so a retry looks it up (or
+  # creates it) again, and returns whether it did.
+  def __forget_stale_request_id(self, error: IntegrityError, request_hash: str) -> bool:
+    if getattr(error.orig, "sqlstate", None) != FOREIGN_KEY_VIOLATION:
+      return False
+    return DatabaseHandler.__request_ids.pop(request_hash, None) is not None
+
+  # Everything one batch writes, shared by the sync and async paths: the request row is looked up (or created) once by
+  # its hash, the results go in as one flat row each through a single executemany insert, and the request's rollup
+  # row gets the batch's totals added to it
+  def __store_results(
+    self,
+    session: Session,
+    sim_results: List[SimSingleResults],
+    request_dict: dict,
+    request_hash: str
+  ) -> int:
+    request_id = self.__get_or_create_request_id(session, request_dict, request_hash)
+    session.execute(
+      insert(SimResultRowORM),
+      [self.__simulation_data_transformer.get_result_row_values(r, request_id) for r in sim_results]
+    )
+    accumulator = SimResultsAccumulator()
+    for r in sim_results:
+      accumulator.add(r)
+    self.__add_to_rollup(session, request_hash, accumulator.get_aggregate())
+    return request_id
+
+  def __get_rollup_results(self, rollup: SimRequestRollupORM | None) -> SimMultiResults | None:
+    if rollup is None:
+      return None
+    accumulator = SimResultsAccumulator()
+    accumulator.add_aggregate(self.__get_rollup_aggregate(rollup))
+    return self.__simulation_data_transformer.get_multi_sim_results_from_accumulator(accumulator)
+
+  def __add_to_rollup(self, session: Session, request_hash: str, aggregate: SimAggregateResults) -> None:
+    rollup = SimRequestRollupORM
+    statement = pg_insert(rollup).values(**self.__get_rollup_values(request_hash, aggregate))
+    excluded = statement.excluded
+    additive_columns = (
+      "sims_run", "sims_won", "sims_lost", "sims_unfinished",
+      "hands_total", "hands_blackjack", "hands_won", "hands_drawn", "hands_lost", "hands_surrendered",
+      "bankroll_starting", "bankroll_ending", "bankroll_highest", "bankroll_lowest",
+      "profit_total", "profit_per_hand", "profit_per_hour", "human_time", "simulation_time"
+    )
+    updates = {column: getattr(rollup, column) + getattr(excluded, column) for column in additive_columns}
+    # Same pairwise Welford combination as SimResultsAccumulator.add_aggregate, on the row's old values
+    sims_run = rollup.sims_run + excluded.sims_run
+    delta = excluded.profit_mean - rollup.profit_mean
+    updates["profit_mean"] = rollup.profit_mean + delta * excluded.sims_run / sims_run
+    updates["profit_m2"] = (
+      rollup.profit_m2 + excluded.profit_m2 + delta * delta * rollup.sims_run * excluded.sims_run / sims_run
+    )
+    updates["profit_lowest"] = func.least(rollup.profit_lowest, excluded.profit_lowest)
+    updates["profit_highest"] = func.greatest(rollup.profit_highest, excluded.profit_highest)
+    updates["profit_from_true"] = literal_column(
+      f"ARRAY(SELECT a + b FROM unnest({rollup.__tablename__}.profit_from_true, excluded.profit_from_true) "
+      "WITH ORDINALITY AS t(a, b, i) ORDER BY i)"
+    )
+    session.execute(statement.on_conflict_do_update(index_elements=[rollup.request_hash], set_=updates))
+
+  def __get_rollup_values(self, request_hash: str, aggregate: SimAggregateResults) -> dict:
+    summed = aggregate.summed
+    return {
+      "request_hash": request_hash,
+      "sims_run": aggregate.sims_run,
+      "sims_won": aggregate.sims_won,
+      "sims_lost": aggregate.sims_lost,
+      "sims_unfinished": aggregate.sims_unfinished,
+      "hands_total": summed.hands.counts.total,
+      "hands_blackjack": summed.hands.counts.blackjack,
+      "hands_won": summed.hands.counts.won,
+      "hands_drawn": summed.hands.counts.drawn,
+      "hands_lost": summed.hands.counts.lost,
+      "hands_surrendered": summed.hands.counts.surrendered,
+      "bankroll_starting": summed.bankroll.starting,
+      "bankroll_ending": summed.bankroll.ending,
+      "bankroll_highest": summed.bankroll.highest,
+      "bankroll_lowest": summed.bankroll.lowest,
+      "profit_total": summed.bankroll.profit.total,
+      "profit_from_true": list(summed.bankroll.profit.from_true),
+      "profit_per_hand": summed.bankroll.profit.per_hand,
+      "profit_per_hour": summed.bankroll.profit.per_hour,
+      "profit_mean": aggregate.profit_mean,
+      "profit_m2": aggregate.profit_m2,
+      "profit_lowest": aggregate.profit_lowest,
+      "profit_highest": aggregate.profit_highest,
+      "human_time": summed.time.human_time,
+      "simulation_time": summed.time.simulation_time
+    }
+
+  def __get_rollup_aggregate(self, rollup: SimRequestRollupORM) -> SimAggregateResults:
+    aggregate = SimAggregateResults.model_validate({})
+    aggregate.sims_run = int(rollup.sims_run)
+    aggregate.sims_won = int(rollup.sims_won)
+    aggregate.sims_lost = int(rollup.sims_lost)
+    aggregate.sims_unfinished = int(rollup.sims_unfinished)
+    summed = aggregate.summed
+    summed.hands.counts = HandResultsCounts.model_construct(
+      total=int(rollup.hands_total),
+      blackjack=int(rollup.hands_blackjack),
+      won=int(rollup.hands_won),
+      drawn=int(rollup.hands_drawn),
+      lost=int(rollup.hands_lost),
+      surrendered=int(rollup.hands_surrendered)
+    )
+    summed.bankroll.starting = float(rollup.bankroll_starting)
+    summed.bankroll.ending = float(rollup.bankroll_ending)
+    summed.bankroll.highest = float(rollup.bankroll_highest)
+    summed.bankroll.lowest = float(rollup.bankroll_lowest)
+    summed.bankroll.profit.total = float(rollup.profit_total)
+    summed.bankroll.profit.from_true = [float(profit) for profit in rollup.profit_from_true]
+    summed.bankroll.profit.per_hand = float(rollup.profit_per_hand)
+    summed.bankroll.profit.per_hour = float(rollup.profit_per_hour)
+    summed.time.human_time = float(rollup.human_time)
+    summed.time.simulation_time = float(rollup.simulation_time)
+    aggregate.profit_mean = float(rollup.profit_mean)
+    aggregate.profit_m2 = float(rollup.profit_m2)
+    aggregate.profit_lowest = float(rollup.profit_lowest)
+    aggregate.profit_highest = float(rollup.profit_highest)
+    return aggregate
+
+  def __get_or_create_request_id(self, session: Session, request_dict: dict, request_hash: str) -> int:
+    request_id = self.__get_request_id(session, request_hash)
+    if request_id is None:
+      request_id = session.scalars(
+        pg_insert(CreateSingleSimReqORM)
+        .values(request_json=request_dict, request_hash=request_hash)
+        .on_conflict_do_nothing(index_elements=[CreateSingleSimReqORM.request_hash])
+        .returning(CreateSingleSimReqORM.id)
+      ).first()
+    if request_id is None:
+      # Another writer created it between our lookup and insert
+      request_id = session.scalars(
+        select(CreateSingleSimReqORM.id).where(CreateSingleSimReqORM.request_hash == request_hash)
+      ).one()
+    return request_id
+
+  def __get_request_id(self, session: Session, request_hash: str) -> int | None:
+    request_ids = DatabaseHandler.__request_ids
+    request_id = request_ids.get(request_hash)
+    if request_id is not None:
+      request_ids.move_to_end(request_hash)
+      return request_id
+    request_id = session.scalars(
+      select(CreateSingleSimReqORM.id).where(CreateSingleSimReqORM.request_hash == request_hash)
+    ).first()
+    if request_id is not None:
+      self.__cache_request_id(request_hash, request_id)
+    return request_id
+
+  def __cache_request_id(self, request_hash: str, request_id: int) -> None:
+    request_ids = DatabaseHandler.__request_ids
+    request_ids[request_hash] = request_id
+    request_ids.move_to_end(request_hash)
+    cache_size = int(os.getenv("BJE_REQUEST_ID_CACHE_SIZE", "1024"))
+    while len(request_ids) > cache_size:
+      request_ids.popitem(last=False)
+
+  # Databases created before request_hash was unique hold one request row per stored sim. This points every
+  # result at the oldest row for its hash, drops the rest, and swaps the plain index for a unique one.
+  def __migrate_unique_request_hash(self) -> None:
+    table_name = CreateSingleSimReqORM.__tablename__
+    index_name = f"ix_{table_name}_request_hash"
+    with self.__database_engine.get_engine().begin() as connection:
+      indexes = inspect(connection).get_indexes(table_name)
+      if any(index["name"] == index_name and index["unique"] for index in indexes):
+        return
+      connection.execute(text(f"LOCK TABLE {table_name} IN SHARE ROW EXCLUSIVE MODE"))
+      duplicates = (
+        f"SELECT id, MIN(id) OVER (PARTITION BY request_hash) AS keep_id FROM {table_name}"
       )
-      results = base_query.yield_per(1000).all()
-      sims = [self.__simulation_data_transformer.orm_to_pydantic(res) for res in results]
-      return self.__simulation_data_transformer.get_multi_sim_results(sims)
+      for referencing_table in (
+        SimSingleResultsORM.__tablename__,
+        SimResultRowORM.__tablename__,
+        AiPlayerInfoORM.__tablename__
+      ):
+        connection.execute(text(
+          f"UPDATE {referencing_table} AS r SET request_id = d.keep_id FROM ({duplicates}) AS d "
+          "WHERE r.request_id = d.id AND d.id <> d.keep_id"
+        ))
+      connection.execute(text(
+        f"DELETE FROM {table_name} AS c USING ({duplicates}) AS d WHERE c.id = d.id AND d.id <> d.keep_id"
+      ))
+      connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+      connection.execute(text(f"CREATE UNIQUE INDEX {index_name} ON {table_name} (request_hash)"))
+
+  # Rolls up every request stored before the rollup table existed. Writers take a lock that conflicts with this
+  # one, so no batch can land between a request's aggregate being read and its rollup row being written.
+  def __backfill_rollups(self) -> None:
+    session = self.__database_engine.get_session_maker()()
+    try:
+      session.execute(text(f"LOCK TABLE {SimRequestRollupORM.__tablename__} IN EXCLUSIVE MODE"))
+      requests = session.execute(
+        select(CreateSingleSimReqORM.id, CreateSingleSimReqORM.request_hash)
+        .where(CreateSingleSimReqORM.request_hash.not_in(select(SimRequestRollupORM.request_hash)))
+      ).all()
+      for request_id, request_hash in requests:
+        aggregate = self.__get_sim_results_aggregate(session, request_id)
+        if aggregate.sims_run > 0:
+          session.add(SimRequestRollupORM(**self.__get_rollup_values(request_hash, aggregate)))
+      session.commit()
+    except Exception:
+      session.rollback()
+      raise
     finally:
       session.close()
+
+  # Copies every sim stored in the old normalized layout (simulation_single_results and the five tables hanging off
+  # it) into simulation_result_rows. The old tables are left in place, but nothing writes to them anymore.
+  def __migrate_result_rows(self) -> None:
+    table_name = SimResultRowORM.__tablename__
+    with self.__database_engine.get_engine().begin() as connection:
+      connection.execute(text(f"LOCK TABLE {table_name} IN EXCLUSIVE MODE"))
+      if connection.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table_name})")).scalar():
+        return
+      connection.execute(text(
+        f"INSERT INTO {table_name} ("
+        "request_id, won, hands_total, hands_blackjack, hands_won, hands_drawn, hands_lost, hands_surrendered, "
+        "percentage_blackjack, percentage_won, percentage_drawn, percentage_lost, percentage_surrendered, "
+        "bankroll_starting, bankroll_ending, bankroll_highest, bankroll_lowest, "
+        "profit_total, profit_from_true, profit_per_hand, profit_per_hour, human_time, simulation_time"
+        ") SELECT "
+        "s.request_id, s.won, c.total, c.blackjack, c.won, c.drawn, c.lost, c.surrendered, "
+        "pc.blackjack, pc.won, pc.drawn, pc.lost, pc.surrendered, "
+        "b.starting, b.ending, b.highest, b.lowest, p.total, "
+        "ARRAY(SELECT e.value::float FROM json_array_elements_text(p.from_true) WITH ORDINALITY AS e(value, i) "
+        "ORDER BY e.i), "
+        "p.per_hand, p.per_hour, tr.human_time, tr.simulation_time "
+        f"FROM {SimSingleResultsORM.__tablename__} AS s "
+        f"JOIN {HandResultsORM.__tablename__} AS h ON s.hands_id = h.id "
+        f"JOIN {HandResultsCountsORM.__tablename__} AS c ON h.counts_id = c.id "
+        f"JOIN {HandResultsPercentagesORM.__tablename__} AS pc ON h.percentages_id = pc.id "
+        f"JOIN {BankrollResultsORM.__tablename__} AS b ON s.bankroll_id = b.id "
+        f"JOIN {ProfitResultsORM.__tablename__} AS p ON b.profit_id = p.id "
+        f"JOIN {TimeResultsORM.__tablename__} AS tr ON s.time_id = tr.id "
+        "WHERE s.request_id IS NOT NULL "
+        "ORDER BY s.id"
+      ))
@@ -0,0 +1,747 @@
+from typing import NamedTuple, Tuple
+
+import numpy as np
+from numba import _helperlib, njit
+
+import services.MathHelper as MathHelper
+import services.StrategyTables as StrategyTables
+from models.core.HumanTime import HumanTime
+from models.core.player_info.AiPlayerInfo import AiPlayerInfo
+from models.core.rules.GameRules import GameRules
+from models.core.SingleSimBounds import SingleSimBounds
+from services.SimRandom import SimRandom
+from services.StrategyTables import DOUBLE_DOWN, HIT, SPLIT, STAND
+
+# Cards are encoded by blackjack value: 2-10 as themselves (faces are 10) and aces as 11
+ACE = 11
+
+# Hand results, mirroring models.enums.HandResult
+UNDETERMINED = 0
+BLACKJACK = 1
+WIN = 2
+LOSS = 3
+DRAW = 4
+SURRENDERED = 5
+
+# Stands in for a true count of None, which the strategy tables keep at true count index 0
+NO_TRUE_COUNT = -100
+
+HAND_DTYPE = np.dtype([
+  ("hard_total", np.int64),
+  ("ace_count", np.int64),
+  ("card_count", np.int64),
+  ("first_card", np.int64),
+  ("second_card", np.int64),
+  ("bet", np.float64),
+  ("insurance_bet", np.float64),
+  ("payout", np.float64),
+  ("result", np.int64),
+  ("finalized", np.bool_),
+  ("from_split", np.bool_),
+  ("doubled_down", np.bool_),
+  ("surrendered", np.bool_),
+])
+
+
+class KernelRules(NamedTuple):
+  min_bet: float
+  max_bet: float
+  dealer_hits_soft_seventeen: bool
+  deck_count: int
+  full_size: int
+  shuffle_point: float
+  blackjack_pays_multiplier: float
+  double_after_hit: bool
+  double_after_split_except_aces: bool
+  double_after_split_including_aces: bool
+  double_on_ten_eleven_only: bool
+  double_on_nine_ten_eleven_only: bool
+  double_on_any_two_cards: bool
+  maximum_hand_count: int
+  can_hit_aces: bool
+  early_surrender_allowed: bool
+  late_surrender_allowed: bool
+
+
+class KernelPlayer(NamedTuple):
+  counts_cards: bool
+  plays_deviations: bool
+  basic_strategy_skill_level: int
+  card_counting_skill_level: int
+  deviations_skill_level: int
+  bet_spread: Tuple[float, float, float, float, float, float, float]
+
+
+class KernelBounds(NamedTuple):
+  bankroll_goal: float
+  bankroll_fail: float
+  human_time_limit: float
+  hands_per_hour: int
+
+
+class FastSimKernel():
+  __rules: KernelRules
+  __player: KernelPlayer
+  __bounds: KernelBounds
+  __seed: int
+  # numba's np.random is a single MT19937 per thread, which np.random.seed() would only seed from 32 bits. Each kernel
+  # keeps its own full state instead, drawn from a SeedSequence of the whole seed, and swaps it in around every call.
+  __random_state: Tuple[int, list]
+  __shoe: np.ndarray
+  __shoe_state: np.ndarray
+  __bankroll: np.ndarray
+  __counts: np.ndarray
+  __profit_from_true: np.ndarray
+
+  def __init__(
+    self,
+    rules: GameRules,
+    ai_player_info: AiPlayerInfo,
+    bounds: SingleSimBounds,
+    human_time: HumanTime,
+    seed: int | None = None
+  ):
+    self.__rules = self.__get_kernel_rules(rules)
+    self.__player = self.__get_kernel_player(ai_player_info)
+    self.__bounds = KernelBounds(
+      bankroll_goal=np.inf if bounds.bankroll_goal is None else float(bounds.bankroll_goal),
+      bankroll_fail=0.0 if bounds.bankroll_fail is None else float(bounds.bankroll_fail),
+      human_time_limit=float(bounds.human_time_limit or 0),
+      hands_per_hour=human_time.hands_per_hour
+    )
+    self.__seed = SimRandom.new_seed() if seed is None else seed
+    self.__random_state = (624, np.random.SeedSequence(self.__seed).generate_state(624, np.uint32).tolist())
+    self.__shoe = get_sorted_shoe(rules.dealer_rules.deck_count)
+    # [cursor, running_count]
+    self.__shoe_state = np.zeros(2, dtype=np.int64)
+    bankroll = float(ai_player_info.bankroll)
+    # [current, highest, lowest]
+    self.__bankroll = np.array([bankroll, bankroll, bankroll], dtype=np.float64)
+    # [total, blackjack, won, drawn, lost, surrendered]
+    self.__counts = np.zeros(6, dtype=np.int64)
+    self.__profit_from_true = np.zeros(7, dtype=np.float64)
+    self.__load_random_state()
+    shuffle(self.__shoe)
+    self.__save_random_state()
+
+  def play(self, max_hands: int) -> int:
+    hard_totals, soft_totals, pair_splitting, surrender = StrategyTables.get_tables()
+    self.__load_random_state()
+    hands_played = play_hands(
+      self.__shoe,
+      self.__shoe_state,
+      self.__bankroll,
+      self.__counts,
+      self.__profit_from_true,
+      hard_totals,
+      soft_totals,
+      pair_splitting,
+      surrender,
+      self.__rules,
+      self.__player,
+      self.__bounds,
+      max_hands
+    )
+    self.__save_random_state()
+    return hands_played
+
+  def is_finished(self) -> bool:
+    return is_finished(self.__bankroll[0], self.__counts[0], self.__bounds)
+
+  def get_seed(self) -> int:
+    return self.__seed
+
+  def get_bankroll(self) -> float:
+    return float(self.__bankroll[0])
+
+  def get_highest_bankroll(self) -> float:
+    return float(self.__bankroll[1])
+
+  def get_lowest_bankroll(self) -> float:
+    return float(self.__bankroll[2])
+
+  def get_running_count(self) -> int:
+    return int(self.__shoe_state[1])
+
+  def get_shoe_card_count(self) -> int:
+    return int(self.__rules.full_size - self.__shoe_state[0])
+
+  def get_counts(self) -> dict:
+    return {
+      "total": int(self.__counts[0]),
+      "blackjack": int(self.__counts[1]),
+      "won": int(self.__counts[2]),
+      "drawn": int(self.__counts[3]),
+      "lost": int(self.__counts[4]),
+      "surrendered": int(self.__counts[5])
+    }
+
+  def get_profit_from_true(self) -> list[float]:
+    return [float(p) for p in self.__profit_from_true]
+
+  def __load_random_state(self) -> None:
+    _helperlib.rnd_set_state(_helperlib.rnd_get_np_state_ptr(), self.__random_state)
+
+  def __save_random_state(self) -> None:
+    self.__random_state = _helperlib.rnd_get_state(_helperlib.rnd_get_np_state_ptr())
+
+  def __get_kernel_rules(self, rules: GameRules) -> KernelRules:
+    dealer_rules = rules.dealer_rules
+    double_down_rules = rules.double_down_rules
+    full_size = dealer_rules.deck_count * 52
+    return KernelRules(
+      min_bet=float(rules.betting_rules.min_bet),
+      max_bet=float(rules.betting_rules.max_bet),
+      dealer_hits_soft_seventeen=dealer_rules.dealer_hits_soft_seventeen,
+      deck_count=dealer_rules.deck_count,
+      full_size=full_size,
+      shuffle_point=full_size * (dealer_rules.shoe_reset_percentage / 100),
+      blackjack_pays_multiplier=float(dealer_rules.blackjack_pays_multiplier),
+      double_after_hit=double_down_rules.double_after_hit,
+      double_after_split_except_aces=double_down_rules.double_after_split_except_aces,
+      double_after_split_including_aces=double_down_rules.double_after_split_including_aces,
+      double_on_ten_eleven_only=double_down_rules.double_on_ten_eleven_only,
+      double_on_nine_ten_eleven_only=double_down_rules.double_on_nine_ten_eleven_only,
+      double_on_any_two_cards=double_down_rules.double_on_any_two_cards,
+      maximum_hand_count=rules.splitting_rules.maximum_hand_count,
+      can_hit_aces=rules.splitting_rules.can_hit_aces,
+      early_surrender_allowed=rules.surrender_rules.early_surrender_allowed,
+      late_surrender_allowed=rules.surrender_rules.late_surrender_allowed
+    )
+
+  def __get_kernel_player(self, ai_player_info: AiPlayerInfo) -> KernelPlayer:
+    bet_spread = ai_player_info.bet_spread
+    return KernelPlayer(
+      counts_cards=ai_player_info.counts_cards,
+      plays_deviations=ai_player_info.plays_deviations,
+      basic_strategy_skill_level=ai_player_info.basic_strategy_skill_level,
+      card_counting_skill_level=ai_player_info.card_counting_skill_level,
+      deviations_skill_level=ai_player_info.deviations_skill_level,
+      bet_spread=(
+        float(bet_spread.true_zero),
+        float(bet_spread.true_one),
+        float(bet_spread.true_two),
+        float(bet_spread.true_three),
+        float(bet_spread.true_four),
+        float(bet_spread.true_five),
+        float(bet_spread.true_six)
+      )
+    )
+
+
+def get_sorted_shoe(deck_count: int) -> np.ndarray:
+  deck = [2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 10, 10, ACE] * 4
+  return np.array(deck * deck_count, dtype=np.int8)
+
+@njit(cache=True)
+def shuffle(shoe: np.ndarray) -> None:
+  np.random.shuffle(shoe)
+
+@njit(cache=True)
+def is_finished(bankroll: float, total_hands_played: int, bounds: KernelBounds) -> bool:
+  if bankroll <= 0 or bankroll >= bounds.bankroll_goal or bankroll <= bounds.bankroll_fail:
+    return True
+  if bounds.human_time_limit:
+    human_time = MathHelper.get_human_time(total_hands_played, bounds.hands_per_hour)
+    if MathHelper.get_percentage(human_time, bounds.human_time_limit) >= 100:
+      return True
+  if bounds.bankroll_goal != np.inf:
+    if MathHelper.get_percentage(bounds.bankroll_fail, bankroll) >= 100:
+      return True
+    if MathHelper.get_percentage(bankroll, bounds.bankroll_goal) >= 100:
+      return True
+  return False
+
+@njit(cache=True)
+def play_hands(
+  shoe: np.ndarray,
+  shoe_state: np.ndarray,
+  bankroll: np.ndarray,
+  counts: np.ndarray,
+  profit_from_true: np.ndarray,
+  hard_totals: np.ndarray,
+  soft_totals: np.ndarray,
+  pair_splitting: np.ndarray,
+  surrender: np.ndarray,
+  rules: KernelRules,
+  player: KernelPlayer,
+  bounds: KernelBounds,
+  max_hands: int
+) -> int:
+  hands = np.zeros(max(rules.maximum_hand_count, 1), dtype=HAND_DTYPE)
+  dealer = np.zeros(1, dtype=HAND_DTYPE)
+  for i in range(max_hands):
+    if is_finished(bankroll[0], counts[0], bounds):
+      return i
+    true_count = _calculate_true_count(shoe_state, rules)
+    hand_count = _play_round(
+      shoe, shoe_state, bankroll, hands, dealer[0],
+      hard_totals, soft_totals, pair_splitting, surrender,
+      rules, player, true_count
+    )
+    _update_results(bankroll, counts, profit_from_true, hands, hand_count, true_count)
+  return max_hands
+
+@njit(cache=True)
+def _play_round(
+  shoe, shoe_state, bankroll, hands, dealer,
+  hard_totals, soft_totals, pair_splitting, surrender,
+  rules, player, true_count
+) -> int:
+  # Betting
+  hand = hands[0]
+  bet = _calculate_bet(true_count, bankroll[0], rules, player)
+  _reset_hand(hand, bet, False)
+  bankroll[0] -= bet
+
+  # Dealing
+  if rules.full_size - shoe_state[0] <= rules.shuffle_point:
+    np.random.shuffle(shoe)
+    shoe_state[0] = 0
+    shoe_state[1] = 0
+  _deal_card(hand, shoe, shoe_state, player)
+  _deal_card(hand, shoe, shoe_state, player)
+  _reset_hand(dealer, 0.0, False)
+  _deal_card(dealer, shoe, shoe_state, player)
+  _deal_card(dealer, shoe, shoe_state, player)
+  dealer_facecard = dealer.second_card
+  dealer_has_blackjack = _is_two_card_twenty_one(dealer)
+
+  # Player blackjack check
+  player_has_blackjack = _is_two_card_twenty_one(hand)
+  if player_has_blackjack:
+    hand.finalized = True
+    if dealer_has_blackjack:
+      hand.result = DRAW
+      hand.payout = 0.0
+    else:
+      hand.result = BLACKJACK
+      hand.payout = bet * rules.blackjack_pays_multiplier
+
+  # Insurance
+  if dealer_facecard == ACE and not player_has_blackjack and player.basic_strategy_skill_level <= 10:
+    accuracy_roll = np.random.randint(player.basic_strategy_skill_level, 101)
+    if accuracy_roll <= 10:
+      hand.insurance_bet = bet / 2
+      bankroll[0] -= hand.insurance_bet
+
+  # Early surrender
+  if rules.early_surrender_allowed:
+    _handle_surrender(hand, shoe_state, bankroll, surrender, rules, player, dealer_facecard)
+
+  # Dealer blackjack check
+  hand_count = 1
+  if dealer_has_blackjack:
+    if hand.insurance_bet > 0:
+      hand.finalized = True
+      hand.result = LOSS
+      # The player never gets their insurance bet back naturally,
+      # so payout here also covers refunding the original bet.
+      hand.payout = hand.insurance_bet * 3
+  else:
+    if not hand.surrendered:
+      _handle_surrender(hand, shoe_state, bankroll, surrender, rules, player, dealer_facecard)
+    hand_count = _handle_decisions(
+      shoe, shoe_state, bankroll, hands, dealer_facecard,
+      hard_totals, soft_totals, pair_splitting, rules, player
+    )
+    _handle_dealer_decisions(dealer, hands, hand_count, shoe, shoe_state, rules, player)
+
+  _set_results(hands, hand_count, dealer, rules)
+  _handle_payouts(bankroll, hands, hand_count)
+  return hand_count
+
+@njit(cache=True)
+def _handle_surrender(hand, shoe_state, bankroll, surrender, rules, player, dealer_facecard) -> None:
+  if not rules.late_surrender_allowed:
+    return
+  if hand.card_count != 2 or hand.from_split or hand.doubled_down:
+    return
+  if _is_two_card_twenty_one(hand) or _is_soft(hand):
+    return
+  # Mirrors AiPlayer.wants_to_surrender, which never surrenders a pair
+  if hand.first_card == hand.second_card:
+    return
+  true_count = _get_adjusted_value(
+    player.deviations_skill_level,
+    _calculate_true_count(shoe_state, rules),
+    -1,
+    6
+  )
+  hand_value = _get_adjusted_value(player.basic_strategy_skill_level, _get_hand_value(hand), 4, 21)
+  if surrender[true_count + 2, dealer_facecard, hand_value]:
+    bankroll[0] += hand.bet / 2
+    hand.finalized = True
+    hand.surrendered = True
+    hand.result = SURRENDERED
+
+@njit(cache=True)
+def _handle_decisions(
+  shoe, shoe_state, bankroll, hands, dealer_facecard,
+  hard_totals, soft_totals, pair_splitting, rules, player
+) -> int:
+  hand_count = 1
+  i = 0
+  while i < hand_count:
+    hand = hands[i]
+    while not hand.finalized:
+      if player.counts_cards and player.plays_deviations:
+        true_count = _calculate_true_count(shoe_state, rules)
+      else:
+        true_count = NO_TRUE_COUNT
+      decisions = _get_play(
+        hand, hand_count, dealer_facecard, true_count,
+        hard_totals, soft_totals, pair_splitting, rules, player
+      )
+      if decisions & SPLIT and bankroll[0] > hand.bet and _can_split(hand, hand_count, rules):
+        hand_count = _split_hand(shoe, shoe_state, bankroll, hands, i, hand_count, player)
+      elif decisions & DOUBLE_DOWN and bankroll[0] > hand.bet and _can_double_down(hand, rules):
+        bankroll[0] -= hand.bet
+        hand.finalized = True
+        hand.doubled_down = True
+        hand.bet *= 2
+        _deal_card(hand, shoe, shoe_state, player)
+        _handle_potential_bust_or_21(hand)
+      elif decisions & HIT and _can_hit(hand, rules):
+        _deal_card(hand, shoe, shoe_state, player)
+        _handle_potential_bust_or_21(hand)
+      elif decisions & STAND:
+        hand.finalized = True
+    i += 1
+  return hand_count
+
+@njit(cache=True)
+def _get_play(
+  hand, hand_count, dealer_facecard, true_count,
+  hard_totals, soft_totals, pair_splitting, rules, player
+) -> int:
+  decisions = 0
+  if _can_split(hand, hand_count, rules):
+    adjusted_true_count = _get_adjusted_true_count(true_count, player)
+    half_adjusted_hand_value = _get_adjusted_hand_value(hand, player) // 2
+    splitting_decision = pair_splitting[
+      _get_true_count_index_jit(adjusted_true_count),
+      dealer_facecard,
+      half_adjusted_hand_value
+    ]
+    if splitting_decision == 1:
+      decisions |= SPLIT
+    elif splitting_decision == 2:
+      if rules.double_after_split_including_aces or rules.double_after_split_except_aces:
+        decisions |= SPLIT
+  adjusted_true_count = _get_adjusted_true_count(true_count, player)
+  adjusted_hand_value = _get_adjusted_hand_value(hand, player)
+  true_count_index = _get_true_count_index_jit(adjusted_true_count)
+  if _is_soft(hand):
+    decisions |= soft_totals[true_count_index, dealer_facecard, adjusted_hand_value]
+  else:
+    decisions |= hard_totals[true_count_index, dealer_facecard, adjusted_hand_value]
+  return decisions
+
+@njit(cache=True)
+def _split_hand(shoe, shoe_state, bankroll, hands, hand_index, hand_count, player) -> int:
+  hand = hands[hand_index]
+  bankroll[0] -= hand.bet
+  new_hand = hands[hand_count]
+  _reset_hand(new_hand, hand.bet, True)
+  _add_card(new_hand, hand.second_card)
+  first_card = hand.first_card
+  hand.from_split = True
+  hand.card_count = 0
+  hand.hard_total = 0
+  hand.ace_count = 0
+  hand.second_card = 0
+  _add_card(hand, first_card)
+  hand_count += 1
+  for k in range(hand_count):
+    if hands[k].card_count == 1:
+      _deal_card(hands[k], shoe, shoe_state, player)
+  return hand_count
+
+@njit(cache=True)
+def _handle_potential_bust_or_21(hand) -> None:
+  hand_value = _get_hand_value(hand)
+  if hand_value > 21:
+    hand.finalized = True
+    hand.result = LOSS
+    hand.payout = 0.0
+  elif hand_value == 21:
+    hand.finalized = True
+
+@njit(cache=True)
+def _handle_dealer_decisions(dealer, hands, hand_count, shoe, shoe_state, rules, player) -> None:
+  if not _is_any_competing_hand(hands, hand_count):
+    return
+  while True:
+    dealer_value = _get_hand_value(dealer)
+    if dealer_value >= 21:
+      return
+    if dealer_value == 17 and _is_soft(dealer):
+      if not rules.dealer_hits_soft_seventeen:
+        return
+    elif dealer_value >= 17:
+      return
+    _deal_card(dealer, shoe, shoe_state, player)
+
+@njit(cache=True)
+def _is_any_competing_hand(hands, hand_count) -> bool:
+  for i in range(hand_count):
+    hand = hands[i]
+    hand_value = _get_hand_value(hand)
+    if hand_value <= 21 and not _is_two_card_twenty_one(hand):
+      return True
+  return False
+
+@njit(cache=True)
+def _set_results(hands, hand_count, dealer, rules) -> None:
+  dealer_value = _get_hand_value(dealer)
+  dealer_has_blackjack = _is_two_card_twenty_one(dealer)
+  dealer_busted = dealer_value > 21
+  for i in range(hand_count):
+    hand = hands[i]
+    if hand.result != UNDETERMINED:
+      continue
+    hand.finalized = True
+    hand_value = _get_hand_value(hand)
+    player_has_blackjack = _is_two_card_twenty_one(hand)
+    if hand_value > 21:
+      hand.result = LOSS
+    elif player_has_blackjack and dealer_has_blackjack:
+      hand.result = DRAW
+      hand.payout = 0.0
+    elif player_has_blackjack:
+      hand.result = BLACKJACK
+      hand.payout = hand.bet * rules.blackjack_pays_multiplier
+    elif hand_value == dealer_value:
+      hand.result = DRAW
+      hand.payout = 0.0
+    elif dealer_busted or hand_value > dealer_value:
+      hand.result = WIN
+      hand.payout = hand.bet
+    else:
+      hand.result = LOSS
+      hand.payout = 0.0
+
+@njit(cache=True)
+def _handle_payouts(bankroll, hands, hand_count) -> None:
+  for i in range(hand_count):
+    hand = hands[i]
+    if hand.result == LOSS:
+      bankroll[0] += hand.payout
+    elif hand.result != SURRENDERED:
+      bankroll[0] += hand.bet + hand.payout
+
+@njit(cache=True)
+def _update_results(bankroll, counts, profit_from_true, hands, hand_count, true_count) -> None:
+  if bankroll[1] < bankroll[0]:
+    bankroll[1] = bankroll[0]
+  if bankroll[2] > bankroll[0]:
+    bankroll[2] = bankroll[0]
+  adjusted_true_count = min(max(true_count, 0), 6)
+  for i in range(hand_count):
+    hand = hands[i]
+    profit_from_true[adjusted_true_count] += hand.payout - hand.insurance_bet
+    if hand.result == BLACKJACK:
+      counts[1] += 1
+    elif hand.result == WIN:
+      counts[2] += 1
+    elif hand.result == DRAW:
+      counts[3] += 1
+    elif hand.result == LOSS:
+      profit_from_true[adjusted_true_count] -= hand.bet
+      counts[4] += 1
+    elif hand.result == SURRENDERED:
+      profit_from_true[adjusted_true_count] -= hand.bet / 2
+      counts[5] += 1
+    counts[0] += 1
+
+@njit(cache=True)
+def _calculate_bet(true_count, bankroll, rules, player) -> float:
+  if true_count >= 6:
+    bet = player.bet_spread[6]
+  elif true_count >= 1:
+    bet = player.bet_spread[true_count]
+  else:
+    bet = player.bet_spread[0]
+  if bet > bankroll:
+    bet = bankroll
+  if bet < rules.min_bet:
+    bet = rules.min_bet
+  if bet > rules.max_bet:
+    bet = rules.max_bet
+  return bet
+
+@njit(cache=True)
+def _calculate_true_count(shoe_state, rules) -> int:
+  cards_remaining = rules.full_size - shoe_state[0]
+  # np.rint rounds half to even, same as the builtin round() used by Shoe.get_decks_remaining
+  decks_remaining = np.rint((cards_remaining / rules.full_size) * rules.deck_count)
+  if decks_remaining < 1:
+    decks_remaining = 1.0
+  return int(np.floor(shoe_state[1] / decks_remaining))
+
+@njit(cache=True)
+def _can_split(hand, hand_count, rules) -> bool:
+  if hand_count >= rules.maximum_hand_count:
+    return False
+  if hand.finalized:
+    return False
+  return hand.card_count == 2 and hand.first_card == hand.second_card
+
+@njit(cache=True)
+def _can_double_down(hand, rules) -> bool:
+  hand_value = _get_hand_value(hand)
+  first_card_is_ace = hand.first_card == ACE
+  if not rules.double_after_hit:
+    if hand.card_count > 2:
+      return False
+  if rules.double_after_split_except_aces:
+    if not rules.double_after_split_including_aces:
+      if hand.from_split and first_card_is_ace:
+        return False
+  else:
+    if not rules.double_after_split_including_aces:
+      if hand.from_split:
+        return False
+  if not rules.double_on_any_two_cards:
+    if rules.double_on_nine_ten_eleven_only:
+      if hand_value != 9 and hand_value != 10 and hand_value != 11:
+        return False
+    elif rules.double_on_ten_eleven_only:
+      if hand_value != 10 and hand_value != 11:
+        return False
+    else:
+      return False
+  return True
+
+@njit(cache=True)
+def _can_hit(hand, rules) -> bool:
+  if _get_hand_value(hand) >= 21:
+    return False
+  if not rules.can_hit_aces:
+    if hand.from_split and hand.first_card == ACE:
+      return False
+  return True
+
+@njit(cache=True)
+def _reset_hand(hand, bet, from_split) -> None:
+  hand.hard_total = 0
+  hand.ace_count = 0
+  hand.card_count = 0
+  hand.first_card = 0
+  hand.second_card = 0
+  hand.bet = bet
+  hand.insurance_bet = 0.0
+  hand.payout = 0.0
+  hand.result = UNDETERMINED
+  hand.finalized = False
+  hand.from_split = from_split
+  hand.doubled_down = False
+  hand.surrendered = False
+
+@njit(cache=True)
+def _draw(shoe, shoe_state) -> int:
+  cursor = shoe_state[0]
+  if cursor >= shoe.shape[0]:
+    raise IndexError("Tried to draw from an empty shoe")
+  shoe_state[0] = cursor + 1
+  return shoe[cursor]
+
+@njit(cache=True)
+def _deal_card(hand, shoe, shoe_state, player) -> None:
+  card_value = _add_card(hand, np.int64(_draw(shoe, shoe_state)))
+  if player.counts_cards:
+    shoe_state[1] += _get_count_adjustment(card_value, player.card_counting_skill_level)
+
+@njit(cache=True)
+def _add_card(hand, card) -> int:
+  # Returns the value the card holds once the hand is settled, which is what gets counted.
+  # A new ace only stays at 11 if every earlier ace can drop to 1 and the hand still doesn't bust.
+  if card == ACE:
+    if hand.hard_total + ACE <= 21:
+      card_value = ACE
+    else:
+      card_value = 1
+    hand.hard_total += 1
+    hand.ace_count += 1
+  else:
+    card_value = card
+    hand.hard_total += card
+  hand.card_count += 1
+  if hand.card_count == 1:
+    hand.first_card = card
+  elif hand.card_count == 2:
+    hand.second_card = card
+  return card_value
+
+@njit(cache=True)
+def _get_hand_value(hand) -> int:
+  if hand.ace_count > 0 and hand.hard_total + 10 <= 21:
+    return hand.hard_total + 10
+  return hand.hard_total
+
+@njit(cache=True)
+def _is_soft(hand) -> bool:
+  return hand.ace_count > 0 and hand.hard_total + 10 <= 21
+
+@njit(cache=True)
+def _is_two_card_twenty_one(hand) -> bool:
+  return hand.card_count == 2 and _get_hand_value(hand) == 21
+
+@njit(cache=True)
+def _get_true_count_index_jit(true_count) -> int:
+  if true_count == NO_TRUE_COUNT:
+    return 0
+  return true_count + 2
+
+@njit(cache=True)
+def _get_adjusted_true_count(true_count, player) -> int:
+  if true_count == NO_TRUE_COUNT:
+    return NO_TRUE_COUNT
+  return _get_adjusted_value(player.deviations_skill_level, true_count, -1, 6)
+
+@njit(cache=True)
+def _get_adjusted_hand_value(hand, player) -> int:
+  if _is_soft(hand):
+    minimum = 12
+  else:
+    minimum = 4
+  return _get_adjusted_value(player.basic_strategy_skill_level, _get_hand_value(hand), minimum, 21)
+
+@njit(cache=True)
+def _get_adjusted_value(skill_level, some_val, minimum, maximum) -> int:
+  if skill_level == 100:
+    return min(max(some_val, minimum), maximum)
+  accuracy_roll = np.random.randint(skill_level, 101)
+  spread = (100 - accuracy_roll) / 10
+  plus_or_minus_roll = np.random.randint(1, 3)
+  if plus_or_minus_roll == 1:
+    adjusted_value = int(some_val + spread)
+  else:
+    adjusted_value = int(some_val - spread)
+  if adjusted_value > maximum:
+    adjusted_value = maximum
+  elif adjusted_value < minimum:
+    adjusted_value = minimum
+  return adjusted_value
+
+@njit(cache=True)
+def _get_count_adjustment(card_value, skill_level) -> int:
+  if card_value <= 6:
+    actual_adjustment = 1
+  elif card_value <= 9:
+    actual_adjustment = 0
+  else:
+    actual_adjustment = -1
+  if skill_level >= 66:
+    return actual_adjustment
+  accuracy_roll = np.random.randint(skill_level, 101)
+  if accuracy_roll >= 66:
+    return actual_adjustment
+  if accuracy_roll >= 33 and actual_adjustment != 0:
+    return 0
+  if accuracy_roll < 33 and actual_adjustment != 0:
+    return -actual_adjustment
+  if np.random.randint(0, 2) == 0:
+    return 1
+  return -1
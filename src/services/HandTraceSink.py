@@ -0,0 +1,57 @@
+import json
+import os
+from pathlib import Path
+from typing import List, TextIO
+
+from entities.Hand import Hand
+
+
+# A structured trace of one sim, one JSON line per round, for following a single sim hand by hand without turning on
+# debug logging for all of them. Set BJE_TRACE_SIM_SEED to the seed recorded in a sim's results and rerun it with that
+# seed, and its rounds are written to BJE_TRACE_DIR/<seed>.jsonl. Only the object engine is traced, not fast_kernel.
+class HandTraceSink():
+  __path: Path
+  __file: TextIO
+  __round: int
+
+  def __init__(self, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    self.__path = path
+    self.__file = open(path, "w", encoding="utf-8") # pylint: disable=consider-using-with
+    self.__round = 0
+
+  @staticmethod
+  def is_traced(seed: int) -> bool:
+    traced_seed = os.getenv("BJE_TRACE_SIM_SEED")
+    return bool(traced_seed) and int(traced_seed) == seed
+
+  # None unless the sim with this seed is the one being traced
+  @staticmethod
+  def for_sim(seed: int) -> "HandTraceSink | None":
+    if not HandTraceSink.is_traced(seed):
+      return None
+    return HandTraceSink(Path(os.getenv("BJE_TRACE_DIR", ".sim-traces")) / f"{seed}.jsonl")
+
+  def get_path(self) -> Path:
+    return self.__path
+
+  def write_round(self, true_count: int, hands: List[Hand], bankroll: float) -> None:
+    self.__round += 1
+    record = {
+      "round": self.__round,
+      "true_count": true_count,
+      "hands": [
+        {
+          "cards": [hand.get_card_value(i) for i in range(hand.get_card_count())],
+          "bet": hand.get_bet(),
+          "result": hand.get_result().name,
+          "payout": hand.get_payout()
+        }
+        for hand in hands
+      ],
+      "bankroll": bankroll
+    }
+    self.__file.write(json.dumps(record) + "\n")
+
+  def close(self) -> None:
+    self.__file.close()
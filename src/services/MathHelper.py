@@ -1,14 +1,14 @@
 from numba import njit
 
 
-@njit
+@njit(cache=True)
 def get_human_time(total_hands_played: int, hands_per_hour: int) -> float:
   hours = total_hands_played / hands_per_hour
   minutes = hours * 60
   seconds = minutes * 60
   return seconds
 
-@njit
+@njit(cache=True)
 def get_percentage(value: float, total: float) -> float:
   if total == 0:
     return 100.0
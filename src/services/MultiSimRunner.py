@@ -4,28 +4,30 @@ import io
 import os
 import pstats
 import time
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from typing import List
 
 import services.MathHelper as MathHelper
 from entities.Game import Game
 from models.api.CreateMultiSimReq import CreateMultiSimReq
-from models.api.CreateSingleSimReq import CreateSingleSimReq
 from models.core.HumanTime import HumanTime
 from models.core.MultiSimBounds import MultiSimBounds
 from models.core.results.SimMultiResults import SimMultiResults
 from models.core.results.SimMultiResultsFormatted import SimMultiResultsFormatted
-from models.core.results.SimMultiResultsMetadata import SimMultiResultsMetadata
-from models.core.results.SimSingleResults import SimSingleResults
 from models.core.SingleSimBounds import SingleSimBounds
-from services.DatabaseHandler import DatabaseHandler
+from services.ResultBuffer import ResultBuffer
+from services.ResultStore import ResultStore
 from services.SimDataTransformer import SimDataTransformer
+from services.SimRandom import SimRandom
+from services.SimResultsAccumulator import SimResultsAccumulator
+from services.SimWorkerPool import SimWorkerPool
 from services.SingleSimRunner import SingleSimRunner
 
 
 class MultiSimRunner():
-  __database_handler: DatabaseHandler
+  __result_store: ResultStore
   __simulation_data_transformer: SimDataTransformer
+  __sim_worker_pool: SimWorkerPool | None
+  __result_buffer: ResultBuffer | None
   __human_time_limit: int | None
   __sim_time_limit: int | None
   __hands_per_hour: int
@@ -41,9 +43,13 @@ class MultiSimRunner():
     game: Game,
     bounds: SingleSimBounds,
     human_time: HumanTime,
-    original_req: CreateMultiSimReq
+    original_req: CreateMultiSimReq,
+    sim_worker_pool: SimWorkerPool | None = None,
+    result_buffer: ResultBuffer | None = None
   ):
-    self.__database_handler = DatabaseHandler()
+    self.__sim_worker_pool = sim_worker_pool
+    self.__result_buffer = result_buffer
+    self.__result_store = ResultStore.from_env()
     self.__simulation_data_transformer = SimDataTransformer()
     single_sim_req = self.__simulation_data_transformer.get_single_sim_req(original_req)
     self.__single_sim_runner = SingleSimRunner(game, bounds, human_time, single_sim_req)
@@ -62,95 +68,74 @@ class MultiSimRunner():
     loop = asyncio.get_running_loop()
     req = self.__single_sim_runner.get_original_req()
     req_dict = req.model_dump()
-
-    num_workers = os.cpu_count() or 2
-    metadata = SimMultiResultsMetadata.model_validate({})
-    results: List[SimSingleResults] = []
-
-    completed_runs = 0
+    request_hash = self.__simulation_data_transformer.get_request_hash(req_dict)
+    root_seed = self.__get_root_seed()
+
+    # Without a shared pool, fall back to one that only lives for this run
+    sim_worker_pool = self.__sim_worker_pool or SimWorkerPool()
+    executor = sim_worker_pool.get_executor()
+    num_workers = sim_worker_pool.get_max_workers()
+    sims_per_task = self.__get_sims_per_task(runs, num_workers)
+    accumulator = SimResultsAccumulator()
+    store_tasks: List[asyncio.Task] = []
+
+    scheduled_runs = 0
     lock = asyncio.Lock()
 
-    executor = ProcessPoolExecutor(max_workers=os.cpu_count())
-
+    # Each chunk's rows go off to be stored as soon as they arrive, so nothing holds every sim. With a result buffer
+    # they only have to reach the local log, and its flusher gets them into the database later.
     async def worker():
-      nonlocal completed_runs
+      nonlocal scheduled_runs
       while True:
         async with lock:
-          if completed_runs >= runs:
+          if scheduled_runs >= runs:
             break
-          completed_runs += 1
-        res = await loop.run_in_executor(executor, MultiSimRunner.run_one_sync_sim, req_dict)
-        results.append(res)
-        self.__count_sim(metadata, res)
-        self.__update_results_progress(results, metadata, runs)
+          sim_count = min(sims_per_task, runs - scheduled_runs)
+          first_sim_index = scheduled_runs
+          scheduled_runs += sim_count
+        aggregate = await loop.run_in_executor(
+          executor,
+          SimWorkerPool.run_sync_sims,
+          request_hash,
+          req_dict,
+          sim_count,
+          True,
+          root_seed,
+          first_sim_index
+        )
+        if self.__result_buffer is not None:
+          await asyncio.to_thread(self.__result_buffer.append, aggregate.rows, req)
+        else:
+          store_tasks.append(asyncio.create_task(
+            self.__result_store.store_simulation_results_bulk_async(aggregate.rows, req)
+          ))
+        aggregate.rows = []
+        accumulator.add_aggregate(aggregate)
+        self.__update_results_progress(accumulator, runs)
 
     await asyncio.gather(*(worker() for _ in range(min(num_workers, runs))))
-    executor.shutdown()
-
-    end_time = time.time()
-    metadata.success_rate = MathHelper.get_percentage(
-      metadata.sims_won,
-      (metadata.sims_run - metadata.sims_unfinished)
-    )
-    metadata.failure_rate = MathHelper.get_percentage(
-      metadata.sims_lost,
-      (metadata.sims_run - metadata.sims_unfinished)
-    )
-    assert metadata.success_rate + metadata.failure_rate == 100.0
-    single_sim_results_summed = self.__simulation_data_transformer.get_single_sims_summed(results)
-    metadata.total_hands = single_sim_results_summed.hands.counts.total
-    metadata.simulation_time = end_time - self.__start_time
-    metadata.human_time = self.__get_human_time(metadata.total_hands)
-
-    self.__set_results(results, metadata)
-    with ThreadPoolExecutor(max_workers=10) as executor:
-      futures = [
-        loop.run_in_executor(executor, self.__database_handler.store_simulation_single_result, r, req)
-        for r in results
-      ]
-      await asyncio.gather(*futures)
-
-  @staticmethod
-  def run_one_sync_sim(req_dict: dict) -> SimSingleResults:
-    req = CreateSingleSimReq(**req_dict)
-    game = Game(req.rules, req.ai_player_info)
-    runner = SingleSimRunner(game, req.bounds, req.time, req)
-    runner.run_sync()
-    results = runner.get_results()
-    assert results
-    return results
+    if sim_worker_pool is not self.__sim_worker_pool:
+      sim_worker_pool.shutdown()
+    self.__set_results(accumulator, time.time() - self.__start_time, root_seed)
+    await asyncio.gather(*store_tasks)
 
   async def run_with_one_core(self, runs: int) -> None:
     self.__full_reset()
-    single_sim_results = []
-    metadata = SimMultiResultsMetadata.model_validate({})
+    accumulator = SimResultsAccumulator()
     self.__start_time = time.time()
+    root_seed = self.__get_root_seed()
 
-    for _ in range(0, runs):
+    for sim_index in range(0, runs):
       self.__single_sim_runner.reset_game()
-      await self.__single_sim_runner.run()
-      single_sim_results.append(self.__single_sim_runner.get_results())
-      self.__count_sim_one_core(metadata)
-      self.__update_results_progress(single_sim_results, metadata, runs)
+      await self.__single_sim_runner.run(SimRandom.get_sim_seed(root_seed, sim_index))
+      results = self.__single_sim_runner.get_results()
+      assert results
+      accumulator.add(results)
+      self.__update_results_progress(accumulator, runs)
       if self.__results_progress == 100:
         break
 
-    end_time = time.time()
-    metadata.success_rate = MathHelper.get_percentage(
-      metadata.sims_won,
-      (metadata.sims_run - metadata.sims_unfinished)
-    )
-    metadata.failure_rate = MathHelper.get_percentage(
-      metadata.sims_lost,
-      (metadata.sims_run - metadata.sims_unfinished)
-    )
-    assert metadata.success_rate + metadata.failure_rate == 100.0
-    time_taken = end_time - self.__start_time
-    single_sim_results_summed = self.__simulation_data_transformer.get_single_sims_summed(single_sim_results)
-    metadata.total_hands = single_sim_results_summed.hands.counts.total
-    metadata.simulation_time = time_taken
-    metadata.human_time = self.__get_human_time(single_sim_results_summed.hands.counts.total)
-    self.__set_results(single_sim_results, metadata)
+    self.__set_results(accumulator, time.time() - self.__start_time, root_seed)
 
   async def run_with_benchmarking(self, runs: int) -> None:
     pr = cProfile.Profile()
@@ -183,70 +168,45 @@ class MultiSimRunner():
   def __get_human_time(self, total_hands_played: int) -> float:
     return MathHelper.get_human_time(total_hands_played, self.__hands_per_hour)
 
-  def __create_multi_sim_results(
-    self,
-    metadata: SimMultiResultsMetadata,
-    single_sim_results: List[SimSingleResults]
-  ) -> SimMultiResults:
-    total_runs = len(single_sim_results)
-    single_sims_summed = self.__simulation_data_transformer.get_single_sims_summed(single_sim_results)
-    single_sims_averaged = self.__simulation_data_transformer.get_single_sims_averaged(single_sims_summed, total_runs)
-    multi_sim_results = SimMultiResults.model_construct(
-      metadata=metadata,
-      average=single_sims_averaged
-    )
-    return multi_sim_results
+  # Every sim's seed comes from the run's root seed, so passing it back in as the request's seed replays the whole run
+  def __get_root_seed(self) -> int:
+    root_seed = self.__single_sim_runner.get_original_req().seed
+    return SimRandom.new_seed() if root_seed is None else root_seed
 
-  def __set_results(
-    self, single_sim_results: List[SimSingleResults],
-    metadata: SimMultiResultsMetadata
-  ) -> None:
-    total_runs = len(single_sim_results)
-    if total_runs == 0:
+  def __set_results(self, accumulator: SimResultsAccumulator, simulation_time: float, root_seed: int) -> None:
+    metadata = self.__simulation_data_transformer.get_multi_sim_metadata(accumulator)
+    if metadata is None:
       return
-    single_sims_summed = self.__simulation_data_transformer.get_single_sims_summed(single_sim_results)
-    single_sims_averaged = self.__simulation_data_transformer.get_single_sims_averaged(single_sims_summed, total_runs)
+    metadata.seed = root_seed
+    assert metadata.success_rate + metadata.failure_rate == 100.0
+    metadata.simulation_time = simulation_time
+    metadata.human_time = self.__get_human_time(metadata.total_hands)
+    single_sims_averaged = self.__simulation_data_transformer.get_single_sims_averaged(
+      accumulator.get_summed(),
+      accumulator.get_sims_run()
+    )
     profit_from_true = float(sum(single_sims_averaged.bankroll.profit.from_true))
     profit = single_sims_averaged.bankroll.profit.total
     assert abs(profit_from_true - profit) < 0.01
-    multi_sim_results = self.__create_multi_sim_results(metadata, single_sim_results)
-    self.__results = multi_sim_results
-
-  def __count_sim(self, metadata: SimMultiResultsMetadata, result: SimSingleResults) -> None:
-    ending_bankroll = result.bankroll.ending
-    bankroll_goal = self.__single_sim_runner.get_bankroll_goal()
-    bankroll_fail = self.__single_sim_runner.get_bankroll_fail()
-    metadata.sims_run += 1
-    if ending_bankroll >= bankroll_goal:
-      metadata.sims_won += 1
-    elif ending_bankroll <= bankroll_fail:
-      metadata.sims_lost += 1
-    else:
-      metadata.sims_unfinished += 1
+    self.__results = SimMultiResults.model_construct(
+      metadata=metadata,
+      average=single_sims_averaged
+    )
 
-  def __count_sim_one_core(self, metadata: SimMultiResultsMetadata) -> None:
-    ending_bankroll = self.__single_sim_runner.get_bankroll()
-    bankroll_goal = self.__single_sim_runner.get_bankroll_goal()
-    bankroll_fail = self.__single_sim_runner.get_bankroll_fail()
-    metadata.sims_run += 1
-    if ending_bankroll >= bankroll_goal:
-      metadata.sims_won += 1
-    elif ending_bankroll <= bankroll_fail:
-      metadata.sims_lost += 1
-    else:
-      metadata.sims_unfinished += 1
+  # Enough sims per task to keep IPC off the hot path, while still handing each worker several tasks so
+  # they finish together and progress keeps moving. BJE_SIMS_PER_WORKER_TASK overrides it.
+  def __get_sims_per_task(self, runs: int, num_workers: int) -> int:
+    sims_per_task = os.getenv("BJE_SIMS_PER_WORKER_TASK")
+    if sims_per_task:
+      return max(1, int(sims_per_task))
+    return max(1, min(256, runs // (num_workers * 4)))
 
   def __full_reset(self) -> None:
     self.__results_progress = 0
     self.__results = SimMultiResults.model_validate({})
     self.__start_time = None
 
-  def __update_results_progress(
-    self,
-    single_sim_results: List[SimSingleResults],
-    metadata: SimMultiResultsMetadata,
-    runs: int
-  ) -> None:
+  def __update_results_progress(self, accumulator: SimResultsAccumulator, runs: int) -> None:
     if self.__start_time is None:
       raise RuntimeError("start_time is None.")
 
@@ -259,15 +219,12 @@ class MultiSimRunner():
 
     human_time_percentage_done = 0
     if self.__human_time_limit:
-      total_hands_played = 0
-      for result in single_sim_results:
-        total_hands_played += result.hands.counts.total
-      human_time = self.__get_human_time(total_hands_played)
+      human_time = self.__get_human_time(accumulator.get_total_hands())
       human_time_percentage_done = MathHelper.get_percentage(human_time, self.__human_time_limit)
       if human_time_percentage_done > 100:
         human_time_percentage_done = 100
 
-    sim_count_percentage_done = MathHelper.get_percentage(metadata.sims_run, runs)
+    sim_count_percentage_done = MathHelper.get_percentage(accumulator.get_sims_run(), runs)
     highest_progress = max(sim_time_percentage_done, human_time_percentage_done, sim_count_percentage_done)
     highest_progress = min(highest_progress, 100)
     self.__results_progress = int(highest_progress)
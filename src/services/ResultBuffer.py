@@ -0,0 +1,190 @@
+import json
+import os
+import struct
+import threading
+import uuid
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+from models.api.CreateSingleSimReq import CreateSingleSimReq
+from models.core.results.SimSingleResults import SimSingleResults
+from services.BlackjackLogger import BlackjackLogger
+from services.ResultStore import ResultStore
+
+# Each record is a 4 byte big-endian length followed by that many bytes of JSON:
+# {"batch_id": ..., "request": ..., "results": [...]}
+RECORD_HEADER = struct.Struct(">I")
+
+
+# Results are appended (and fsynced) to a local log before anything touches the database, and a background thread
+# drains the log into the database in batches, retrying with backoff while it's unavailable. The offset of the
+# first record not yet stored is kept in a sidecar file, so anything left over is stored after a restart. Every record
+# has its own batch id, which the store keeps in the same transaction as the record's results. A crash between the
+# store committing and the offset moving past it replays those records, and they're skipped rather than stored again.
+class ResultBuffer():
+  __log_path: Path
+  __offset_path: Path
+  __result_store: ResultStore
+  __append_lock: threading.Lock
+  __flush_lock: threading.Lock
+  __wake_up: threading.Event
+  __stopping: threading.Event
+  __flusher: threading.Thread | None
+
+  def __init__(self, directory: Path | None = None, result_store: ResultStore | None = None):
+    if directory is None:
+      directory = Path(os.getenv("BJE_RESULT_BUFFER_DIR", ".result-buffer"))
+    self.__log_path = directory / "results.log"
+    self.__offset_path = directory / "results.offset"
+    self.__result_store = result_store or ResultStore.from_env()
+    self.__append_lock = threading.Lock()
+    self.__flush_lock = threading.Lock()
+    self.__wake_up = threading.Event()
+    self.__stopping = threading.Event()
+    self.__flusher = None
+    directory.mkdir(parents=True, exist_ok=True)
+    self.__log_path.touch(exist_ok=True)
+    self.__drop_partial_record()
+
+  def append(self, sim_results: List[SimSingleResults], request: CreateSingleSimReq) -> None:
+    if not sim_results:
+      return
+    record = json.dumps({
+      "batch_id": uuid.uuid4().hex,
+      "request": request.model_dump(),
+      "results": [r.model_dump() for r in sim_results]
+    }).encode()
+    with self.__append_lock:
+      with open(self.__log_path, "ab") as log:
+        log.write(RECORD_HEADER.pack(len(record)) + record)
+        log.flush()
+        os.fsync(log.fileno())
+    self.__wake_up.set()
+
+  def get_pending_bytes(self) -> int:
+    return self.__log_path.stat().st_size - self.__read_offset()
+
+  def start(self) -> None:
+    if self.__flusher is not None:
+      return
+    self.__stopping.clear()
+    self.__flusher = threading.Thread(target=self.__run_flusher, name="result-buffer-flusher", daemon=True)
+    self.__flusher.start()
+
+  # Stops the flusher after one last attempt at draining the log. Whatever is still pending stays on disk.
+  def stop(self) -> None:
+    if self.__flusher is None:
+      return
+    self.__stopping.set()
+    self.__wake_up.set()
+    self.__flusher.join()
+    self.__flusher = None
+
+  # Stores every complete record in the log, one bulk write per run of consecutive records for the same request.
+  # Returns how many sims were stored, and raises (leaving the failed batch in the log) if the database does.
+  def flush(self) -> int:
+    max_batch_size = int(os.getenv("BJE_RESULT_BUFFER_BATCH_SIZE", "5000"))
+    sims_flushed = 0
+    with self.__flush_lock:
+      batch: List[SimSingleResults] = []
+      batch_ids: List[str] = []
+      batch_request: dict = {}
+      batch_end = 0
+      # Only the records right after the offset can already be stored, so the check stops at the first one that isn't
+      checking_stored = True
+      for record_end, batch_id, request_dict, results in self.__iter_records(self.__read_offset()):
+        if checking_stored:
+          if batch_id is not None and self.__result_store.is_batch_stored(batch_id):
+            self.__write_offset(record_end)
+            continue
+          checking_stored = False
+        if batch and (request_dict != batch_request or len(batch) >= max_batch_size):
+          sims_flushed += self.__store_batch(batch, batch_ids, batch_request, batch_end)
+          batch = []
+          batch_ids = []
+        batch_request = request_dict
+        batch.extend(SimSingleResults(**r) for r in results)
+        # Records appended before batch ids existed are stored without one
+        if batch_id is not None:
+          batch_ids.append(batch_id)
+        batch_end = record_end
+      if batch:
+        sims_flushed += self.__store_batch(batch, batch_ids, batch_request, batch_end)
+      self.__truncate_if_drained()
+    return sims_flushed
+
+  def __store_batch(
+    self,
+    batch: List[SimSingleResults],
+    batch_ids: List[str],
+    request_dict: dict,
+    batch_end: int
+  ) -> int:
+    self.__result_store.store_simulation_results_bulk(batch, CreateSingleSimReq(**request_dict), batch_ids)
+    self.__write_offset(batch_end)
+    return len(batch)
+
+  def __run_flusher(self) -> None:
+    interval = float(os.getenv("BJE_RESULT_BUFFER_FLUSH_SECONDS", "1.0"))
+    max_backoff = float(os.getenv("BJE_RESULT_BUFFER_MAX_BACKOFF_SECONDS", "60.0"))
+    backoff = interval
+    while True:
+      self.__wake_up.wait(backoff)
+      self.__wake_up.clear()
+      try:
+        self.flush()
+        backoff = interval
+      except Exception as e: # pylint: disable=broad-exception-caught
+        backoff = min(backoff * 2, max_backoff)
+        BlackjackLogger.warning("Failed to flush buffered results, retrying in %.1fs: %s", backoff, e)
+      if self.__stopping.is_set():
+        return
+
+  # Yields (offset just past the record, batch id, request dict, result dicts) for every complete record after offset
+  def __iter_records(self, offset: int) -> Iterator[Tuple[int, str | None, dict, list]]:
+    with open(self.__log_path, "rb") as log:
+      log.seek(offset)
+      while True:
+        header = log.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+          return
+        (length,) = RECORD_HEADER.unpack(header)
+        body = log.read(length)
+        if len(body) < length:
+          return
+        offset += RECORD_HEADER.size + length
+        record = json.loads(body)
+        yield offset, record.get("batch_id"), record["request"], record["results"]
+
+  def __read_offset(self) -> int:
+    if not self.__offset_path.exists():
+      return 0
+    return int(self.__offset_path.read_text() or 0)
+
+  def __write_offset(self, offset: int) -> None:
+    temp_path = self.__offset_path.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as offset_file:
+      offset_file.write(str(offset))
+      offset_file.flush()
+      os.fsync(offset_file.fileno())
+    os.replace(temp_path, self.__offset_path)
+
+  # Once everything has been stored, the log starts over instead of growing forever. The offset is reset first, so
+  # a crash in between replays stored records (which are then skipped by their batch ids) rather than skipping new
+  # ones.
+  def __truncate_if_drained(self) -> None:
+    with self.__append_lock:
+      if self.__log_path.stat().st_size == self.__read_offset():
+        self.__write_offset(0)
+        with open(self.__log_path, "r+b") as log:
+          log.truncate(0)
+
+  # A crash mid-append can leave half a record at the end of the log, which would swallow the next one
+  def __drop_partial_record(self) -> None:
+    complete_end = self.__read_offset()
+    for record_end, _, _, _ in self.__iter_records(complete_end):
+      complete_end = record_end
+    if self.__log_path.stat().st_size > complete_end:
+      BlackjackLogger.warning("Dropping a partially written record at the end of %s.", self.__log_path)
+      with open(self.__log_path, "r+b") as log:
+        log.truncate(complete_end)
@@ -0,0 +1,147 @@
+import argparse
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+from dotenv import load_dotenv
+
+from services.ResultStore import ResultStore
+
+FILE_FORMATS = ("parquet", "arrow")
+
+
+# Writes every stored sim for a request hash as one flat row each, to Parquet or to an Arrow IPC file. Rows are read
+# and written one chunk (BJE_EXPORT_CHUNK_SIZE rows) at a time, so memory stays flat however many sims there are.
+# pyarrow is optional (pip install .[export]) and only imported once an export is asked for.
+# CLI: PYTHONPATH=src python -m services.ResultExporter <request hash> <output path> [--file-format arrow]
+class ResultExporter():
+  __result_store: ResultStore
+
+  def __init__(self, result_store: ResultStore | None = None):
+    self.__result_store = result_store or ResultStore.from_env()
+
+  # Returns how many sims were written
+  def export(self, request_hash: str, sink: BinaryIO, file_format: str = "parquet") -> int:
+    rows_written = 0
+    for rows_written in self.__write_chunks(request_hash, sink, self.__get_pyarrow(file_format), file_format):
+      pass
+    return rows_written
+
+  # Same as export, but hands back the file's bytes as each chunk is written, for streaming it out. Raises up front,
+  # rather than partway through, if the format is unknown or pyarrow isn't installed.
+  def iter_export(self, request_hash: str, file_format: str = "parquet") -> Iterator[bytes]:
+    pyarrow = self.__get_pyarrow(file_format)
+    sink = ChunkSink()
+
+    def iter_bytes() -> Iterator[bytes]:
+      for _ in self.__write_chunks(request_hash, sink, pyarrow, file_format):
+        yield sink.drain()
+      # The footer is written when the writer closes
+      yield sink.drain()
+
+    return iter_bytes()
+
+  def __write_chunks(self, request_hash: str, sink: Any, pyarrow: Any, file_format: str) -> Iterator[int]:
+    schema = self.__get_schema(pyarrow)
+    if file_format == "parquet":
+      import pyarrow.parquet as parquet # pylint: disable=import-outside-toplevel
+      writer = parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+      writer = pyarrow.ipc.new_file(sink, schema)
+    chunk_size = int(os.getenv("BJE_EXPORT_CHUNK_SIZE", "10000"))
+    rows_written = 0
+    try:
+      for rows in self.__result_store.iter_result_rows(request_hash, chunk_size):
+        writer.write_batch(pyarrow.RecordBatch.from_pylist(rows, schema=schema))
+        rows_written += len(rows)
+        yield rows_written
+    finally:
+      writer.close()
+
+  def __get_pyarrow(self, file_format: str) -> Any:
+    if file_format not in FILE_FORMATS:
+      raise ValueError(f"Unknown file format: {file_format}")
+    try:
+      import pyarrow # pylint: disable=import-outside-toplevel
+    except ImportError as e:
+      raise RuntimeError("Exporting results needs pyarrow, which isn't installed.") from e
+    return pyarrow
+
+  # Matches the row values from SimDataTransformer.get_result_row_values, minus request_id
+  def __get_schema(self, pyarrow: Any) -> Any:
+    return pyarrow.schema([
+      ("won", pyarrow.bool_()),
+      ("hands_total", pyarrow.int64()),
+      ("hands_blackjack", pyarrow.int64()),
+      ("hands_won", pyarrow.int64()),
+      ("hands_drawn", pyarrow.int64()),
+      ("hands_lost", pyarrow.int64()),
+      ("hands_surrendered", pyarrow.int64()),
+      ("percentage_blackjack", pyarrow.float64()),
+      ("percentage_won", pyarrow.float64()),
+      ("percentage_drawn", pyarrow.float64()),
+      ("percentage_lost", pyarrow.float64()),
+      ("percentage_surrendered", pyarrow.float64()),
+      ("bankroll_starting", pyarrow.float64()),
+      ("bankroll_ending", pyarrow.float64()),
+      ("bankroll_highest", pyarrow.float64()),
+      ("bankroll_lowest", pyarrow.float64()),
+      ("profit_total", pyarrow.float64()),
+      ("profit_from_true", pyarrow.list_(pyarrow.float64())),
+      ("profit_per_hand", pyarrow.float64()),
+      ("profit_per_hour", pyarrow.float64()),
+      ("human_time", pyarrow.float64()),
+      ("simulation_time", pyarrow.float64()),
+      ("seed", pyarrow.int64())
+    ])
+
+
+# A write-only file for pyarrow that holds bytes until they're drained. It keeps counting from the start of the file,
+# since the writers record offsets from tell().
+class ChunkSink():
+  __chunks: list[bytes]
+  __position: int
+  __closed: bool
+
+  def __init__(self):
+    self.__chunks = []
+    self.__position = 0
+    self.__closed = False
+
+  @property
+  def closed(self) -> bool:
+    return self.__closed
+
+  def write(self, data: bytes) -> int:
+    self.__chunks.append(bytes(data))
+    self.__position += len(data)
+    return len(data)
+
+  def tell(self) -> int:
+    return self.__position
+
+  def writable(self) -> bool:
+    return True
+
+  def flush(self) -> None:
+    pass
+
+  def close(self) -> None:
+    self.__closed = True
+
+  def drain(self) -> bytes:
+    data = b"".join(self.__chunks)
+    self.__chunks = []
+    return data
+
+
+if __name__ == "__main__":
+  load_dotenv()
+  parser = argparse.ArgumentParser(description="Export every stored sim for a request hash.")
+  parser.add_argument("request_hash")
+  parser.add_argument("output", type=Path)
+  parser.add_argument("--file-format", choices=FILE_FORMATS, default="parquet")
+  args = parser.parse_args()
+  with open(args.output, "wb") as output:
+    sims_written = ResultExporter().export(args.request_hash, output, args.file_format)
+  print(f"Wrote {sims_written} sims to {args.output}")
@@ -0,0 +1,81 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Iterator, List
+
+from models.api.CreateSingleSimReq import CreateSingleSimReq
+from models.core.results.SimMultiResults import SimMultiResults
+from models.core.results.SimSingleResults import SimSingleResults
+
+
+# Everything the app needs from wherever sim results are kept. BJE_RESULT_STORE picks the implementation:
+# "postgres" (the default) or "sqlite", an embedded file that needs no database server.
+class ResultStore(ABC):
+
+  @staticmethod
+  def from_env() -> "ResultStore":
+    # Only imported when picked, so the embedded store never touches the Postgres engine
+    # pylint: disable=import-outside-toplevel
+    result_store = os.getenv("BJE_RESULT_STORE", "postgres")
+    if result_store == "postgres":
+      from services.DatabaseHandler import DatabaseHandler
+      return DatabaseHandler()
+    if result_store == "sqlite":
+      from services.SqliteResultStore import SqliteResultStore
+      return SqliteResultStore()
+    raise ValueError(f"Unknown BJE_RESULT_STORE: {result_store}")
+
+  # Creates anything the store needs before its first read or write. Safe to call more than once.
+  @abstractmethod
+  def create_schema(self) -> None:
+    pass
+
+  # batch_ids name where the results came from (the ResultBuffer's records) and are kept in the same transaction as
+  # the results, so a batch can never be stored twice: storing an id that's already been stored fails the whole call.
+  @abstractmethod
+  def store_simulation_results_bulk(
+    self,
+    sim_results: List[SimSingleResults],
+    request: CreateSingleSimReq,
+    batch_ids: List[str] | None = None
+  ) -> None:
+    pass
+
+  @abstractmethod
+  def is_batch_stored(self, batch_id: str) -> bool:
+    pass
+
+  @abstractmethod
+  async def store_simulation_results_bulk_async(
+    self,
+    sim_results: List[SimSingleResults],
+    request: CreateSingleSimReq
+  ) -> None:
+    pass
+
+  @abstractmethod
+  def get_all_sim_results(self, request: CreateSingleSimReq) -> SimMultiResults | None:
+    pass
+
+  @abstractmethod
+  async def get_all_sim_results_async(self, request: CreateSingleSimReq) -> SimMultiResults | None:
+    pass
+
+  @abstractmethod
+  def get_sim_results(self, request: CreateSingleSimReq) -> List[SimSingleResults]:
+    pass
+
+  # Streams every stored sim for a request hash in storage order, chunk_size at a time, as the flat row values from
+  # SimDataTransformer.get_result_row_values (without request_id). Yields nothing for an unknown hash.
+  @abstractmethod
+  def iter_result_rows(self, request_hash: str, chunk_size: int) -> Iterator[List[dict]]:
+    pass
+
+  def store_simulation_single_result(self, sim_result: SimSingleResults, request: CreateSingleSimReq) -> None:
+    self.store_simulation_results_bulk([sim_result], request)
+
+  async def store_simulation_single_result_async(
+    self,
+    sim_result: SimSingleResults,
+    request: CreateSingleSimReq
+  ) -> None:
+    await self.store_simulation_results_bulk_async([sim_result], request)
@@ -122,10 +122,7 @@ class RulesEngine():
     return self.__dealer_rules.dealer_hits_soft_seventeen
 
   def shoe_must_be_shuffled(self, shoe: Shoe) -> bool:
-    card_shuffle_point = (self.__dealer_rules.deck_count * 52) * (self.__dealer_rules.shoe_reset_percentage / 100)
-    if shoe.get_card_count() <= card_shuffle_point:
-      return True
-    return False
+    return shoe.must_be_shuffled()
 
   # This whole function is pretty ugly, probably its a sign that I should
   # rewrite the DoubleDownRules model, but I'm choosing violence today
@@ -10,6 +10,8 @@ from models.core.player_info.AiPlayerInfo import AiPlayerInfo
 from models.core.rules.GameRules import GameRules
 from models.core.SingleSimBounds import SingleSimBounds
 from services.MultiSimRunner import MultiSimRunner
+from services.ResultBuffer import ResultBuffer
+from services.SimWorkerPool import SimWorkerPool
 from services.SingleSimRunner import SingleSimRunner
 
 
@@ -17,6 +19,8 @@ class SessionManagerSingleton:
   _game_sessions: dict[str, Game]
   _single_sim_runner_sessions: dict
   _multi_sim_runner_sessions: dict
+  _sim_worker_pool: SimWorkerPool
+  _result_buffer: ResultBuffer | None
   __instance: "SessionManagerSingleton" = None # type: ignore
 
   def __new__(cls) -> "SessionManagerSingleton":
@@ -25,6 +29,8 @@ class SessionManagerSingleton:
       cls.__instance._game_sessions = {}
       cls.__instance._single_sim_runner_sessions = {}
       cls.__instance._multi_sim_runner_sessions = {}
+      cls.__instance._sim_worker_pool = SimWorkerPool()
+      cls.__instance._result_buffer = None
     return cls.__instance
 
   def create_game(
@@ -62,7 +68,15 @@ class SessionManagerSingleton:
   ) -> str:
     session_id = str(uuid.uuid4())
     game = Game(rules, ai_player_info)
-    multi_sim_runner = MultiSimRunner(multi_bounds, game, bounds, time, original_req)
+    multi_sim_runner = MultiSimRunner(
+      multi_bounds,
+      game,
+      bounds,
+      time,
+      original_req,
+      self._sim_worker_pool,
+      self.get_result_buffer()
+    )
     self._multi_sim_runner_sessions[session_id] = multi_sim_runner
     return session_id
 
@@ -83,3 +97,12 @@ class SessionManagerSingleton:
     if multi_sim_runner is None:
       raise RuntimeError("Tried to retrieve a nonexistant MultiSimRunner session.")
     return multi_sim_runner
+
+  def get_sim_worker_pool(self) -> SimWorkerPool:
+    return self._sim_worker_pool
+
+  # Built lazily, since the app's singletons are built before the .env gets loaded
+  def get_result_buffer(self) -> ResultBuffer:
+    if self._result_buffer is None:
+      self._result_buffer = ResultBuffer()
+    return self._result_buffer
@@ -1,3 +1,5 @@
+import hashlib
+import json
 from typing import List
 
 from models.api.CreateMultiSimReq import CreateMultiSimReq
@@ -20,8 +22,9 @@ from models.core.results.SimSingleResults import SimSingleResults
 from models.core.results.SimSingleResultsFormatted import SimSingleResultsFormatted
 from models.core.results.TimeResults import TimeResults
 from models.core.results.TimeResultsFormatted import TimeResultsFormatted
-from models.db.results.SimSingleResultsORM import SimSingleResultsORM
+from models.db.results.SimResultRowORM import SimResultRowORM
 from services import MathHelper
+from services.SimResultsAccumulator import SimResultsAccumulator
 
 
 class SimDataTransformer():
@@ -178,49 +181,45 @@ class SimDataTransformer():
     )
 
   def get_multi_sim_results(self, single_sim_results: List[SimSingleResults]) -> SimMultiResults | None:
-    sims_run = len(single_sim_results)
-    sims_won = 0
-    sims_lost = 0
-    sims_unfinished = 0
-    simulation_time = 0.0
-    human_time = 0.0
-    total_hands = 0
+    accumulator = SimResultsAccumulator()
     for result in single_sim_results:
-      if result.won:
-        sims_won += 1
-      elif result.won is False:
-        sims_lost += 1
-      elif result.won is None:
-        sims_unfinished += 1
-      total_hands += result.hands.counts.total
-      simulation_time += result.time.simulation_time
-      human_time += result.time.human_time
-    sims_finished = sims_run - sims_unfinished
-    if sims_finished <= 0:
-      return None
-    success_rate = MathHelper.get_percentage(sims_won, sims_finished)
-    failure_rate = MathHelper.get_percentage(sims_lost, sims_finished)
-    metadata = SimMultiResultsMetadata.model_construct(
-      sims_run=sims_run,
-      sims_won=sims_won,
-      sims_lost=sims_lost,
-      sims_unfinished=sims_unfinished,
-      success_rate=success_rate,
-      failure_rate=failure_rate,
-      total_hands=total_hands,
-      simulation_time=simulation_time,
-      human_time=human_time
-    )
-
-    single_sims_summed = self.get_single_sims_summed(single_sim_results)
-    single_sims_averaged = self.get_single_sims_averaged(single_sims_summed, sims_run)
+      accumulator.add(result)
+    return self.get_multi_sim_results_from_accumulator(accumulator)
 
+  # For sims that were already stored, so the times are the per-sim times summed rather than the wall clock
+  def get_multi_sim_results_from_accumulator(self, accumulator: SimResultsAccumulator) -> SimMultiResults | None:
+    metadata = self.get_multi_sim_metadata(accumulator)
+    if metadata is None:
+      return None
+    single_sims_summed = accumulator.get_summed()
+    metadata.simulation_time = single_sims_summed.time.simulation_time
+    metadata.human_time = single_sims_summed.time.human_time
     multi_sim_result = SimMultiResults.model_construct(
       metadata=metadata,
-      average=single_sims_averaged
+      average=self.get_single_sims_averaged(single_sims_summed, accumulator.get_sims_run())
     )
     return multi_sim_result
 
+  def get_multi_sim_metadata(self, accumulator: SimResultsAccumulator) -> SimMultiResultsMetadata | None:
+    sims_finished = accumulator.get_sims_run() - accumulator.get_sims_unfinished()
+    if sims_finished <= 0:
+      return None
+    metadata = SimMultiResultsMetadata.model_construct(
+      sims_run=accumulator.get_sims_run(),
+      sims_won=accumulator.get_sims_won(),
+      sims_lost=accumulator.get_sims_lost(),
+      sims_unfinished=accumulator.get_sims_unfinished(),
+      success_rate=MathHelper.get_percentage(accumulator.get_sims_won(), sims_finished),
+      failure_rate=MathHelper.get_percentage(accumulator.get_sims_lost(), sims_finished),
+      total_hands=accumulator.get_total_hands(),
+      simulation_time=0.0,
+      human_time=0.0,
+      profit_std_dev=accumulator.get_profit_std_dev(),
+      profit_lowest=accumulator.get_profit_lowest(),
+      profit_highest=accumulator.get_profit_highest()
+    )
+    return metadata
+
   def format_multi_sim_results(
     self,
     multi_sim_results: SimMultiResults,
@@ -246,7 +245,11 @@ class SimDataTransformer():
       failure_rate = f"{round(multi_sim_results.metadata.failure_rate, 2):.2f}%",
       total_hands = f"{multi_sim_results.metadata.total_hands:,}",
       simulation_time = f"{sim_time}",
-      human_time = f"{human_time}"
+      human_time = f"{human_time}",
+      profit_std_dev = self.__get_formatted_bankroll(multi_sim_results.metadata.profit_std_dev),
+      profit_lowest = self.__get_formatted_bankroll(multi_sim_results.metadata.profit_lowest),
+      profit_highest = self.__get_formatted_bankroll(multi_sim_results.metadata.profit_highest),
+      seed = "" if multi_sim_results.metadata.seed is None else str(multi_sim_results.metadata.seed)
     )
     formatted_single_sim_average = self.format_single_sim_results(
       multi_sim_results.average,
@@ -263,15 +266,87 @@ class SimDataTransformer():
   def get_single_sim_req(self, multi_sim_req: CreateMultiSimReq) -> CreateSingleSimReq:
     return multi_sim_req.single
 
-  def orm_to_pydantic(self, sim_orm: SimSingleResultsORM) -> SimSingleResults:
+  def get_request_dict(self, request: CreateSingleSimReq) -> dict:
+    # fast_kernel only picks the engine and seed only picks the random stream, so neither splits up stored results
+    return request.model_dump(exclude={"fast_kernel", "seed"})
+
+  def get_request_hash(self, request_dict: dict) -> str:
+    request_json = json.dumps(request_dict, sort_keys=True)
+    return hashlib.sha256(request_json.encode()).hexdigest()
+
+  def get_result_row_values(self, sim_result: SimSingleResults, request_id: int) -> dict:
+    counts = sim_result.hands.counts
+    percentages = sim_result.hands.percentages
+    bankroll = sim_result.bankroll
+    return {
+      "request_id": request_id,
+      "won": sim_result.won,
+      "hands_total": counts.total,
+      "hands_blackjack": counts.blackjack,
+      "hands_won": counts.won,
+      "hands_drawn": counts.drawn,
+      "hands_lost": counts.lost,
+      "hands_surrendered": counts.surrendered,
+      "percentage_blackjack": percentages.blackjack,
+      "percentage_won": percentages.won,
+      "percentage_drawn": percentages.drawn,
+      "percentage_lost": percentages.lost,
+      "percentage_surrendered": percentages.surrendered,
+      "bankroll_starting": bankroll.starting,
+      "bankroll_ending": bankroll.ending,
+      "bankroll_highest": bankroll.highest,
+      "bankroll_lowest": bankroll.lowest,
+      "profit_total": bankroll.profit.total,
+      "profit_from_true": list(bankroll.profit.from_true),
+      "profit_per_hand": bankroll.profit.per_hand,
+      "profit_per_hour": bankroll.profit.per_hour,
+      "human_time": sim_result.time.human_time,
+      "simulation_time": sim_result.time.simulation_time,
+      "seed": sim_result.seed
+    }
+
+  def orm_to_pydantic(self, sim_orm: SimResultRowORM) -> SimSingleResults:
+    columns = sim_orm.__table__.columns
+    return self.row_values_to_pydantic({column.key: getattr(sim_orm, column.key) for column in columns})
+
+  # The inverse of get_result_row_values
+  def row_values_to_pydantic(self, row: dict) -> SimSingleResults:
     return SimSingleResults(
-      won=bool(sim_orm.won) if sim_orm.won is not None else None,
+      won=bool(row["won"]) if row["won"] is not None else None,
       hands=HandResults(
-        counts=HandResultsCounts.model_validate(sim_orm.hands.counts, from_attributes=True),
-        percentages=HandResultsPercentages.model_validate(sim_orm.hands.percentages, from_attributes=True)
+        counts=HandResultsCounts(
+          total=row["hands_total"],
+          blackjack=row["hands_blackjack"],
+          won=row["hands_won"],
+          drawn=row["hands_drawn"],
+          lost=row["hands_lost"],
+          surrendered=row["hands_surrendered"]
+        ),
+        percentages=HandResultsPercentages(
+          blackjack=row["percentage_blackjack"],
+          won=row["percentage_won"],
+          drawn=row["percentage_drawn"],
+          lost=row["percentage_lost"],
+          surrendered=row["percentage_surrendered"]
+        )
+      ),
+      bankroll=BankrollResults(
+        starting=row["bankroll_starting"],
+        ending=row["bankroll_ending"],
+        highest=row["bankroll_highest"],
+        lowest=row["bankroll_lowest"],
+        profit=ProfitResults(
+          total=row["profit_total"],
+          from_true=list(row["profit_from_true"]),
+          per_hand=row["profit_per_hand"],
+          per_hour=row["profit_per_hour"]
+        )
+      ),
+      time=TimeResults(
+        human_time=row["human_time"],
+        simulation_time=row["simulation_time"]
       ),
-      bankroll=BankrollResults.model_validate(sim_orm.bankroll, from_attributes=True),
-      time=TimeResults.model_validate(sim_orm.time, from_attributes=True)
+      seed=row["seed"]
     )
 
   def __get_hand_results_percentages(self, counts: HandResultsCounts) -> HandResultsPercentages:
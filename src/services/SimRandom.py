@@ -0,0 +1,63 @@
+import os
+from typing import List
+
+import numpy as np
+
+# Seeds are kept to 63 bits so they fit in a signed BIGINT column
+SEED_MASK = (1 << 63) - 1
+
+
+# Every random draw a sim makes goes through one of these, shared by its Game, Dealer, Shoe and AI players, so a sim
+# can be replayed from the seed recorded in its results. Backed by numpy Generators (PCG64): the seed is spawned into
+# one child stream for the uniform buffer and another for shuffles, so how far ahead the buffer reads never changes
+# which shuffles a seed produces.
+class SimRandom():
+  __seed: int
+  __uniform_generator: np.random.Generator
+  __shuffle_generator: np.random.Generator
+  __buffer_size: int
+  # Uniform floats generated BJE_RANDOM_BUFFER_SIZE at a time and handed out one by one, since a single call into
+  # the generator costs about as much as a whole block of them
+  __uniforms: List[float]
+  __uniform_index: int
+
+  def __init__(self, seed: int | None = None):
+    self.__buffer_size = int(os.getenv("BJE_RANDOM_BUFFER_SIZE", "4096"))
+    self.reseed(seed)
+
+  @staticmethod
+  def new_seed() -> int:
+    return int(np.random.SeedSequence().generate_state(1, np.uint64)[0]) & SEED_MASK
+
+  # The seed for the sim_index-th sim of a run, taken from the same child SeedSequence that spawn() would hand out.
+  # Every sim gets its own independent stream, whichever worker or chunk it ends up in.
+  @staticmethod
+  def get_sim_seed(root_seed: int, sim_index: int) -> int:
+    sequence = np.random.SeedSequence(root_seed, spawn_key=(sim_index,))
+    return int(sequence.generate_state(1, np.uint64)[0]) & SEED_MASK
+
+  # Restarts the stream in place, so everything holding this object picks up the new seed
+  def reseed(self, seed: int | None = None) -> None:
+    self.__seed = SimRandom.new_seed() if seed is None else seed
+    uniform_sequence, shuffle_sequence = np.random.SeedSequence(self.__seed).spawn(2)
+    self.__uniform_generator = np.random.Generator(np.random.PCG64(uniform_sequence))
+    self.__shuffle_generator = np.random.Generator(np.random.PCG64(shuffle_sequence))
+    self.__uniforms = []
+    self.__uniform_index = 0
+
+  def get_seed(self) -> int:
+    return self.__seed
+
+  # Inclusive of both ends, like random.randint. A range of one value doesn't use up a draw.
+  def randint(self, low: int, high: int) -> int:
+    if low == high:
+      return low
+    if self.__uniform_index == len(self.__uniforms):
+      self.__uniforms = self.__uniform_generator.random(self.__buffer_size).tolist()
+      self.__uniform_index = 0
+    uniform = self.__uniforms[self.__uniform_index]
+    self.__uniform_index += 1
+    return low + int(uniform * (high - low + 1))
+
+  def shuffle(self, array: np.ndarray) -> None:
+    self.__shuffle_generator.shuffle(array)
@@ -0,0 +1,143 @@
+import math
+from typing import List
+
+import services.MathHelper as MathHelper
+from models.core.results.HandResultsPercentages import HandResultsPercentages
+from models.core.results.SimAggregateResults import SimAggregateResults
+from models.core.results.SimSingleResults import SimSingleResults
+
+
+class SimResultsAccumulator():
+  __aggregate: SimAggregateResults
+  __keep_rows: bool
+
+  def __init__(self, keep_rows: bool = False):
+    self.__aggregate = SimAggregateResults.model_validate({})
+    self.__keep_rows = keep_rows
+
+  def add(self, result: SimSingleResults) -> None:
+    aggregate = self.__aggregate
+    aggregate.sims_run += 1
+    if result.won:
+      aggregate.sims_won += 1
+    elif result.won is False:
+      aggregate.sims_lost += 1
+    else:
+      aggregate.sims_unfinished += 1
+    self.__add_to_summed(result)
+    # Welford's update for the running mean and sum of squared differences
+    profit = float(result.bankroll.profit.total)
+    if aggregate.sims_run == 1:
+      aggregate.profit_lowest = profit
+      aggregate.profit_highest = profit
+    else:
+      aggregate.profit_lowest = min(aggregate.profit_lowest, profit)
+      aggregate.profit_highest = max(aggregate.profit_highest, profit)
+    delta = profit - aggregate.profit_mean
+    aggregate.profit_mean += delta / aggregate.sims_run
+    aggregate.profit_m2 += delta * (profit - aggregate.profit_mean)
+    if self.__keep_rows:
+      aggregate.rows.append(result)
+
+  def add_aggregate(self, other: SimAggregateResults) -> None:
+    aggregate = self.__aggregate
+    if other.sims_run == 0:
+      return
+    if aggregate.sims_run == 0:
+      aggregate.profit_lowest = other.profit_lowest
+      aggregate.profit_highest = other.profit_highest
+    else:
+      aggregate.profit_lowest = min(aggregate.profit_lowest, other.profit_lowest)
+      aggregate.profit_highest = max(aggregate.profit_highest, other.profit_highest)
+    # Chan et al.'s pairwise combination of two Welford states
+    sims_run = aggregate.sims_run + other.sims_run
+    delta = other.profit_mean - aggregate.profit_mean
+    aggregate.profit_m2 += other.profit_m2 + delta * delta * aggregate.sims_run * other.sims_run / sims_run
+    aggregate.profit_mean += delta * other.sims_run / sims_run
+    aggregate.sims_run = sims_run
+    aggregate.sims_won += other.sims_won
+    aggregate.sims_lost += other.sims_lost
+    aggregate.sims_unfinished += other.sims_unfinished
+    self.__add_to_summed(other.summed)
+    if self.__keep_rows:
+      aggregate.rows.extend(other.rows)
+
+  def get_aggregate(self) -> SimAggregateResults:
+    return self.__aggregate
+
+  def get_rows(self) -> List[SimSingleResults]:
+    return self.__aggregate.rows
+
+  def clear_rows(self) -> None:
+    self.__aggregate.rows = []
+
+  def get_sims_run(self) -> int:
+    return self.__aggregate.sims_run
+
+  def get_sims_won(self) -> int:
+    return self.__aggregate.sims_won
+
+  def get_sims_lost(self) -> int:
+    return self.__aggregate.sims_lost
+
+  def get_sims_unfinished(self) -> int:
+    return self.__aggregate.sims_unfinished
+
+  def get_total_hands(self) -> int:
+    return self.__aggregate.summed.hands.counts.total
+
+  def get_summed(self) -> SimSingleResults:
+    aggregate = self.__aggregate
+    summed = aggregate.summed.model_copy(deep=True)
+    counts = summed.hands.counts
+    summed.hands.percentages = HandResultsPercentages.model_construct(
+      blackjack = MathHelper.get_percentage(counts.blackjack, counts.total),
+      won = MathHelper.get_percentage(counts.won, counts.total),
+      drawn = MathHelper.get_percentage(counts.drawn, counts.total),
+      lost = MathHelper.get_percentage(counts.lost, counts.total),
+      surrendered = MathHelper.get_percentage(counts.surrendered, counts.total)
+    )
+    if aggregate.sims_won > aggregate.sims_lost:
+      summed.won = True
+    elif aggregate.sims_lost > aggregate.sims_won:
+      summed.won = False
+    else:
+      summed.won = None
+    return summed
+
+  def get_profit_mean(self) -> float:
+    return self.__aggregate.profit_mean
+
+  def get_profit_variance(self) -> float:
+    if self.__aggregate.sims_run < 2:
+      return 0.0
+    return self.__aggregate.profit_m2 / (self.__aggregate.sims_run - 1)
+
+  def get_profit_std_dev(self) -> float:
+    return math.sqrt(self.get_profit_variance())
+
+  def get_profit_lowest(self) -> float:
+    return self.__aggregate.profit_lowest
+
+  def get_profit_highest(self) -> float:
+    return self.__aggregate.profit_highest
+
+  def __add_to_summed(self, result: SimSingleResults) -> None:
+    summed = self.__aggregate.summed
+    summed.hands.counts.total += int(result.hands.counts.total)
+    summed.hands.counts.blackjack += int(result.hands.counts.blackjack)
+    summed.hands.counts.won += int(result.hands.counts.won)
+    summed.hands.counts.drawn += int(result.hands.counts.drawn)
+    summed.hands.counts.lost += int(result.hands.counts.lost)
+    summed.hands.counts.surrendered += int(result.hands.counts.surrendered)
+    summed.bankroll.starting += float(result.bankroll.starting)
+    summed.bankroll.ending += float(result.bankroll.ending)
+    summed.bankroll.highest += float(result.bankroll.highest)
+    summed.bankroll.lowest += float(result.bankroll.lowest)
+    summed.bankroll.profit.total += float(result.bankroll.profit.total)
+    for i in range(7):
+      summed.bankroll.profit.from_true[i] += float(result.bankroll.profit.from_true[i])
+    summed.bankroll.profit.per_hand += float(result.bankroll.profit.per_hand)
+    summed.bankroll.profit.per_hour += float(result.bankroll.profit.per_hour)
+    summed.time.human_time += float(result.time.human_time)
+    summed.time.simulation_time += float(result.time.simulation_time)
@@ -0,0 +1,120 @@
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from typing import Tuple
+
+import services.MathHelper as MathHelper
+import services.StrategyTables as StrategyTables
+from entities.Game import Game
+from models.api.CreateSingleSimReq import CreateSingleSimReq
+from models.core.results.SimAggregateResults import SimAggregateResults
+from models.core.results.SimSingleResults import SimSingleResults
+from services.BlackjackLogger import BlackjackLogger
+from services.SimRandom import SimRandom
+from services.SimResultsAccumulator import SimResultsAccumulator
+from services.SingleSimRunner import SingleSimRunner
+
+
+class SimWorkerPool():
+  __max_workers: int | None
+  __executor: ProcessPoolExecutor | None
+  # Lives in each worker process: (request hash, sim mode) -> runner (and so its parsed request and Game), least
+  # recently used first
+  __runners: "OrderedDict[Tuple[str, str], SingleSimRunner]" = OrderedDict()
+
+  def __init__(self, max_workers: int | None = None):
+    self.__max_workers = max_workers
+    self.__executor = None
+
+  def get_max_workers(self) -> int:
+    # Read lazily, since the app's singletons are built before the .env gets loaded
+    if self.__max_workers is None:
+      self.__max_workers = int(os.getenv("BJE_SIM_WORKER_COUNT", str(os.cpu_count() or 2)))
+    return self.__max_workers
+
+  def get_executor(self) -> ProcessPoolExecutor:
+    if self.__executor is None:
+      self.__executor = ProcessPoolExecutor(
+        max_workers=self.get_max_workers(),
+        initializer=SimWorkerPool.prepare_worker
+      )
+    return self.__executor
+
+  # Spawns every worker up front so the first run doesn't pay for process startup
+  def warm_up(self) -> None:
+    executor = self.get_executor()
+    futures: list[Future] = [executor.submit(time.sleep, 0.1) for _ in range(self.get_max_workers())]
+    wait(futures)
+
+  def shutdown(self) -> None:
+    if self.__executor is not None:
+      self.__executor.shutdown(cancel_futures=True)
+      self.__executor = None
+
+  # Loads everything a worker would otherwise load lazily during its first sim, and warns if that
+  # takes longer than BJE_WORKER_STARTUP_BUDGET_SECONDS
+  @staticmethod
+  def prepare_worker() -> float:
+    start_time = time.time()
+    BlackjackLogger.set_level(os.getenv("BJE_LOG_LEVEL", "INFO"))
+    StrategyTables.get_tables()
+    MathHelper.get_human_time(0, 1)
+    MathHelper.get_percentage(0.0, 1.0)
+    startup_time = time.time() - start_time
+    startup_budget = float(os.getenv("BJE_WORKER_STARTUP_BUDGET_SECONDS", "1.0"))
+    if startup_time > startup_budget:
+      BlackjackLogger.warning(
+        "Worker startup took %.2fs, which is over the %.2fs budget.", startup_time, startup_budget
+      )
+    return startup_time
+
+  @staticmethod
+  def run_one_sync_sim(request_hash: str, req_dict: dict, sim_mode: str | None = None) -> SimSingleResults:
+    runner = SimWorkerPool.get_runner(request_hash, req_dict, sim_mode)
+    runner.run_sync()
+    results = runner.get_results()
+    assert results
+    return results
+
+  # Runs a whole chunk of sims in one task and only sends back their aggregate, plus the per-sim rows if asked for.
+  # With a root seed, sim i of the chunk plays sim (first_sim_index + i) of the run's seed sequence.
+  @staticmethod
+  def run_sync_sims(
+    request_hash: str,
+    req_dict: dict,
+    sim_count: int,
+    include_rows: bool = False,
+    root_seed: int | None = None,
+    first_sim_index: int = 0,
+    sim_mode: str | None = None
+  ) -> SimAggregateResults:
+    runner = SimWorkerPool.get_runner(request_hash, req_dict, sim_mode)
+    accumulator = SimResultsAccumulator(keep_rows=include_rows)
+    for sim_index in range(first_sim_index, first_sim_index + sim_count):
+      runner.run_sync(None if root_seed is None else SimRandom.get_sim_seed(root_seed, sim_index))
+      results = runner.get_results()
+      assert results
+      accumulator.add(results)
+    return accumulator.get_aggregate()
+
+  # Without a sim_mode, BJE_SIM_MODE is read on every call, so changing it never hands back a runner built for the
+  # other mode
+  @staticmethod
+  def get_runner(request_hash: str, req_dict: dict, sim_mode: str | None = None) -> SingleSimRunner:
+    if sim_mode is None:
+      sim_mode = os.getenv("BJE_SIM_MODE", "production")
+    runners = SimWorkerPool.__runners
+    key = (request_hash, sim_mode)
+    runner = runners.get(key)
+    if runner is None:
+      req = CreateSingleSimReq(**req_dict)
+      game = Game(req.rules, req.ai_player_info)
+      runner = SingleSimRunner(game, req.bounds, req.time, req, sim_mode)
+      runners[key] = runner
+      cache_size = int(os.getenv("BJE_SIM_WORKER_CACHE_SIZE", "16"))
+      while len(runners) > cache_size:
+        runners.popitem(last=False)
+    else:
+      runners.move_to_end(key)
+    return runner
@@ -19,12 +19,19 @@ from models.core.SingleSimBounds import SingleSimBounds
 from models.enums.GameState import GameState
 from models.enums.HandResult import HandResult
 from services.BlackjackLogger import BlackjackLogger
-from services.DatabaseHandler import DatabaseHandler
+from services.FastSimKernel import FastSimKernel
+from services.HandTraceSink import HandTraceSink
+from services.ResultStore import ResultStore
 
 
 class SingleSimRunner():
   __original_req: CreateSingleSimReq
   __yield_every_x_hands: int
+  __fast_kernel: bool
+  __fast_kernel_batch_size: int
+  __checked: bool
+  __check_every_x_rounds: int
+  __rounds_played: int
   __bankroll_goal: float
   __bankroll_fail: float
   __human_time_limit: int | None
@@ -36,10 +43,35 @@ class SingleSimRunner():
   __start_time: float | None
   __game: Game
   __results: SimSingleResults | None
+  __trace_sink: HandTraceSink | None
 
-  def __init__(self, game: Game, bounds: SingleSimBounds, human_time: HumanTime, original_req: CreateSingleSimReq):
+  def __init__(
+    self,
+    game: Game,
+    bounds: SingleSimBounds,
+    human_time: HumanTime,
+    original_req: CreateSingleSimReq,
+    sim_mode: str | None = None
+  ):
     self.__original_req = original_req
     self.__yield_every_x_hands = int(os.getenv("BJE_YIELD_EVERY_X_HANDS", "100"))
+    self.__fast_kernel = original_req.fast_kernel
+    self.__fast_kernel_batch_size = int(os.getenv("BJE_FAST_KERNEL_BATCH_SIZE", "10000"))
+    if self.__fast_kernel and len(original_req.ai_player_info) != 1:
+      raise ValueError("fast_kernel only supports simulations with exactly one AI player.")
+    # "checked" plays every round through the Game's states and checks the sim's invariants after each one.
+    # "production" plays the straight-run rounds, checks the invariants every BJE_CHECK_EVERY_X_ROUNDS rounds and once
+    # at the end, and skips the per-hand debug logging. Without a sim_mode, BJE_SIM_MODE picks one.
+    if sim_mode is None:
+      sim_mode = os.getenv("BJE_SIM_MODE", "production")
+    if sim_mode not in ("checked", "production"):
+      raise ValueError(f"Unknown sim mode: {sim_mode}")
+    self.__checked = sim_mode == "checked"
+    if self.__checked:
+      self.__check_every_x_rounds = 1
+    else:
+      self.__check_every_x_rounds = int(os.getenv("BJE_CHECK_EVERY_X_ROUNDS", "1000"))
+    self.__rounds_played = 0
     if bounds.bankroll_goal is None:
       self.__bankroll_goal = inf
     else:
@@ -56,9 +88,10 @@ class SingleSimRunner():
     self.__results_progress = 0
     self.__game = game
     self.__results = None
+    self.__trace_sink = None
 
-  async def run(self) -> None:
-    self.__full_reset()
+  async def run(self, seed: int | None = None) -> None:
+    self.__full_reset(seed)
     self.__start_time = time.time()
     br = self.__game.get_ai_players()[0].get_bankroll()
     bankroll = BankrollResults.model_construct(
@@ -73,54 +106,32 @@ class SingleSimRunner():
     assert self.get_bankroll_goal() > bankroll.starting
     assert self.get_bankroll_fail() < bankroll.starting
 
-    while(someone_has_bankroll and bankroll_is_below_goal and bankroll_is_above_fail):
-      await self.__play_a_hand(bankroll, counts)
-      assert self.__results_progress <= 100
-      assert self.__results_progress >= -100
-      if self.__results_progress == 100 or self.__results_progress == -100:
-        break
-      someone_has_bankroll = self.__game.someone_has_bankroll()
-      bankroll_is_below_goal = self.__calculate_if_bankroll_is_below_goal()
-      bankroll_is_above_fail = self.__calculate_if_bankroll_is_above_fail()
-
-    bankroll.ending = self.__game.get_ai_players()[0].get_bankroll()
-    assert bankroll.ending >= 0
-    max_possible_win = self.__game.get_ai_players()[0].get_bet_spread().true_six * 8
-    assert bankroll.ending <= self.__bankroll_goal + max_possible_win
-    bankroll.profit.total = bankroll.ending - bankroll.starting
-    percentages = HandResultsPercentages.model_construct(
-      blackjack=self.__get_blackjack_rate(counts),
-      won=self.__get_win_rate(counts),
-      drawn=self.__get_draw_rate(counts),
-      lost=self.__get_loss_rate(counts),
-      surrendered=self.__get_surrender_rate(counts)
-    )
-    assert sum(percentages.model_dump().values()) >= 99.99
-    assert sum(percentages.model_dump().values()) <= 100.01
-
-    won = self.__get_game_result(bankroll.ending)
-    r_hands = HandResults.model_construct(
-      counts=counts,
-      percentages=percentages
-    )
-    bankroll.profit.per_hand = bankroll.profit.total / counts.total
-    bankroll.profit.per_hour = bankroll.profit.per_hand * self.__hands_per_hour
-    r_time = TimeResults.model_construct(
-      human_time=self.__get_human_time(counts.total),
-      simulation_time= time.time() - self.__start_time
-    )
-    self.__results = SimSingleResults.model_construct(
-      won=won,
-      hands=r_hands,
-      bankroll=bankroll,
-      time=r_time
-    )
-
-    database_handler = DatabaseHandler()
-    database_handler.store_simulation_single_result(self.__results, self.__original_req)
-
-  def run_sync(self) -> None:
-    self.__full_reset()
+    if self.__fast_kernel:
+      kernel = self.__create_fast_kernel()
+      while not self.__play_fast_kernel_batch(kernel, self.__yield_every_x_hands, bankroll, counts):
+        await asyncio.sleep(0)
+    else:
+      while(someone_has_bankroll and bankroll_is_below_goal and bankroll_is_above_fail):
+        await self.__play_a_hand(bankroll, counts)
+        assert self.__results_progress <= 100
+        assert self.__results_progress >= -100
+        if self.__results_progress == 100 or self.__results_progress == -100:
+          break
+        someone_has_bankroll = self.__game.someone_has_bankroll()
+        bankroll_is_below_goal = self.__calculate_if_bankroll_is_below_goal()
+        bankroll_is_above_fail = self.__calculate_if_bankroll_is_above_fail()
+      self.__check_invariants(bankroll)
+    if self.__trace_sink is not None:
+      self.__trace_sink.close()
+      self.__trace_sink = None
+
+    self.__results = self.__get_results(bankroll, counts)
+
+    result_store = ResultStore.from_env()
+    await result_store.store_simulation_single_result_async(self.__results, self.__original_req)
+
+  def run_sync(self, seed: int | None = None) -> None:
+    self.__full_reset(seed)
     self.__start_time = time.time()
     br = self.__game.get_ai_players()[0].get_bankroll()
     bankroll = BankrollResults.model_construct(
@@ -135,48 +146,26 @@ class SingleSimRunner():
     assert self.get_bankroll_goal() > bankroll.starting
     assert self.get_bankroll_fail() < bankroll.starting
 
-    while(someone_has_bankroll and bankroll_is_below_goal and bankroll_is_above_fail):
-      self.__play_a_hand_sync(bankroll, counts)
-      assert self.__results_progress <= 100
-      assert self.__results_progress >= -100
-      if self.__results_progress == 100 or self.__results_progress == -100:
-        break
-      someone_has_bankroll = self.__game.someone_has_bankroll()
-      bankroll_is_below_goal = self.__calculate_if_bankroll_is_below_goal()
-      bankroll_is_above_fail = self.__calculate_if_bankroll_is_above_fail()
-
-    bankroll.ending = self.__game.get_ai_players()[0].get_bankroll()
-    assert bankroll.ending >= 0
-    max_possible_win = self.__game.get_ai_players()[0].get_bet_spread().true_six * 8
-    assert bankroll.ending <= self.__bankroll_goal + max_possible_win
-    bankroll.profit.total = bankroll.ending - bankroll.starting
-    percentages = HandResultsPercentages.model_construct(
-      blackjack=self.__get_blackjack_rate(counts),
-      won=self.__get_win_rate(counts),
-      drawn=self.__get_draw_rate(counts),
-      lost=self.__get_loss_rate(counts),
-      surrendered=self.__get_surrender_rate(counts)
-    )
-    assert sum(percentages.model_dump().values()) >= 99.99
-    assert sum(percentages.model_dump().values()) <= 100.01
-
-    won = self.__get_game_result(bankroll.ending)
-    r_hands = HandResults.model_construct(
-      counts=counts,
-      percentages=percentages
-    )
-    bankroll.profit.per_hand = bankroll.profit.total / counts.total
-    bankroll.profit.per_hour = bankroll.profit.per_hand * self.__hands_per_hour
-    r_time = TimeResults.model_construct(
-      human_time=self.__get_human_time(counts.total),
-      simulation_time= time.time() - self.__start_time
-    )
-    self.__results = SimSingleResults.model_construct(
-      won=won,
-      hands=r_hands,
-      bankroll=bankroll,
-      time=r_time
-    )
+    if self.__fast_kernel:
+      kernel = self.__create_fast_kernel()
+      while not self.__play_fast_kernel_batch(kernel, self.__fast_kernel_batch_size, bankroll, counts):
+        pass
+    else:
+      while(someone_has_bankroll and bankroll_is_below_goal and bankroll_is_above_fail):
+        self.__play_a_hand_sync(bankroll, counts)
+        assert self.__results_progress <= 100
+        assert self.__results_progress >= -100
+        if self.__results_progress == 100 or self.__results_progress == -100:
+          break
+        someone_has_bankroll = self.__game.someone_has_bankroll()
+        bankroll_is_below_goal = self.__calculate_if_bankroll_is_below_goal()
+        bankroll_is_above_fail = self.__calculate_if_bankroll_is_above_fail()
+      self.__check_invariants(bankroll)
+    if self.__trace_sink is not None:
+      self.__trace_sink.close()
+      self.__trace_sink = None
+
+    self.__results = self.__get_results(bankroll, counts)
 
   def get_original_req(self) -> CreateSingleSimReq:
     return self.__original_req
@@ -246,26 +235,98 @@ class SingleSimRunner():
     else:
       return None
 
-  def __full_reset(self) -> None:
+  # Without a seed, the request's seed is used if it has one, otherwise a fresh one is picked
+  def __full_reset(self, seed: int | None) -> None:
     self.__game.reset_game()
+    self.__game.reseed(self.__original_req.seed if seed is None else seed)
     self.__results_progress = 0
+    self.__rounds_played = 0
     self.__results = None
+    sim_seed = self.__game.get_sim_random().get_seed()
+    self.__trace_sink = None if self.__fast_kernel else HandTraceSink.for_sim(sim_seed)
+    if self.__fast_kernel and HandTraceSink.is_traced(sim_seed):
+      BlackjackLogger.warning("Sim %d is being traced, but fast_kernel sims aren't, so no trace is written.", sim_seed)
+
+  def __get_results(self, bankroll: BankrollResults, counts: HandResultsCounts) -> SimSingleResults:
+    if self.__start_time is None:
+      raise RuntimeError("Start time wasn't logged.")
+    bankroll.ending = self.__game.get_ai_players()[0].get_bankroll()
+    assert bankroll.ending >= 0
+    max_possible_win = self.__game.get_ai_players()[0].get_bet_spread().true_six * 8
+    assert bankroll.ending <= self.__bankroll_goal + max_possible_win
+    bankroll.profit.total = bankroll.ending - bankroll.starting
+    percentages = HandResultsPercentages.model_construct(
+      blackjack=self.__get_blackjack_rate(counts),
+      won=self.__get_win_rate(counts),
+      drawn=self.__get_draw_rate(counts),
+      lost=self.__get_loss_rate(counts),
+      surrendered=self.__get_surrender_rate(counts)
+    )
+    assert sum(percentages.model_dump().values()) >= 99.99
+    assert sum(percentages.model_dump().values()) <= 100.01
+
+    won = self.__get_game_result(bankroll.ending)
+    r_hands = HandResults.model_construct(
+      counts=counts,
+      percentages=percentages
+    )
+    bankroll.profit.per_hand = bankroll.profit.total / counts.total
+    bankroll.profit.per_hour = bankroll.profit.per_hand * self.__hands_per_hour
+    r_time = TimeResults.model_construct(
+      human_time=self.__get_human_time(counts.total),
+      simulation_time= time.time() - self.__start_time
+    )
+    return SimSingleResults.model_construct(
+      won=won,
+      hands=r_hands,
+      bankroll=bankroll,
+      time=r_time,
+      seed=self.__game.get_sim_random().get_seed()
+    )
+
+  def __create_fast_kernel(self) -> FastSimKernel:
+    return FastSimKernel(
+      self.__original_req.rules,
+      self.__original_req.ai_player_info[0],
+      self.__original_req.bounds,
+      self.__original_req.time,
+      self.__game.get_sim_random().get_seed()
+    )
+
+  def __play_fast_kernel_batch(
+    self,
+    kernel: FastSimKernel,
+    max_hands: int,
+    bankroll: BankrollResults,
+    counts: HandResultsCounts
+  ) -> bool:
+    if self.__start_time is None:
+      raise RuntimeError("Start time wasn't logged.")
+    kernel.play(max_hands)
+    ai_player = self.__game.get_ai_players()[0]
+    ai_player.increment_bankroll(kernel.get_bankroll() - ai_player.get_bankroll(), silent=True)
+    bankroll.highest = kernel.get_highest_bankroll()
+    bankroll.lowest = kernel.get_lowest_bankroll()
+    bankroll.profit.from_true = kernel.get_profit_from_true()
+    for result, count in kernel.get_counts().items():
+      setattr(counts, result, count)
+    self.__update_results_progress(counts.total, time.time() - self.__start_time)
+    return kernel.is_finished() or self.__results_progress == 100
 
   async def __play_a_hand(self, bankroll: BankrollResults, counts: HandResultsCounts) -> None:
     if self.__start_time is None:
       raise RuntimeError("Start time wasn't logged.")
     ai_player = self.__game.get_ai_players()[0]
     true_count = ai_player.calculate_true_count(self.__game.get_dealer().get_decks_remaining())
-    self.__game.continue_until_state(GameState.CLEANUP)
-    assert self.__game.get_state() == GameState.CLEANUP
+    settled_hands = self.__game.play_round(self.__checked)[0]
     self.__update_bankroll(bankroll)
-    for hand in ai_player.get_hands():
+    for hand in settled_hands:
       self.__update_profits(hand, true_count, bankroll.profit.from_true, counts)
-    current_profit = ai_player.get_bankroll() - bankroll.starting
-    total_from_true = sum(bankroll.profit.from_true)
-    assert abs(current_profit - total_from_true) < 0.01
-    self.__game.finish_round()
-    assert self.__game.get_state() == GameState.BETTING
+    self.__rounds_played += 1
+    if self.__trace_sink is not None:
+      self.__trace_sink.write_round(true_count, settled_hands, ai_player.get_bankroll())
+    if self.__rounds_played % self.__check_every_x_rounds == 0:
+      self.__check_invariants(bankroll)
     await self.__occasionally_yield_event_loop_control(counts.total)
     self.__update_results_progress(counts.total, time.time() - self.__start_time)
 
@@ -274,18 +335,22 @@ class SingleSimRunner():
       raise RuntimeError("Start time wasn't logged.")
     ai_player = self.__game.get_ai_players()[0]
     true_count = ai_player.calculate_true_count(self.__game.get_dealer().get_decks_remaining())
-    self.__game.continue_until_state(GameState.CLEANUP)
-    assert self.__game.get_state() == GameState.CLEANUP
+    settled_hands = self.__game.play_round(self.__checked)[0]
     self.__update_bankroll(bankroll)
-    for hand in ai_player.get_hands():
+    for hand in settled_hands:
       self.__update_profits(hand, true_count, bankroll.profit.from_true, counts)
-    current_profit = ai_player.get_bankroll() - bankroll.starting
+    self.__rounds_played += 1
+    if self.__trace_sink is not None:
+      self.__trace_sink.write_round(true_count, settled_hands, ai_player.get_bankroll())
+    if self.__rounds_played % self.__check_every_x_rounds == 0:
+      self.__check_invariants(bankroll)
+    self.__update_results_progress(counts.total, time.time() - self.__start_time)
+
+  def __check_invariants(self, bankroll: BankrollResults) -> None:
+    current_profit = self.__game.get_ai_players()[0].get_bankroll() - bankroll.starting
     total_from_true = sum(bankroll.profit.from_true)
     assert abs(current_profit - total_from_true) < 0.01
-    self.__game.finish_round()
     assert self.__game.get_state() == GameState.BETTING
-    # await self.__occasionally_yield_event_loop_control(counts.total)
-    self.__update_results_progress(counts.total, time.time() - self.__start_time)
 
   async def __occasionally_yield_event_loop_control(self, total_hands_played) -> None:
     if total_hands_played % self.__yield_every_x_hands == 0:
@@ -310,13 +375,15 @@ class SingleSimRunner():
     bet = hand.get_bet()
     assert bet > 0
     payout = hand.get_payout()
+    # An insurance bet comes out of the bankroll whether or not it pays, and a paying one is part of the payout
+    insurance_bet = hand.get_insurance_bet()
     if true_count > 6:
       adjusted_true_count = 6
     elif true_count < 0:
       adjusted_true_count = 0
     else:
       adjusted_true_count = true_count
-    profit_from_true[adjusted_true_count] += payout
+    profit_from_true[adjusted_true_count] += payout - insurance_bet
     if hand_result == HandResult.BLACKJACK:
       counts.blackjack += 1
     elif hand_result == HandResult.WIN:
@@ -330,8 +397,9 @@ class SingleSimRunner():
       profit_from_true[adjusted_true_count] -= bet / 2
       counts.surrendered += 1
     counts.total += 1
-    BlackjackLogger.debug(f"\t\tHand result: {hand_result}")
-    BlackjackLogger.debug(f"\t\tPayout: {payout}")
+    if self.__checked:
+      BlackjackLogger.debug("\t\tHand result: %s", hand_result)
+      BlackjackLogger.debug("\t\tPayout: %s", payout)
 
   def __update_results_progress(self, total_hands_played: int, time_elapsed_seconds: float) -> None:
     if self.__start_time is None:
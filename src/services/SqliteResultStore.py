@@ -0,0 +1,243 @@
+import asyncio
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Iterator, List
+
+from models.api.CreateSingleSimReq import CreateSingleSimReq
+from models.core.results.SimAggregateResults import SimAggregateResults
+from models.core.results.SimMultiResults import SimMultiResults
+from models.core.results.SimSingleResults import SimSingleResults
+from services.ResultStore import ResultStore
+from services.SimDataTransformer import SimDataTransformer
+from services.SimResultsAccumulator import SimResultsAccumulator
+
+# Same tables as the Postgres store, minus the old normalized layout. profit_from_true is kept as a JSON array, and
+# each rollup as a SimAggregateResults (without rows) in JSON, merged in Python inside the writing transaction.
+SCHEMA = (
+  """
+  CREATE TABLE IF NOT EXISTS create_single_sim_req (
+    id INTEGER PRIMARY KEY,
+    request_hash TEXT NOT NULL UNIQUE,
+    request_json TEXT NOT NULL
+  )
+  """,
+  """
+  CREATE TABLE IF NOT EXISTS simulation_result_rows (
+    id INTEGER PRIMARY KEY,
+    request_id INTEGER NOT NULL REFERENCES create_single_sim_req (id),
+    won INTEGER,
+    hands_total INTEGER,
+    hands_blackjack INTEGER,
+    hands_won INTEGER,
+    hands_drawn INTEGER,
+    hands_lost INTEGER,
+    hands_surrendered INTEGER,
+    percentage_blackjack REAL,
+    percentage_won REAL,
+    percentage_drawn REAL,
+    percentage_lost REAL,
+    percentage_surrendered REAL,
+    bankroll_starting REAL,
+    bankroll_ending REAL,
+    bankroll_highest REAL,
+    bankroll_lowest REAL,
+    profit_total REAL,
+    profit_from_true TEXT,
+    profit_per_hand REAL,
+    profit_per_hour REAL,
+    human_time REAL,
+    simulation_time REAL,
+    seed INTEGER
+  )
+  """,
+  "CREATE INDEX IF NOT EXISTS ix_simulation_result_rows_request_id ON simulation_result_rows (request_id)",
+  """
+  CREATE TABLE IF NOT EXISTS sim_request_rollups (
+    request_hash TEXT PRIMARY KEY,
+    aggregate_json TEXT NOT NULL
+  )
+  """,
+  "CREATE TABLE IF NOT EXISTS stored_result_batches (batch_id TEXT PRIMARY KEY)"
+)
+
+
+# The embedded result store: one SQLite file at BJE_SQLITE_PATH, so batch jobs and tests can run without a
+# database server. Every call opens its own connection, which keeps it safe to share across threads.
+class SqliteResultStore(ResultStore):
+  __path: Path
+  __simulation_data_transformer: SimDataTransformer
+
+  def __init__(self, path: Path | None = None):
+    if path is None:
+      path = Path(os.getenv("BJE_SQLITE_PATH", "blackjack-engine.sqlite3"))
+    self.__path = path
+    self.__simulation_data_transformer = SimDataTransformer()
+
+  def create_schema(self) -> None:
+    self.__path.parent.mkdir(parents=True, exist_ok=True)
+    connection = self.__connect()
+    try:
+      # Lets readers carry on while a batch is being written
+      connection.execute("PRAGMA journal_mode=WAL")
+      for statement in SCHEMA:
+        connection.execute(statement)
+    finally:
+      connection.close()
+
+  def store_simulation_results_bulk(
+    self,
+    sim_results: List[SimSingleResults],
+    request: CreateSingleSimReq,
+    batch_ids: List[str] | None = None
+  ) -> None:
+    if not sim_results:
+      return
+    request_dict = self.__simulation_data_transformer.get_request_dict(request)
+    request_hash = self.__simulation_data_transformer.get_request_hash(request_dict)
+    connection = self.__connect()
+    try:
+      # Taken up front, so the rollup read below can't race another writer
+      connection.execute("BEGIN IMMEDIATE")
+      try:
+        if batch_ids:
+          connection.executemany(
+            "INSERT INTO stored_result_batches (batch_id) VALUES (?)",
+            [(batch_id,) for batch_id in batch_ids]
+          )
+        request_id = self.__get_or_create_request_id(connection, request_dict, request_hash)
+        rows = [self.__get_row_values(r, request_id) for r in sim_results]
+        columns = list(rows[0])
+        connection.executemany(
+          f"INSERT INTO simulation_result_rows ({', '.join(columns)}) "
+          f"VALUES ({', '.join(':' + column for column in columns)})",
+          rows
+        )
+        self.__add_to_rollup(connection, request_hash, sim_results)
+        connection.execute("COMMIT")
+      except Exception:
+        connection.execute("ROLLBACK")
+        raise
+    finally:
+      connection.close()
+
+  async def store_simulation_results_bulk_async(
+    self,
+    sim_results: List[SimSingleResults],
+    request: CreateSingleSimReq
+  ) -> None:
+    await asyncio.to_thread(self.store_simulation_results_bulk, sim_results, request)
+
+  def is_batch_stored(self, batch_id: str) -> bool:
+    connection = self.__connect()
+    try:
+      return connection.execute(
+        "SELECT 1 FROM stored_result_batches WHERE batch_id = ?",
+        (batch_id,)
+      ).fetchone() is not None
+    finally:
+      connection.close()
+
+  def get_all_sim_results(self, request: CreateSingleSimReq) -> SimMultiResults | None:
+    request_dict = self.__simulation_data_transformer.get_request_dict(request)
+    request_hash = self.__simulation_data_transformer.get_request_hash(request_dict)
+    connection = self.__connect()
+    try:
+      rollup = connection.execute(
+        "SELECT aggregate_json FROM sim_request_rollups WHERE request_hash = ?",
+        (request_hash,)
+      ).fetchone()
+    finally:
+      connection.close()
+    if rollup is None:
+      return None
+    accumulator = SimResultsAccumulator()
+    accumulator.add_aggregate(SimAggregateResults.model_validate_json(rollup["aggregate_json"]))
+    return self.__simulation_data_transformer.get_multi_sim_results_from_accumulator(accumulator)
+
+  async def get_all_sim_results_async(self, request: CreateSingleSimReq) -> SimMultiResults | None:
+    return await asyncio.to_thread(self.get_all_sim_results, request)
+
+  def get_sim_results(self, request: CreateSingleSimReq) -> List[SimSingleResults]:
+    request_dict = self.__simulation_data_transformer.get_request_dict(request)
+    request_hash = self.__simulation_data_transformer.get_request_hash(request_dict)
+    connection = self.__connect()
+    try:
+      rows = connection.execute(
+        "SELECT r.* FROM simulation_result_rows AS r "
+        "JOIN create_single_sim_req AS c ON r.request_id = c.id "
+        "WHERE c.request_hash = ? ORDER BY r.id",
+        (request_hash,)
+      )
+      sim_results = []
+      for row in rows:
+        values = dict(row)
+        values["profit_from_true"] = json.loads(values["profit_from_true"])
+        sim_results.append(self.__simulation_data_transformer.row_values_to_pydantic(values))
+      return sim_results
+    finally:
+      connection.close()
+
+  def iter_result_rows(self, request_hash: str, chunk_size: int) -> Iterator[List[dict]]:
+    connection = self.__connect()
+    try:
+      cursor = connection.execute(
+        "SELECT r.* FROM simulation_result_rows AS r "
+        "JOIN create_single_sim_req AS c ON r.request_id = c.id "
+        "WHERE c.request_hash = ? ORDER BY r.id",
+        (request_hash,)
+      )
+      while rows := cursor.fetchmany(chunk_size):
+        chunk = []
+        for row in rows:
+          values = dict(row)
+          del values["id"], values["request_id"]
+          values["profit_from_true"] = json.loads(values["profit_from_true"])
+          values["won"] = bool(values["won"]) if values["won"] is not None else None
+          chunk.append(values)
+        yield chunk
+    finally:
+      connection.close()
+
+  def __connect(self) -> sqlite3.Connection:
+    # Autocommit mode, so transactions are only ever the ones begun explicitly
+    connection = sqlite3.connect(self.__path, timeout=30.0, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+  def __get_row_values(self, sim_result: SimSingleResults, request_id: int) -> dict:
+    values = self.__simulation_data_transformer.get_result_row_values(sim_result, request_id)
+    values["profit_from_true"] = json.dumps(values["profit_from_true"])
+    return values
+
+  def __get_or_create_request_id(self, connection: sqlite3.Connection, request_dict: dict, request_hash: str) -> int:
+    connection.execute(
+      "INSERT OR IGNORE INTO create_single_sim_req (request_hash, request_json) VALUES (?, ?)",
+      (request_hash, json.dumps(request_dict))
+    )
+    return connection.execute(
+      "SELECT id FROM create_single_sim_req WHERE request_hash = ?",
+      (request_hash,)
+    ).fetchone()["id"]
+
+  def __add_to_rollup(
+    self,
+    connection: sqlite3.Connection,
+    request_hash: str,
+    sim_results: List[SimSingleResults]
+  ) -> None:
+    accumulator = SimResultsAccumulator()
+    rollup = connection.execute(
+      "SELECT aggregate_json FROM sim_request_rollups WHERE request_hash = ?",
+      (request_hash,)
+    ).fetchone()
+    if rollup is not None:
+      accumulator.add_aggregate(SimAggregateResults.model_validate_json(rollup["aggregate_json"]))
+    for r in sim_results:
+      accumulator.add(r)
+    connection.execute(
+      "INSERT OR REPLACE INTO sim_request_rollups (request_hash, aggregate_json) VALUES (?, ?)",
+      (request_hash, accumulator.get_aggregate().model_dump_json(exclude={"rows"}))
+    )
@@ -0,0 +1,112 @@
+import hashlib
+from pathlib import Path
+from typing import List, NamedTuple
+
+import numpy as np
+
+from models.enums.PairSplittingDecision import PairSplittingDecision
+from models.enums.PlayerDecision import PlayerDecision
+
+# Decisions are stored as bitmasks and always tried in this priority order,
+# which matches the order of every decision list in BasicStrategy
+SPLIT = 1
+DOUBLE_DOWN = 2
+HIT = 4
+STAND = 8
+
+DECISION_BITS = (
+  (PlayerDecision.SPLIT, SPLIT),
+  (PlayerDecision.DOUBLE_DOWN, DOUBLE_DOWN),
+  (PlayerDecision.HIT, HIT),
+  (PlayerDecision.STAND, STAND)
+)
+
+# Every mask decoded once up front, so lookups hand back a shared list instead of building one
+DECISIONS_BY_MASK = tuple(
+  [decision for decision, bit in DECISION_BITS if mask & bit]
+  for mask in range(16)
+)
+
+PAIR_SPLITTING_DECISIONS = tuple(PairSplittingDecision)
+
+# Tables are indexed [true_count_index][dealer_facecard_value][player_hand_value], where index 0 holds
+# the (None, ...) entries used when the player isn't playing deviations and true_count + 2 holds -1 through 6
+TRUE_COUNT_AXIS_SIZE = 9
+DEALER_AXIS_SIZE = 12
+HAND_VALUE_AXIS_SIZE = 22
+PAIR_CARD_AXIS_SIZE = 12
+
+# The compiled tables ship as a small .npz next to BasicStrategy.py, so workers can skip importing (and
+# possibly byte-compiling) the 5k line dict module. The artifact records a hash of the module's source and is
+# ignored if BasicStrategy.py has changed since it was written.
+# Regenerate with: PYTHONPATH=src python -m services.StrategyTables
+BASIC_STRATEGY_PATH = Path(__file__).resolve().parent.parent / "models" / "core" / "BasicStrategy.py"
+ARTIFACT_PATH = BASIC_STRATEGY_PATH.with_name("BasicStrategyTables.npz")
+
+
+class StrategyTables(NamedTuple):
+  hard_totals: np.ndarray
+  soft_totals: np.ndarray
+  pair_splitting: np.ndarray
+  surrender: np.ndarray
+
+
+_tables: StrategyTables | None = None
+
+def get_tables() -> StrategyTables:
+  global _tables # pylint: disable=global-statement
+  if _tables is None:
+    _tables = load_tables()
+    if _tables is None:
+      _tables = build_tables()
+  return _tables
+
+def load_tables(path: Path = ARTIFACT_PATH) -> StrategyTables | None:
+  if not path.exists():
+    return None
+  with np.load(path) as artifact:
+    if str(artifact["source_hash"]) != get_source_hash():
+      return None
+    return StrategyTables(*(artifact[field] for field in StrategyTables._fields))
+
+def save_tables(path: Path = ARTIFACT_PATH) -> None:
+  tables = build_tables()
+  np.savez_compressed(path, source_hash=np.array(get_source_hash()), **tables._asdict())
+
+def get_source_hash() -> str:
+  return hashlib.sha256(BASIC_STRATEGY_PATH.read_bytes()).hexdigest()
+
+def build_tables() -> StrategyTables:
+  # Only imported when the tables actually need compiling
+  from models.core.BasicStrategy import BasicStrategy # pylint: disable=import-outside-toplevel
+  hard_totals = np.zeros((TRUE_COUNT_AXIS_SIZE, DEALER_AXIS_SIZE, HAND_VALUE_AXIS_SIZE), dtype=np.int8)
+  soft_totals = np.zeros((TRUE_COUNT_AXIS_SIZE, DEALER_AXIS_SIZE, HAND_VALUE_AXIS_SIZE), dtype=np.int8)
+  pair_splitting = np.zeros((TRUE_COUNT_AXIS_SIZE, DEALER_AXIS_SIZE, PAIR_CARD_AXIS_SIZE), dtype=np.int8)
+  surrender = np.zeros((TRUE_COUNT_AXIS_SIZE, DEALER_AXIS_SIZE, HAND_VALUE_AXIS_SIZE), dtype=np.bool_)
+  for table, source in ((hard_totals, BasicStrategy.hard_totals), (soft_totals, BasicStrategy.soft_totals)):
+    for (true_count, dealer_value, hand_value), decisions in source.items():
+      table[get_true_count_index(true_count), dealer_value, hand_value] = get_mask(decisions)
+  for (true_count, dealer_value, card_value), splitting_decision in BasicStrategy.pair_splitting.items():
+    pair_splitting[get_true_count_index(true_count), dealer_value, card_value] = splitting_decision.value
+  for (true_count, dealer_value, hand_value), wants_surrender in BasicStrategy.surrender.items():
+    surrender[get_true_count_index(true_count), dealer_value, hand_value] = wants_surrender
+  return StrategyTables(hard_totals, soft_totals, pair_splitting, surrender)
+
+def get_true_count_index(true_count: int | None) -> int:
+  if true_count is None:
+    return 0
+  return true_count + 2
+
+def get_mask(decisions: List[PlayerDecision]) -> int:
+  mask = 0
+  for decision, bit in DECISION_BITS:
+    if decision in decisions:
+      mask |= bit
+  return mask
+
+def get_decisions(mask: int) -> List[PlayerDecision]:
+  return DECISIONS_BY_MASK[mask]
+
+
+if __name__ == "__main__":
+  save_tables()
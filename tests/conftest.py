@@ -0,0 +1,76 @@
+import random
+from typing import List
+
+from models.api.CreateSingleSimReq import CreateSingleSimReq
+from models.core.BetSpread import BetSpread
+from models.core.HumanTime import HumanTime
+from models.core.player_info.AiPlayerInfo import AiPlayerInfo
+from models.core.results.SimSingleResults import SimSingleResults
+from models.core.rules.BettingRules import BettingRules
+from models.core.rules.DealerRules import DealerRules
+from models.core.rules.DoubleDownRules import DoubleDownRules
+from models.core.rules.GameRules import GameRules
+from models.core.rules.SplittingRules import SplittingRules
+from models.core.rules.SurrenderRules import SurrenderRules
+from models.core.SingleSimBounds import SingleSimBounds
+
+
+# Requests that only differ by bankroll, so each bankroll is its own request hash
+def make_req(bankroll: int) -> CreateSingleSimReq:
+  return CreateSingleSimReq(
+    bounds=SingleSimBounds(bankroll_goal=None, bankroll_fail=None, human_time_limit=3600, sim_time_limit=None),
+    time=HumanTime(hands_per_hour=100, hours_per_day=5, days_per_week=7),
+    rules=GameRules(
+      betting_rules=BettingRules(min_bet=0, max_bet=10000),
+      dealer_rules=DealerRules(
+        dealer_hits_soft_seventeen=True,
+        blackjack_pays_multiplier=1.5,
+        deck_count=6,
+        shoe_reset_percentage=25
+      ),
+      double_down_rules=DoubleDownRules(
+        double_after_hit=False,
+        double_after_split_except_aces=True,
+        double_after_split_including_aces=False,
+        double_on_ten_eleven_only=False,
+        double_on_nine_ten_eleven_only=False,
+        double_on_any_two_cards=True
+      ),
+      splitting_rules=SplittingRules(maximum_hand_count=4, can_hit_aces=False),
+      surrender_rules=SurrenderRules(early_surrender_allowed=False, late_surrender_allowed=True)
+    ),
+    ai_player_info=[AiPlayerInfo(
+      counts_cards=True,
+      plays_deviations=True,
+      basic_strategy_skill_level=100,
+      card_counting_skill_level=100,
+      deviations_skill_level=100,
+      bet_spread=BetSpread(
+        true_zero=25,
+        true_one=50,
+        true_two=100,
+        true_three=200,
+        true_four=400,
+        true_five=800,
+        true_six=1000
+      ),
+      bankroll=bankroll
+    )]
+  )
+
+# Random but reproducible sim results, without running any sims
+def make_results(count: int, seed: int) -> List[SimSingleResults]:
+  rng = random.Random(seed)
+  results = []
+  for _ in range(count):
+    result = SimSingleResults.model_validate({})
+    result.won = rng.choice([True, False, None])
+    result.hands.counts.total = rng.randint(100, 1000)
+    result.hands.counts.won = rng.randint(0, result.hands.counts.total)
+    result.bankroll.starting = 1000.0
+    result.bankroll.profit.from_true = [rng.uniform(-500, 500) for _ in range(7)]
+    result.bankroll.profit.total = sum(result.bankroll.profit.from_true)
+    result.bankroll.ending = result.bankroll.starting + result.bankroll.profit.total
+    result.time.human_time = rng.uniform(1000, 5000)
+    results.append(result)
+  return results
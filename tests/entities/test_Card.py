@@ -29,20 +29,6 @@ def test_card_getters():
   assert card.get_face() == Face.FIVE
   assert card.get_value() == 5
 
-def test_calculate_if_value_can_reset_true():
-  card = Card(Suit.CLUBS, Face.ACE)
-  assert card.calculate_if_value_can_reset() is True
-
-def test_calculate_if_value_can_reset_false():
-  card = Card(Suit.CLUBS, Face.KING)
-  assert card.calculate_if_value_can_reset() is False
-
-def test_set_value_changes_value():
-  card = Card(Suit.DIAMONDS, Face.ACE)
-  card.set_value(1)
-  assert card.get_value() == 1
-  assert card.calculate_if_value_can_reset() is False
-
 def test_to_dict():
   card = Card(Suit.HEARTS, Face.TEN)
   expected = {
@@ -1,4 +1,5 @@
 # pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
 
 import pytest
 from entities.Game import Game
@@ -9,6 +10,7 @@ from models.core.rules.DoubleDownRules import DoubleDownRules
 from models.core.rules.SplittingRules import SplittingRules
 from models.core.rules.SurrenderRules import SurrenderRules
 from models.core.player_info.AiPlayerInfo import AiPlayerInfo
+from models.core.player_info.HumanPlayerInfo import HumanPlayerInfo
 from models.core.BetSpread import BetSpread
 from models.enums.GameState import GameState
 
@@ -116,3 +118,54 @@ def test_ai_player_places_bet(rules, ai_info):
   ai_player = game.get_ai_players()[0]
   assert ai_player.get_hand_count() == 1
   assert ai_player.get_hand(0).get_bet() > 0
+
+def test_play_round_matches_stepping_through_states(rules, ai_info):
+  # A bankroll of 100 can run out within a few rounds, so compare several seeds
+  rounds_played = 0
+  for seed in range(7, 12):
+    stepped_game = Game(rules, ai_player_info=ai_info)
+    round_game = Game(rules, ai_player_info=ai_info)
+    stepped_game.reseed(seed)
+    round_game.reseed(seed)
+    stepped_player = stepped_game.get_ai_players()[0]
+    round_player = round_game.get_ai_players()[0]
+    while stepped_game.someone_has_bankroll() and rounds_played < 200:
+      stepped_game.continue_until_state(GameState.CLEANUP)
+      stepped_results = [(h.get_result(), h.get_bet(), h.get_payout()) for h in stepped_player.get_hands()]
+      stepped_game.finish_round()
+      settled_hands = round_game.play_round()[0]
+      assert [(h.get_result(), h.get_bet(), h.get_payout()) for h in settled_hands] == stepped_results
+      assert round_game.get_state() == GameState.BETTING
+      assert round_player.get_hand_count() == 0
+      assert round_player.get_bankroll() == stepped_player.get_bankroll()
+      assert round_player.get_running_count() == stepped_player.get_running_count()
+      assert round_game.get_dealer().get_shoe_card_count() == stepped_game.get_dealer().get_shoe_card_count()
+      rounds_played += 1
+  assert rounds_played > 10
+
+def test_play_round_refuses_human_players(rules, ai_info):
+  game = Game(rules, ai_player_info=ai_info)
+  game.register_human_player(HumanPlayerInfo(bankroll=1000))
+  with pytest.raises(RuntimeError):
+    game.play_round()
+
+def test_get_player_by_id(rules, ai_info):
+  game = Game(rules, ai_player_info=ai_info)
+  ai_player = game.get_ai_players()[0]
+  human_player_id = game.register_human_player(HumanPlayerInfo(bankroll=1000))
+  assert game.get_player(ai_player.get_id()) is ai_player
+  assert game.get_player(human_player_id) is game.get_human_players()[0]
+  assert game.get_human_and_ai_players() == [game.get_human_players()[0], ai_player]
+  with pytest.raises(ValueError):
+    game.get_player("not-a-player")
+  with pytest.raises(ValueError):
+    game.place_human_player_bet(ai_player.get_id(), 10)
+
+def test_play_round_reuses_hands(rules, ai_info):
+  game = Game(rules, ai_player_info=ai_info)
+  game.reseed(3)
+  first_hands = game.play_round()[0]
+  pooled_hands = list(game._Game__hand_pool)
+  assert first_hands[0] in pooled_hands
+  second_hands = game.play_round()[0]
+  assert any(second_hands[0] is pooled_hand for pooled_hand in pooled_hands)
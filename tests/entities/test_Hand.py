@@ -28,12 +28,13 @@ def test_initial_state():
   assert hand.get_card_face(1) == Face.FIVE
 
 def test_is_soft_true_and_false():
-  ace = mock_card(11, face=Face.ACE, soft=True)
-  five = mock_card(5)
+  ace = Card(Suit.SPADES, Face.ACE)
+  five = Card(Suit.HEARTS, Face.FIVE)
   hand = Hand([ace, five], 10, False)
   assert hand.is_soft() is True
-  ace.get_value.return_value = 1
+  hand.add_card(Card(Suit.CLUBS, Face.KING))
   assert hand.is_soft() is False
+  assert hand.get_value() == 16
 
 def test_get_value_with_soft_ace_adjustment():
   ace = Card(Suit.SPADES, Face.ACE)
@@ -90,3 +91,51 @@ def test_setters_and_finalization():
   hand.set_result(HandResult.WIN)
   assert hand.get_result() == HandResult.WIN
   assert hand.is_finalized() is True
+
+def test_running_value_through_add_pop_and_restore():
+  hand = Hand([], 10, False)
+  hand.add_card(Card(Suit.SPADES, Face.ACE))
+  hand.add_card(Card(Suit.HEARTS, Face.ACE))
+  assert hand.get_value() == 12
+  assert hand.is_soft() is True
+  assert hand.is_pair() is False
+  hand.restore_aces()
+  assert hand.is_pair() is True
+  popped = hand.pop_card()
+  assert popped.get_value() == 11
+  assert hand.get_value() == 11
+  assert hand.is_soft() is True
+  hand.add_card(Card(Suit.CLUBS, Face.NINE))
+  hand.add_card(Card(Suit.CLUBS, Face.FIVE))
+  assert hand.get_value() == 15
+  assert hand.is_soft() is False
+  assert hand.is_pair() is False
+
+def test_aces_drop_to_one_in_the_hand_without_changing_the_card():
+  ace = Card(Suit.SPADES, Face.ACE)
+  hand = Hand([], 10, False)
+  hand.add_card(ace)
+  hand.add_card(Card(Suit.HEARTS, Face.SIX))
+  hand.add_card(ace)
+  assert hand.get_value() == 18
+  assert [hand.get_card_value(i) for i in range(3)] == [1, 6, 11]
+  assert hand.get_last_card_value() == 11
+  hand.add_card(Card(Suit.CLUBS, Face.KING))
+  assert hand.get_value() == 18
+  assert [hand.get_card_value(i) for i in range(4)] == [1, 6, 1, 10]
+  assert ace.get_value() == 11
+  assert [card["value"] for card in hand.to_dict()["cards"]] == [1, 6, 1, 10]
+
+def test_reset_hand_is_like_new():
+  hand = Hand([Card(Suit.SPADES, Face.ACE), Card(Suit.HEARTS, Face.ACE)], 10, False)
+  hand.double_down()
+  hand.set_result(HandResult.WIN)
+  hand.reset([Card(Suit.CLUBS, Face.NINE)], 25, True)
+  assert hand.get_value() == 9
+  assert hand.get_card_count() == 1
+  assert hand.get_bet() == 25
+  assert hand.is_from_split() is True
+  assert hand.is_soft() is False
+  assert hand.is_doubled_down() is False
+  assert hand.is_finalized() is False
+  assert hand.get_result() == HandResult.UNDETERMINED
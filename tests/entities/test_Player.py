@@ -64,6 +64,24 @@ def test_calculate_active_hand_returns_correct():
   test_player.set_hands([hand1, hand2])
   assert test_player.calculate_active_hand() == hand2
 
+def test_active_hand_moves_on_as_hands_finalize_or_are_removed():
+  hands = [MagicMock(), MagicMock(), MagicMock()]
+  for hand in hands:
+    hand.is_finalized.return_value = False
+    hand.get_result.return_value = HandResult.UNDETERMINED
+  player_info = PlayerInfo(bankroll=100)
+  test_player = ConcretePlayer(player_info)
+  test_player.set_hands(list(hands))
+  assert test_player.calculate_active_hand() == hands[0]
+  hands[0].is_finalized.return_value = True
+  assert test_player.calculate_active_hand() == hands[1]
+  test_player.remove_hand(hands[1])
+  assert test_player.calculate_active_hand() == hands[2]
+  hands[2].is_finalized.return_value = True
+  assert test_player.has_active_hand() is False
+  test_player.set_hands([hands[1]])
+  assert test_player.calculate_active_hand() == hands[1]
+
 def test_add_to_active_hand_calls_add_card():
   hand = MagicMock()
   hand.is_finalized.return_value = False
@@ -24,6 +24,11 @@ def test_add_card_and_draw():
   assert drawn == card
   assert shoe.get_card_count() == 0
 
+def test_draws_hand_out_one_shared_card_per_suit_and_face():
+  shoe = Shoe(deck_count=2, reset_percentage=50)
+  shoe.set_cards([make_card(Face.ACE, Suit.SPADES), make_card(Face.ACE, Suit.SPADES)])
+  assert shoe.draw() is shoe.draw()
+
 def test_set_cards():
   shoe = Shoe(deck_count=1, reset_percentage=50)
   cards = [make_card(Face.KING), make_card(Face.QUEEN)]
@@ -61,3 +66,37 @@ def test_to_dict():
   assert result["cards"][0]["face"] == "J"
   assert result["cards"][0]["suit"] == "Clubs"
   assert result["cards"][0]["value"] == 10
+
+def test_load_fills_full_shoe():
+  shoe = Shoe(deck_count=2, reset_percentage=25)
+  shoe.load()
+  assert shoe.get_card_count() == 104
+  cards = shoe.to_dict()["cards"]
+  assert sum(1 for c in cards if c["face"] == "A" and c["suit"] == "Spades") == 2
+
+def test_shuffle_and_reload_keep_cards_in_place():
+  shoe = Shoe(deck_count=1, reset_percentage=50)
+  shoe.load()
+  shoe.shuffle()
+  for _ in range(10):
+    shoe.draw()
+  shoe.shuffle()
+  assert shoe.get_card_count() == 42
+  shoe.load()
+  assert shoe.get_card_count() == 52
+  assert len(set((c["suit"], c["face"]) for c in shoe.to_dict()["cards"])) == 52
+
+def test_must_be_shuffled_at_penetration_index():
+  shoe = Shoe(deck_count=1, reset_percentage=25)
+  shoe.load()
+  assert shoe.get_shuffle_point() == 13
+  for _ in range(38):
+    shoe.draw()
+  assert not shoe.must_be_shuffled()
+  shoe.draw()
+  assert shoe.must_be_shuffled()
+
+def test_draw_from_empty_shoe_raises():
+  shoe = Shoe(deck_count=1, reset_percentage=50)
+  with pytest.raises(IndexError):
+    shoe.draw()
@@ -2,10 +2,13 @@
 # pylint: disable=protected-access
 
 from unittest.mock import MagicMock, patch
+import numpy as np
 import pytest
+import services.StrategyTables as StrategyTables
 from services.BasicStrategyEngine import BasicStrategyEngine
 from models.enums.PlayerDecision import PlayerDecision
 from models.enums.PairSplittingDecision import PairSplittingDecision
+from models.core.BasicStrategy import BasicStrategy
 from models.enums.Face import Face
 
 
@@ -18,6 +21,17 @@ def mock_rules_engine():
   rules_engine.can_double_after_split.return_value = True
   return rules_engine
 
+def tables_with(table_name, key, value):
+  tables = StrategyTables.StrategyTables(
+    hard_totals=np.zeros((9, 12, 22), dtype=np.int8),
+    soft_totals=np.zeros((9, 12, 22), dtype=np.int8),
+    pair_splitting=np.zeros((9, 12, 12), dtype=np.int8),
+    surrender=np.zeros((9, 12, 22), dtype=np.bool_)
+  )
+  true_count, dealer_value, hand_value = key
+  getattr(tables, table_name)[StrategyTables.get_true_count_index(true_count), dealer_value, hand_value] = value
+  return tables
+
 @pytest.fixture
 def basic_engine(mock_rules_engine):
   return BasicStrategyEngine(
@@ -26,38 +40,25 @@ def basic_engine(mock_rules_engine):
     rules_engine=mock_rules_engine
   )
 
-@patch('models.core.BasicStrategy.BasicStrategy.surrender', {
-  (0, 10, 16): True
-})
-def test_wants_to_surrender_returns_true(basic_engine):
+@patch('services.StrategyTables.get_tables', return_value=tables_with("surrender", (0, 10, 16), True))
+def test_wants_to_surrender_returns_true(_, basic_engine):
   hand = MagicMock()
   hand.get_value.return_value = 16
   hand.is_soft.return_value = False
   assert basic_engine.wants_to_surrender(10, hand, 0) is True
 
-@patch('models.core.BasicStrategy.BasicStrategy.surrender', {
-  (0, 10, 16): True
-})
-def test_check_for_surrender_returns_true(basic_engine):
-  hand = MagicMock()
-  hand.get_value.return_value = 16
-  hand.is_soft.return_value = False
-  assert basic_engine._BasicStrategyEngine__check_for_surrender(hand, 10, 0) is True
-
-@patch('models.core.BasicStrategy.BasicStrategy.pair_splitting', {
-  (0, 10, 8): PairSplittingDecision.YES
-})
-def test_check_for_split_yes(basic_engine):
+@patch('services.StrategyTables.get_tables', return_value=tables_with(
+  "pair_splitting", (0, 10, 8), PairSplittingDecision.YES.value
+))
+def test_check_for_split_yes(_, basic_engine):
   hand = MagicMock()
   hand.get_value.return_value = 16
   hand.is_soft.return_value = False
   result = basic_engine._BasicStrategyEngine__check_for_split([hand], hand, 10, 0)
   assert result is True
 
-@patch('models.core.BasicStrategy.BasicStrategy.soft_totals', {
-  (0, 10, 18): [PlayerDecision.STAND]
-})
-def test_get_play_soft_total(basic_engine):
+@patch('services.StrategyTables.get_tables', return_value=tables_with("soft_totals", (0, 10, 18), StrategyTables.STAND))
+def test_get_play_soft_total(_, basic_engine):
   hand = MagicMock()
   hand.get_value.return_value = 18
   hand.is_soft.return_value = True
@@ -65,10 +66,8 @@ def test_get_play_soft_total(basic_engine):
   result = basic_engine.get_play(hands, hand, 10, 0)
   assert PlayerDecision.STAND in result
 
-@patch('models.core.BasicStrategy.BasicStrategy.hard_totals', {
-  (0, 10, 16): [PlayerDecision.HIT]
-})
-def test_get_play_hard_total(basic_engine):
+@patch('services.StrategyTables.get_tables', return_value=tables_with("hard_totals", (0, 10, 16), StrategyTables.HIT))
+def test_get_play_hard_total(_, basic_engine):
   hand = MagicMock()
   hand.get_value.return_value = 16
   hand.is_soft.return_value = False
@@ -93,3 +92,17 @@ def test_get_some_adjusted_value_with_high_skill(basic_engine):
 def test_get_adjusted_true_count_bounds(basic_engine):
   result = basic_engine._BasicStrategyEngine__get_adjusted_true_count(3)
   assert -1 <= result <= 6
+
+def test_compiled_tables_match_basic_strategy():
+  tables = StrategyTables.build_tables()
+  for (true_count, dealer_value, hand_value), decisions in BasicStrategy.hard_totals.items():
+    mask = tables.hard_totals[StrategyTables.get_true_count_index(true_count), dealer_value, hand_value]
+    assert StrategyTables.get_decisions(mask) == decisions
+  for (true_count, dealer_value, hand_value), decisions in BasicStrategy.soft_totals.items():
+    mask = tables.soft_totals[StrategyTables.get_true_count_index(true_count), dealer_value, hand_value]
+    assert StrategyTables.get_decisions(mask) == decisions
+  for (true_count, dealer_value, card_value), splitting_decision in BasicStrategy.pair_splitting.items():
+    value = tables.pair_splitting[StrategyTables.get_true_count_index(true_count), dealer_value, card_value]
+    assert value == splitting_decision.value
+  for (true_count, dealer_value, hand_value), wants_surrender in BasicStrategy.surrender.items():
+    assert tables.surrender[StrategyTables.get_true_count_index(true_count), dealer_value, hand_value] == wants_surrender
@@ -0,0 +1,29 @@
+# pylint: disable=redefined-outer-name
+
+import logging
+
+import pytest
+from services.BlackjackLogger import BlackjackLogger
+
+
+@pytest.fixture
+def debug_logging():
+  BlackjackLogger.set_level(logging.DEBUG)
+  yield
+  BlackjackLogger.set_level(logging.INFO)
+
+def test_disabled_debug_never_builds_the_message(caplog):
+  BlackjackLogger.set_level(logging.INFO)
+  def build_message():
+    raise AssertionError("Built a message that wasn't going to be logged")
+  with caplog.at_level(logging.DEBUG):
+    BlackjackLogger.debug(build_message)
+  assert not BlackjackLogger.is_debug_enabled()
+  assert caplog.records == []
+
+def test_enabled_debug_formats_args_and_callables(caplog, debug_logging):
+  with caplog.at_level(logging.DEBUG):
+    BlackjackLogger.debug("Dealt: %s", 10)
+    BlackjackLogger.debug(lambda: "Wants: " + ", ".join(["HIT", "STAND"]))
+  assert BlackjackLogger.is_debug_enabled()
+  assert [r.getMessage() for r in caplog.records] == ["\tDealt: 10", "\tWants: HIT, STAND"]
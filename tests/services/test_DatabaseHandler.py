@@ -0,0 +1,210 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
+
+import asyncio
+import os
+import uuid
+
+import pytest
+from conftest import make_req, make_results
+from models.db.api.CreateSingleSimReqORM import CreateSingleSimReqORM
+from models.db.Base import Base
+from models.db.results.BankrollResultsORM import BankrollResultsORM
+from models.db.results.HandResultsCountsORM import HandResultsCountsORM
+from models.db.results.HandResultsORM import HandResultsORM
+from models.db.results.HandResultsPercentagesORM import HandResultsPercentagesORM
+from models.db.results.ProfitResultsORM import ProfitResultsORM
+from models.db.results.SimRequestRollupORM import SimRequestRollupORM
+from models.db.results.SimResultRowORM import SimResultRowORM
+from models.db.results.SimSingleResultsORM import SimSingleResultsORM
+from models.db.results.StoredResultBatchORM import StoredResultBatchORM
+from models.db.results.TimeResultsORM import TimeResultsORM
+from psycopg import errors
+from services.DatabaseEngineSingleton import DatabaseEngineSingleton
+from services.DatabaseHandler import DatabaseHandler
+from services.SimDataTransformer import SimDataTransformer
+from sqlalchemy import inspect, select, text
+from sqlalchemy.exc import IntegrityError
+
+POSTGRES_ENV_VARS = (
+  "BJE_POSTGRES_USER", "BJE_POSTGRES_PASS", "BJE_POSTGRES_HOST", "BJE_POSTGRES_PORT", "BJE_POSTGRES_DB_NAME"
+)
+requires_postgres = pytest.mark.skipif(
+  any(os.getenv(name) is None for name in POSTGRES_ENV_VARS),
+  reason="Needs a Postgres server from the BJE_POSTGRES_* env vars."
+)
+
+
+@pytest.fixture
+def request_hash():
+  transformer = SimDataTransformer()
+  return transformer.get_request_hash(transformer.get_request_dict(make_req(1000)))
+
+@pytest.fixture
+def request_ids():
+  request_ids = DatabaseHandler._DatabaseHandler__request_ids
+  request_ids.clear()
+  yield request_ids
+  request_ids.clear()
+
+# A throwaway schema that every connection opened during the test uses, so its tables start out missing and are
+# dropped afterwards without touching the database's own
+@pytest.fixture
+def postgres_schema(monkeypatch, request_ids):
+  engines = DatabaseEngineSingleton()
+  schema = f"bje_test_{uuid.uuid4().hex}"
+  with engines.get_engine().begin() as connection:
+    connection.execute(text(f"CREATE SCHEMA {schema}"))
+  monkeypatch.setenv("PGOPTIONS", f"-c search_path={schema}")
+  asyncio.run(engines.dispose())
+  try:
+    yield schema
+  finally:
+    with engines.get_engine().begin() as connection:
+      connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    asyncio.run(engines.dispose())
+    request_ids.clear()
+
+# One sim as it was stored before simulation_result_rows, spread over six tables
+def make_old_sim(request_id, won, hands_total, from_true):
+  profit = sum(from_true)
+  return SimSingleResultsORM(
+    request_id=request_id,
+    won=won,
+    hands=HandResultsORM(
+      counts=HandResultsCountsORM(total=hands_total, won=hands_total // 2, lost=hands_total - hands_total // 2),
+      percentages=HandResultsPercentagesORM(won=50.0, lost=50.0)
+    ),
+    bankroll=BankrollResultsORM(
+      starting=1000.0,
+      ending=1000.0 + profit,
+      highest=1000.0 + max(profit, 0.0),
+      lowest=1000.0 + min(profit, 0.0),
+      profit=ProfitResultsORM(total=profit, from_true=from_true, per_hand=profit / hands_total)
+    ),
+    time=TimeResultsORM(human_time=hands_total * 36.0, simulation_time=0.5)
+  )
+
+# Stands in for the database: fails each store with the next of errors, then hands back new_request_id
+def fail_stores_with(monkeypatch, request_ids, new_request_id, *store_errors):
+  attempts = []
+  def store_results_in_new_session(_handler, _sim_results, _request_dict, request_hash, _batch_ids):
+    attempts.append(request_ids.get(request_hash))
+    if len(attempts) <= len(store_errors):
+      raise store_errors[len(attempts) - 1]
+    return new_request_id
+  monkeypatch.setattr(DatabaseHandler, "_DatabaseHandler__store_results_in_new_session", store_results_in_new_session)
+  return attempts
+
+def test_stale_request_id_is_dropped_and_the_store_retried(monkeypatch, request_ids, request_hash):
+  request_ids[request_hash] = 3
+  foreign_key_error = IntegrityError("INSERT", {}, errors.ForeignKeyViolation())
+  attempts = fail_stores_with(monkeypatch, request_ids, 7, foreign_key_error)
+  DatabaseHandler().store_simulation_results_bulk(make_results(2, seed=1), make_req(1000))
+  assert attempts == [3, None]
+  assert request_ids[request_hash] == 7
+
+def test_other_integrity_errors_are_not_retried(monkeypatch, request_ids, request_hash):
+  request_ids[request_hash] = 3
+  unique_error = IntegrityError("INSERT", {}, errors.UniqueViolation())
+  attempts = fail_stores_with(monkeypatch, request_ids, 7, unique_error)
+  with pytest.raises(IntegrityError):
+    DatabaseHandler().store_simulation_results_bulk(make_results(2, seed=1), make_req(1000))
+  assert attempts == [3]
+  assert request_ids[request_hash] == 3
+
+def test_foreign_key_error_without_a_cached_id_is_raised(monkeypatch, request_ids, request_hash):
+  foreign_key_error = IntegrityError("INSERT", {}, errors.ForeignKeyViolation())
+  attempts = fail_stores_with(monkeypatch, request_ids, 7, foreign_key_error)
+  with pytest.raises(IntegrityError):
+    DatabaseHandler().store_simulation_results_bulk(make_results(2, seed=1), make_req(1000))
+  assert attempts == [None]
+
+@requires_postgres
+def test_rollup_matches_the_stored_rows(postgres_schema, request_hash):
+  handler = DatabaseHandler()
+  handler.create_schema()
+  results = make_results(5, seed=1) + make_results(7, seed=2)
+  handler.store_simulation_results_bulk(results[:5], make_req(1000))
+  handler.store_simulation_results_bulk(results[5:], make_req(1000))
+  session = DatabaseEngineSingleton().get_session_maker()()
+  try:
+    rollup = handler._DatabaseHandler__get_rollup_aggregate(session.get(SimRequestRollupORM, request_hash))
+    request_id = handler._DatabaseHandler__get_request_id(session, request_hash)
+    rows = handler._DatabaseHandler__get_sim_results_aggregate(session, request_id)
+  finally:
+    session.close()
+  assert rollup.sims_run == rows.sims_run == 12
+  assert (rollup.sims_won, rollup.sims_lost, rollup.sims_unfinished) == (
+    rows.sims_won, rows.sims_lost, rows.sims_unfinished
+  )
+  assert rollup.summed.hands.counts == rows.summed.hands.counts
+  assert rollup.summed.bankroll.starting == pytest.approx(rows.summed.bankroll.starting)
+  assert rollup.summed.bankroll.ending == pytest.approx(rows.summed.bankroll.ending)
+  assert rollup.summed.bankroll.profit.total == pytest.approx(rows.summed.bankroll.profit.total)
+  assert rollup.summed.bankroll.profit.from_true == pytest.approx(rows.summed.bankroll.profit.from_true)
+  assert rollup.summed.time.human_time == pytest.approx(rows.summed.time.human_time)
+  assert rollup.profit_mean == pytest.approx(rows.profit_mean)
+  assert rollup.profit_m2 == pytest.approx(rows.profit_m2)
+  assert rollup.profit_lowest == pytest.approx(rows.profit_lowest)
+  assert rollup.profit_highest == pytest.approx(rows.profit_highest)
+
+@requires_postgres
+def test_old_layout_is_migrated(postgres_schema):
+  new_tables = (SimResultRowORM.__tablename__, SimRequestRollupORM.__tablename__, StoredResultBatchORM.__tablename__)
+  engine = DatabaseEngineSingleton().get_engine()
+  Base.metadata.create_all(
+    bind=engine,
+    tables=[table for table in Base.metadata.sorted_tables if table.name not in new_tables]
+  )
+  index_name = f"ix_{CreateSingleSimReqORM.__tablename__}_request_hash"
+  with engine.begin() as connection:
+    connection.execute(text(f"DROP INDEX {index_name}"))
+    connection.execute(text(f"CREATE INDEX {index_name} ON {CreateSingleSimReqORM.__tablename__} (request_hash)"))
+  session = DatabaseEngineSingleton().get_session_maker()()
+  try:
+    old_requests = [CreateSingleSimReqORM(request_hash=h, request_json={}) for h in ("a", "a", "b")]
+    session.add_all(old_requests)
+    session.flush()
+    kept_id, duplicate_id, other_id = (r.id for r in old_requests)
+    session.add_all([
+      make_old_sim(kept_id, True, 100, [1.5, 0.0, 0.0, 0.0, 0.0, 0.0, 2.0]),
+      make_old_sim(duplicate_id, None, 200, [-3.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0]),
+      make_old_sim(other_id, False, 300, [0.0, 0.0, 4.5, 0.0, 0.0, 0.0, 0.0])
+    ])
+    session.commit()
+  finally:
+    session.close()
+
+  DatabaseHandler().create_schema()
+
+  session = DatabaseEngineSingleton().get_session_maker()()
+  try:
+    requests = session.execute(
+      select(CreateSingleSimReqORM.id, CreateSingleSimReqORM.request_hash).order_by(CreateSingleSimReqORM.id)
+    ).all()
+    old_request_ids = session.scalars(select(SimSingleResultsORM.request_id).order_by(SimSingleResultsORM.id)).all()
+    rows = session.scalars(select(SimResultRowORM).order_by(SimResultRowORM.id)).all()
+    rollup = session.get(SimRequestRollupORM, "a")
+  finally:
+    session.close()
+  assert [tuple(r) for r in requests] == [(kept_id, "a"), (other_id, "b")]
+  assert old_request_ids == [kept_id, kept_id, other_id]
+  assert [r.request_id for r in rows] == [kept_id, kept_id, other_id]
+  assert [r.won for r in rows] == [True, None, False]
+  assert [(r.hands_total, r.hands_won, r.hands_lost) for r in rows] == [(100, 50, 50), (200, 100, 100), (300, 150, 150)]
+  assert [r.percentage_won for r in rows] == [50.0, 50.0, 50.0]
+  assert [r.profit_total for r in rows] == [3.5, -2.0, 4.5]
+  assert [list(r.profit_from_true) for r in rows] == [
+    [1.5, 0.0, 0.0, 0.0, 0.0, 0.0, 2.0],
+    [-3.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+    [0.0, 0.0, 4.5, 0.0, 0.0, 0.0, 0.0]
+  ]
+  assert [r.profit_per_hand for r in rows] == pytest.approx([0.035, -0.01, 0.015])
+  assert [(r.bankroll_ending, r.bankroll_highest, r.bankroll_lowest) for r in rows] == [
+    (1003.5, 1003.5, 1000.0), (998.0, 1000.0, 998.0), (1004.5, 1004.5, 1000.0)
+  ]
+  assert [(r.human_time, r.simulation_time) for r in rows] == [(3600.0, 0.5), (7200.0, 0.5), (10800.0, 0.5)]
+  assert rollup.sims_run == 2
+  indexes = inspect(DatabaseEngineSingleton().get_engine()).get_indexes(CreateSingleSimReqORM.__tablename__)
+  assert any(index["name"] == index_name and index["unique"] for index in indexes)
@@ -0,0 +1,262 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
+
+import random
+import statistics
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+from entities.Game import Game
+from models.api.CreateSingleSimReq import CreateSingleSimReq
+from models.core.BetSpread import BetSpread
+from models.core.HumanTime import HumanTime
+from models.core.player_info.AiPlayerInfo import AiPlayerInfo
+from models.core.results.HandResultsCounts import HandResultsCounts
+from models.core.results.SimSingleResults import SimSingleResults
+from models.core.rules.BettingRules import BettingRules
+from models.core.rules.DealerRules import DealerRules
+from models.core.rules.DoubleDownRules import DoubleDownRules
+from models.core.rules.GameRules import GameRules
+from models.core.rules.SplittingRules import SplittingRules
+from models.core.rules.SurrenderRules import SurrenderRules
+from models.core.SingleSimBounds import SingleSimBounds
+from models.enums.GameState import GameState
+from services.FastSimKernel import FastSimKernel
+from services.SingleSimRunner import SingleSimRunner
+
+
+@pytest.fixture
+def rules():
+  return GameRules(
+    betting_rules=BettingRules(
+      min_bet=0,
+      max_bet=10000
+    ),
+    dealer_rules=DealerRules(
+      dealer_hits_soft_seventeen=True,
+      blackjack_pays_multiplier=1.5,
+      deck_count=6,
+      shoe_reset_percentage=25
+    ),
+    double_down_rules=DoubleDownRules(
+      double_after_hit=False,
+      double_after_split_except_aces=True,
+      double_after_split_including_aces=False,
+      double_on_ten_eleven_only=False,
+      double_on_nine_ten_eleven_only=False,
+      double_on_any_two_cards=True
+    ),
+    splitting_rules=SplittingRules(
+      maximum_hand_count=4,
+      can_hit_aces=False
+    ),
+    surrender_rules=SurrenderRules(
+      early_surrender_allowed=False,
+      late_surrender_allowed=True
+    )
+  )
+
+@pytest.fixture
+def ai_info():
+  return AiPlayerInfo(
+    counts_cards=True,
+    plays_deviations=True,
+    basic_strategy_skill_level=100,
+    card_counting_skill_level=100,
+    deviations_skill_level=100,
+    bet_spread=BetSpread(
+      true_zero=25,
+      true_one=50,
+      true_two=100,
+      true_three=200,
+      true_four=400,
+      true_five=800,
+      true_six=1000
+    ),
+    bankroll=200000
+  )
+
+@pytest.fixture
+def bounds():
+  return SingleSimBounds(
+    bankroll_goal=None,
+    bankroll_fail=None,
+    human_time_limit=None,
+    sim_time_limit=None
+  )
+
+@pytest.fixture
+def human_time():
+  return HumanTime(
+    hands_per_hour=100,
+    hours_per_day=5,
+    days_per_week=7
+  )
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4, 5, 6, 7, 8])
+def test_kernel_matches_object_engine_until_reshuffle(seed, rules, ai_info, bounds, human_time):
+  np.random.seed(seed)
+  random.seed(seed)
+  game = Game(rules, ai_player_info=[ai_info])
+  dealer = game.get_dealer()
+  # The object shoe draws from the end of its cards, the kernel shoe from the front
+  object_cards = dealer.get_shoe().to_dict()["cards"]
+  kernel = FastSimKernel(rules, ai_info, bounds, human_time, seed=seed)
+  kernel._FastSimKernel__shoe[:] = [card["value"] for card in reversed(object_cards)]
+  ai_player = game.get_ai_players()[0]
+  shuffle_point = dealer.get_full_shoe_size() * rules.dealer_rules.shoe_reset_percentage / 100
+
+  rounds_played = 0
+  while dealer.get_shoe_card_count() > shuffle_point + 20:
+    game.continue_until_state(GameState.CLEANUP)
+    game.finish_round()
+    kernel.play(1)
+    rounds_played += 1
+    assert kernel.get_shoe_card_count() == dealer.get_shoe_card_count()
+    assert kernel.get_running_count() == ai_player.get_running_count()
+    assert kernel.get_bankroll() == pytest.approx(ai_player.get_bankroll())
+  assert rounds_played > 0
+
+# Returns each sim's profit per hand and every sim's hand results summed
+def play_sims(
+  rules: GameRules,
+  ai_info: AiPlayerInfo,
+  human_time: HumanTime,
+  fast_kernel: bool,
+  seeds: range,
+  hands_per_sim: int
+) -> Tuple[List[float], HandResultsCounts]:
+  bounds = SingleSimBounds(
+    bankroll_goal=None,
+    bankroll_fail=None,
+    human_time_limit=3600 * hands_per_sim // human_time.hands_per_hour,
+    sim_time_limit=None
+  )
+  req = CreateSingleSimReq(
+    bounds=bounds,
+    time=human_time,
+    rules=rules,
+    ai_player_info=[ai_info],
+    fast_kernel=fast_kernel
+  )
+  runner = SingleSimRunner(Game(rules, ai_player_info=[ai_info]), bounds, human_time, req)
+  profits_per_hand = []
+  counts = HandResultsCounts.model_validate({})
+  for seed in seeds:
+    runner.run_sync(seed)
+    results = runner.get_results()
+    assert results
+    profits_per_hand.append(results.bankroll.profit.per_hand)
+    for result in ("total", "blackjack", "won", "drawn", "lost", "surrendered"):
+      setattr(counts, result, getattr(counts, result) + getattr(results.hands.counts, result))
+  return profits_per_hand, counts
+
+# The kernel's skill noise draws from a different stream than the object engine's, so below a skill of 100 the two
+# can only agree statistically: on mean profit per hand and on how often each hand result comes up, to within four
+# standard errors. A basic strategy skill of 10 or under also has the player taking insurance.
+@pytest.mark.parametrize("basic_strategy, card_counting, deviations", [(60, 40, 50), (5, 20, 30)])
+def test_kernel_matches_object_engine_with_skill_noise(
+  basic_strategy,
+  card_counting,
+  deviations,
+  rules,
+  human_time
+):
+  ai_info = AiPlayerInfo(
+    counts_cards=True,
+    plays_deviations=True,
+    basic_strategy_skill_level=basic_strategy,
+    card_counting_skill_level=card_counting,
+    deviations_skill_level=deviations,
+    bet_spread=BetSpread(
+      true_zero=10,
+      true_one=10,
+      true_two=20,
+      true_three=30,
+      true_four=40,
+      true_five=50,
+      true_six=60
+    ),
+    bankroll=10**8
+  )
+  object_profits, object_counts = play_sims(rules, ai_info, human_time, False, range(15), 2000)
+  kernel_profits, kernel_counts = play_sims(rules, ai_info, human_time, True, range(100, 250), 2000)
+
+  profit_error = (
+    statistics.variance(object_profits) / len(object_profits) +
+    statistics.variance(kernel_profits) / len(kernel_profits)
+  ) ** 0.5
+  assert abs(statistics.mean(object_profits) - statistics.mean(kernel_profits)) < 4 * profit_error
+  for result in ("blackjack", "won", "drawn", "lost", "surrendered"):
+    object_rate = getattr(object_counts, result) / object_counts.total
+    kernel_rate = getattr(kernel_counts, result) / kernel_counts.total
+    rate_error = (object_rate * (1 - object_rate) * (1 / object_counts.total + 1 / kernel_counts.total)) ** 0.5
+    assert abs(object_rate - kernel_rate) < 4 * rate_error
+
+def test_kernel_stops_at_bankroll_bounds(rules, ai_info, human_time):
+  bounds = SingleSimBounds(
+    bankroll_goal=210000,
+    bankroll_fail=190000,
+    human_time_limit=None,
+    sim_time_limit=None
+  )
+  kernel = FastSimKernel(rules, ai_info, bounds, human_time, seed=1)
+  while not kernel.is_finished():
+    kernel.play(1000)
+  counts = kernel.get_counts()
+  assert counts["total"] > 0
+  assert kernel.get_bankroll() <= 190000 or kernel.get_bankroll() >= 210000
+  assert sum(kernel.get_profit_from_true()) == pytest.approx(kernel.get_bankroll() - 200000)
+
+def test_run_sync_with_fast_kernel(rules, ai_info, human_time):
+  bounds = SingleSimBounds(
+    bankroll_goal=None,
+    bankroll_fail=None,
+    human_time_limit=3600 * 10,
+    sim_time_limit=None
+  )
+  req = CreateSingleSimReq(
+    bounds=bounds,
+    time=human_time,
+    rules=rules,
+    ai_player_info=[ai_info],
+    fast_kernel=True
+  )
+  game = Game(rules, ai_player_info=[ai_info])
+  runner = SingleSimRunner(game, bounds, human_time, req)
+  runner.run_sync()
+  results = runner.get_results()
+  assert isinstance(results, SimSingleResults)
+  assert results.hands.counts.total >= 1000
+  assert results.bankroll.ending == runner.get_bankroll()
+  assert sum(results.bankroll.profit.from_true) == pytest.approx(results.bankroll.profit.total)
+
+def test_fast_kernel_requires_one_ai_player(rules, ai_info, bounds, human_time):
+  req = CreateSingleSimReq(
+    bounds=bounds,
+    time=human_time,
+    rules=rules,
+    ai_player_info=[ai_info, ai_info],
+    fast_kernel=True
+  )
+  game = Game(rules, ai_player_info=[ai_info, ai_info])
+  with pytest.raises(ValueError):
+    SingleSimRunner(game, bounds, human_time, req)
+
+def test_seeds_differing_only_in_high_bits_shuffle_differently(rules, ai_info, bounds, human_time):
+  seed = 12345
+  kernel = FastSimKernel(rules, ai_info, bounds, human_time, seed=seed)
+  high_bits_kernel = FastSimKernel(rules, ai_info, bounds, human_time, seed=seed | (1 << 40))
+  assert not np.array_equal(kernel._FastSimKernel__shoe, high_bits_kernel._FastSimKernel__shoe)
+
+def test_interleaved_kernels_keep_their_own_streams(rules, ai_info, bounds, human_time):
+  lone = FastSimKernel(rules, ai_info, bounds, human_time, seed=7)
+  lone.play(500)
+  kernel = FastSimKernel(rules, ai_info, bounds, human_time, seed=7)
+  other = FastSimKernel(rules, ai_info, bounds, human_time, seed=8)
+  for _ in range(5):
+    kernel.play(100)
+    other.play(100)
+  assert kernel.get_counts() == lone.get_counts()
+  assert kernel.get_bankroll() == lone.get_bankroll()
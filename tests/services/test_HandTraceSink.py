@@ -0,0 +1,51 @@
+# pylint: disable=redefined-outer-name
+
+import json
+from pathlib import Path
+
+import pytest
+from models.api.CreateSingleSimReq import CreateSingleSimReq
+from services.HandTraceSink import HandTraceSink
+from services.SimDataTransformer import SimDataTransformer
+from services.SimWorkerPool import SimWorkerPool
+
+
+@pytest.fixture
+def req_dict():
+  req_path = Path(__file__).resolve().parents[2] / "zz-test-client" / "single.json"
+  req = CreateSingleSimReq(**json.loads(req_path.read_text()))
+  req.bounds.bankroll_goal = None
+  req.bounds.bankroll_fail = None
+  req.bounds.human_time_limit = 360
+  req.bounds.sim_time_limit = None
+  req.fast_kernel = False
+  return req.model_dump()
+
+def test_only_the_traced_seed_gets_a_sink(tmp_path, monkeypatch):
+  monkeypatch.setenv("BJE_TRACE_DIR", str(tmp_path))
+  monkeypatch.setenv("BJE_TRACE_SIM_SEED", "12")
+  assert HandTraceSink.for_sim(11) is None
+  sink = HandTraceSink.for_sim(12)
+  assert sink is not None
+  sink.close()
+  assert sink.get_path() == tmp_path / "12.jsonl"
+
+def test_traced_sim_writes_every_round(req_dict, tmp_path, monkeypatch):
+  request_hash = SimDataTransformer().get_request_hash(req_dict)
+  result = SimWorkerPool.run_sync_sims(request_hash, req_dict, 1, True, root_seed=5).rows[0]
+  monkeypatch.setenv("BJE_TRACE_DIR", str(tmp_path))
+  monkeypatch.setenv("BJE_TRACE_SIM_SEED", str(result.seed))
+  traced = SimWorkerPool.run_sync_sims(f"{request_hash}-traced", req_dict, 1, True, root_seed=5).rows[0]
+  rounds = [json.loads(line) for line in (tmp_path / f"{result.seed}.jsonl").read_text().splitlines()]
+  assert traced.hands == result.hands
+  assert sum(len(r["hands"]) for r in rounds) == result.hands.counts.total
+  assert rounds[-1]["bankroll"] == result.bankroll.ending
+
+def test_fast_kernel_sim_leaves_no_trace(req_dict, tmp_path, monkeypatch):
+  req_dict["fast_kernel"] = True
+  request_hash = SimDataTransformer().get_request_hash(req_dict)
+  result = SimWorkerPool.run_sync_sims(request_hash, req_dict, 1, True, root_seed=5).rows[0]
+  monkeypatch.setenv("BJE_TRACE_DIR", str(tmp_path))
+  monkeypatch.setenv("BJE_TRACE_SIM_SEED", str(result.seed))
+  SimWorkerPool.run_sync_sims(request_hash, req_dict, 1, True, root_seed=5)
+  assert not (tmp_path / f"{result.seed}.jsonl").exists()
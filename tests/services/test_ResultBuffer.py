@@ -0,0 +1,110 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
+
+from typing import List
+
+import pytest
+from conftest import make_req, make_results
+from models.api.CreateSingleSimReq import CreateSingleSimReq
+from models.core.results.SimSingleResults import SimSingleResults
+from services.ResultBuffer import ResultBuffer
+from services.SqliteResultStore import SqliteResultStore
+
+
+class RecordingHandler():
+  stored: List[tuple]
+  failures_left: int
+
+  def __init__(self, failures_left: int = 0):
+    self.stored = []
+    self.failures_left = failures_left
+
+  def store_simulation_results_bulk(
+    self,
+    sim_results: List[SimSingleResults],
+    request: CreateSingleSimReq,
+    batch_ids: List[str] | None = None
+  ) -> None:
+    if self.failures_left > 0:
+      self.failures_left -= 1
+      raise RuntimeError("Database is unavailable.")
+    self.stored.append((sim_results, request))
+
+  def is_batch_stored(self, batch_id: str) -> bool:
+    return False
+
+@pytest.fixture
+def req():
+  return make_req(10000)
+
+def test_flush_stores_consecutive_records_together_and_empties_the_log(tmp_path, req):
+  handler = RecordingHandler()
+  buffer = ResultBuffer(tmp_path, handler) # type: ignore
+  results = make_results(6, seed=1)
+  buffer.append(results[:2], req)
+  buffer.append(results[2:5], req)
+  buffer.append(results[5:], make_req(20000))
+  assert buffer.get_pending_bytes() > 0
+  assert buffer.flush() == 6
+  assert [len(sim_results) for sim_results, _ in handler.stored] == [5, 1]
+  assert handler.stored[0][1] == req
+  assert handler.stored[0][0] == results[:5]
+  assert buffer.get_pending_bytes() == 0
+  assert (tmp_path / "results.log").stat().st_size == 0
+
+def test_failed_store_stays_pending_until_retried(tmp_path, req):
+  handler = RecordingHandler(failures_left=1)
+  buffer = ResultBuffer(tmp_path, handler) # type: ignore
+  buffer.append(make_results(4, seed=2), req)
+  with pytest.raises(RuntimeError):
+    buffer.flush()
+  assert handler.stored == []
+  assert buffer.get_pending_bytes() > 0
+  # A new buffer over the same directory picks up where the old one left off, as it would after a restart
+  restarted_buffer = ResultBuffer(tmp_path, handler) # type: ignore
+  assert restarted_buffer.flush() == 4
+  assert buffer.get_pending_bytes() == 0
+
+def test_partial_record_is_dropped_on_startup(tmp_path, req):
+  handler = RecordingHandler()
+  buffer = ResultBuffer(tmp_path, handler) # type: ignore
+  buffer.append(make_results(2, seed=3), req)
+  complete_size = (tmp_path / "results.log").stat().st_size
+  with open(tmp_path / "results.log", "ab") as log:
+    log.write(b"\x00\x00\x10\x00{\"request\"")
+  restarted_buffer = ResultBuffer(tmp_path, handler) # type: ignore
+  assert (tmp_path / "results.log").stat().st_size == complete_size
+  assert restarted_buffer.flush() == 2
+
+def test_background_flusher_drains_the_log(tmp_path, req):
+  handler = RecordingHandler()
+  buffer = ResultBuffer(tmp_path, handler) # type: ignore
+  buffer.start()
+  buffer.append(make_results(3, seed=4), req)
+  buffer.stop()
+  assert sum(len(sim_results) for sim_results, _ in handler.stored) == 3
+  assert buffer.get_pending_bytes() == 0
+
+def test_batch_replayed_after_a_crash_is_not_stored_twice(tmp_path, req):
+  result_store = SqliteResultStore(tmp_path / "results.sqlite3")
+  result_store.create_schema()
+  buffer = ResultBuffer(tmp_path / "buffer", result_store)
+  results = make_results(6, seed=5)
+  for result in results:
+    result.won = True
+  buffer.append(results[:2], req)
+  buffer.append(results[2:5], req)
+  log_path = tmp_path / "buffer" / "results.log"
+  log_before_flush = log_path.read_bytes()
+  assert buffer.flush() == 5
+  # As if the process died after the store committed but before the offset moved past the batch
+  log_path.write_bytes(log_before_flush)
+  (tmp_path / "buffer" / "results.offset").write_text("0")
+  restarted_buffer = ResultBuffer(tmp_path / "buffer", result_store)
+  restarted_buffer.append(results[5:], req)
+  assert restarted_buffer.flush() == 1
+  assert len(result_store.get_sim_results(req)) == 6
+  all_results = result_store.get_all_sim_results(req)
+  assert all_results is not None
+  assert all_results.metadata.sims_run == 6
+  assert restarted_buffer.get_pending_bytes() == 0
@@ -0,0 +1,55 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
+
+import io
+
+import pytest
+from conftest import make_req, make_results
+from services.ResultExporter import ResultExporter
+from services.SimDataTransformer import SimDataTransformer
+from services.SqliteResultStore import SqliteResultStore
+
+pyarrow = pytest.importorskip("pyarrow")
+parquet = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def results():
+  return make_results(25, seed=3)
+
+@pytest.fixture
+def exporter(tmp_path, results, monkeypatch):
+  monkeypatch.setenv("BJE_EXPORT_CHUNK_SIZE", "10")
+  store = SqliteResultStore(tmp_path / "results.sqlite3")
+  store.create_schema()
+  store.store_simulation_results_bulk(results, make_req(1000))
+  return ResultExporter(store)
+
+@pytest.fixture
+def request_hash():
+  transformer = SimDataTransformer()
+  return transformer.get_request_hash(transformer.get_request_dict(make_req(1000)))
+
+def test_parquet_export_has_one_row_per_sim(exporter, request_hash, results):
+  sink = io.BytesIO()
+  assert exporter.export(request_hash, sink) == 25
+  table = parquet.read_table(io.BytesIO(sink.getvalue()))
+  assert table.column("won").to_pylist() == [r.won for r in results]
+  assert table.column("hands_total").to_pylist() == [r.hands.counts.total for r in results]
+  assert table.column("profit_from_true").to_pylist() == [r.bankroll.profit.from_true for r in results]
+
+def test_streamed_arrow_export_matches_written_file(exporter, request_hash, results):
+  chunks = list(exporter.iter_export(request_hash, "arrow"))
+  # One chunk per 10 rows, plus the footer
+  assert len(chunks) == 4
+  table = pyarrow.ipc.open_file(io.BytesIO(b"".join(chunks))).read_all()
+  assert table.column("profit_total").to_pylist() == [r.bankroll.profit.total for r in results]
+
+def test_unknown_hash_exports_an_empty_file(exporter):
+  table = parquet.read_table(io.BytesIO(b"".join(exporter.iter_export("unknown"))))
+  assert table.num_rows == 0
+  assert "profit_from_true" in table.column_names
+
+def test_unknown_format_raises_before_streaming(exporter, request_hash):
+  with pytest.raises(ValueError):
+    exporter.iter_export(request_hash, "csv")
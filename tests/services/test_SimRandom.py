@@ -0,0 +1,51 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
+
+import numpy as np
+from services.SimRandom import SimRandom
+
+
+def test_same_seed_replays_the_same_stream():
+  first = SimRandom(seed=42)
+  second = SimRandom(seed=1)
+  second.reseed(42)
+  assert [first.randint(1, 100) for _ in range(50)] == [second.randint(1, 100) for _ in range(50)]
+  first_cards = np.arange(52)
+  second_cards = np.arange(52)
+  first.shuffle(first_cards)
+  second.shuffle(second_cards)
+  assert (first_cards == second_cards).all()
+  assert first.get_seed() == second.get_seed() == 42
+
+def test_randint_is_inclusive():
+  sim_random = SimRandom(seed=3)
+  rolls = {sim_random.randint(1, 3) for _ in range(1000)}
+  assert rolls == {1, 2, 3}
+  assert {sim_random.randint(100, 100) for _ in range(10)} == {100}
+
+def test_sim_seeds_are_stable_and_distinct():
+  seeds = [SimRandom.get_sim_seed(7, i) for i in range(100)]
+  assert seeds == [SimRandom.get_sim_seed(7, i) for i in range(100)]
+  assert len(set(seeds)) == 100
+  assert all(0 <= seed < 2**63 for seed in seeds)
+  assert SimRandom.get_sim_seed(8, 0) != seeds[0]
+
+def test_randint_draws_from_refilled_buffer(monkeypatch):
+  monkeypatch.setenv("BJE_RANDOM_BUFFER_SIZE", "8")
+  sim_random = SimRandom(seed=5)
+  uniform_sequence = np.random.SeedSequence(5).spawn(2)[0]
+  uniforms = np.random.Generator(np.random.PCG64(uniform_sequence)).random(24)
+  assert [sim_random.randint(0, 9) for _ in range(20)] == [int(u * 10) for u in uniforms[:20]]
+
+def test_replay_does_not_depend_on_buffer_size(monkeypatch):
+  monkeypatch.setenv("BJE_RANDOM_BUFFER_SIZE", "4096")
+  large_buffer = SimRandom(seed=42)
+  monkeypatch.setenv("BJE_RANDOM_BUFFER_SIZE", "16")
+  small_buffer = SimRandom(seed=42)
+  for _ in range(3):
+    assert [large_buffer.randint(1, 100) for _ in range(40)] == [small_buffer.randint(1, 100) for _ in range(40)]
+    large_cards = np.arange(52)
+    small_cards = np.arange(52)
+    large_buffer.shuffle(large_cards)
+    small_buffer.shuffle(small_cards)
+    assert (large_cards == small_cards).all()
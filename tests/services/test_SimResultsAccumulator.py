@@ -0,0 +1,70 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
+
+import statistics
+
+import pytest
+from conftest import make_results
+from services.SimDataTransformer import SimDataTransformer
+from services.SimResultsAccumulator import SimResultsAccumulator
+
+
+@pytest.fixture
+def results():
+  return make_results(50, seed=7)
+
+def test_add_tracks_counts_sums_and_profit_stats(results):
+  accumulator = SimResultsAccumulator()
+  for result in results:
+    accumulator.add(result)
+  profits = [r.bankroll.profit.total for r in results]
+  summed = accumulator.get_summed()
+  assert accumulator.get_sims_run() == 50
+  assert accumulator.get_sims_won() == sum(1 for r in results if r.won)
+  assert accumulator.get_sims_lost() == sum(1 for r in results if r.won is False)
+  assert accumulator.get_sims_unfinished() == sum(1 for r in results if r.won is None)
+  assert accumulator.get_total_hands() == sum(r.hands.counts.total for r in results)
+  assert accumulator.get_aggregate().rows == []
+  from_true = [sum(profits) for profits in zip(*(r.bankroll.profit.from_true for r in results))]
+  assert summed.bankroll.profit.from_true == pytest.approx(from_true)
+  assert summed.hands.percentages.won == pytest.approx(
+    100 * summed.hands.counts.won / summed.hands.counts.total
+  )
+  assert accumulator.get_profit_mean() == pytest.approx(statistics.mean(profits))
+  assert accumulator.get_profit_variance() == pytest.approx(statistics.variance(profits))
+  assert accumulator.get_profit_lowest() == min(profits)
+  assert accumulator.get_profit_highest() == max(profits)
+
+def test_add_aggregate_matches_adding_every_result(results):
+  sequential = SimResultsAccumulator()
+  merged = SimResultsAccumulator(keep_rows=True)
+  for start in range(0, len(results), 15):
+    chunk = SimResultsAccumulator(keep_rows=True)
+    for result in results[start:start + 15]:
+      chunk.add(result)
+      sequential.add(result)
+    merged.add_aggregate(chunk.get_aggregate())
+  merged.add_aggregate(SimResultsAccumulator().get_aggregate())
+  assert merged.get_rows() == results
+  assert merged.get_sims_run() == sequential.get_sims_run()
+  assert merged.get_total_hands() == sequential.get_total_hands()
+  assert merged.get_summed().bankroll.ending == pytest.approx(sequential.get_summed().bankroll.ending)
+  assert merged.get_profit_mean() == pytest.approx(sequential.get_profit_mean())
+  assert merged.get_profit_variance() == pytest.approx(sequential.get_profit_variance())
+  assert merged.get_profit_lowest() == sequential.get_profit_lowest()
+  assert merged.get_profit_highest() == sequential.get_profit_highest()
+
+def test_matches_transformer_sums(results):
+  accumulator = SimResultsAccumulator()
+  for result in results:
+    accumulator.add(result)
+  summed = SimDataTransformer().get_single_sims_summed(results)
+  assert accumulator.get_summed().hands.counts == summed.hands.counts
+  assert accumulator.get_summed().bankroll.profit.total == pytest.approx(summed.bankroll.profit.total)
+
+def test_profit_variance_needs_two_sims(results):
+  accumulator = SimResultsAccumulator()
+  assert accumulator.get_profit_variance() == 0.0
+  accumulator.add(results[0])
+  assert accumulator.get_profit_variance() == 0.0
+  assert accumulator.get_profit_lowest() == accumulator.get_profit_highest() == results[0].bankroll.profit.total
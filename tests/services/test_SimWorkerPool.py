@@ -0,0 +1,149 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from models.api.CreateSingleSimReq import CreateSingleSimReq
+from models.core.results.SimSingleResults import SimSingleResults
+from services.BlackjackLogger import BlackjackLogger
+from services.SimDataTransformer import SimDataTransformer
+from services.SimWorkerPool import SimWorkerPool
+
+
+@pytest.fixture
+def req_dict():
+  req_path = Path(__file__).resolve().parents[2] / "zz-test-client" / "single.json"
+  req = CreateSingleSimReq(**json.loads(req_path.read_text()))
+  req.bounds.bankroll_goal = None
+  req.bounds.bankroll_fail = None
+  req.bounds.human_time_limit = 3600
+  req.bounds.sim_time_limit = None
+  req.fast_kernel = True
+  return req.model_dump()
+
+@pytest.fixture
+def request_hash(req_dict):
+  return SimDataTransformer().get_request_hash(req_dict)
+
+@pytest.fixture(autouse=True)
+def clear_runner_cache():
+  SimWorkerPool._SimWorkerPool__runners.clear()
+  yield
+  SimWorkerPool._SimWorkerPool__runners.clear()
+
+def test_get_runner_reuses_cached_runner(req_dict, request_hash):
+  runner = SimWorkerPool.get_runner(request_hash, req_dict)
+  assert SimWorkerPool.get_runner(request_hash, req_dict) is runner
+
+def test_get_runner_evicts_least_recently_used(req_dict, request_hash, monkeypatch):
+  monkeypatch.setenv("BJE_SIM_WORKER_CACHE_SIZE", "1")
+  runner = SimWorkerPool.get_runner(request_hash, req_dict)
+  SimWorkerPool.get_runner("some-other-hash", req_dict)
+  assert SimWorkerPool.get_runner(request_hash, req_dict) is not runner
+
+def test_run_one_sync_sim_reuses_runner_across_runs(req_dict, request_hash):
+  first = SimWorkerPool.run_one_sync_sim(request_hash, req_dict)
+  second = SimWorkerPool.run_one_sync_sim(request_hash, req_dict)
+  # A split in the round that reaches the time limit plays one hand past it
+  assert first.hands.counts.total >= 100
+  assert second.hands.counts.total >= 100
+  assert second.bankroll.starting == first.bankroll.starting
+
+def test_pool_keeps_workers_across_runs(req_dict, request_hash):
+  pool = SimWorkerPool(max_workers=1)
+  try:
+    pool.warm_up()
+    executor = pool.get_executor()
+    first = executor.submit(SimWorkerPool.run_one_sync_sim, request_hash, req_dict).result()
+    assert pool.get_executor() is executor
+    second = executor.submit(SimWorkerPool.run_one_sync_sim, request_hash, req_dict).result()
+    assert isinstance(first, SimSingleResults)
+    assert isinstance(second, SimSingleResults)
+  finally:
+    pool.shutdown()
+
+def test_run_sync_sims_returns_aggregate(req_dict, request_hash):
+  aggregate = SimWorkerPool.run_sync_sims(request_hash, req_dict, 3, include_rows=True)
+  assert aggregate.sims_run == 3
+  assert aggregate.sims_unfinished == 3
+  assert len(aggregate.rows) == 3
+  # A sim stops after the round that reaches its time limit, and a split in that round plays an extra hand
+  assert all(r.hands.counts.total >= 100 for r in aggregate.rows)
+  assert aggregate.summed.hands.counts.total == sum(r.hands.counts.total for r in aggregate.rows)
+  assert aggregate.summed.bankroll.profit.total == pytest.approx(sum(r.bankroll.profit.total for r in aggregate.rows))
+
+def test_run_sync_sims_can_skip_rows(req_dict, request_hash):
+  aggregate = SimWorkerPool.run_sync_sims(request_hash, req_dict, 2)
+  assert aggregate.sims_run == 2
+  assert aggregate.rows == []
+
+@pytest.mark.parametrize("fast_kernel", [True, False])
+def test_seeded_sims_dont_depend_on_chunking(req_dict, request_hash, fast_kernel):
+  req_dict["fast_kernel"] = fast_kernel
+  req_dict["bounds"]["human_time_limit"] = 360
+  whole = SimWorkerPool.run_sync_sims(request_hash, req_dict, 4, True, root_seed=7)
+  SimWorkerPool._SimWorkerPool__runners.clear()
+  first = SimWorkerPool.run_sync_sims(request_hash, req_dict, 1, True, root_seed=7, first_sim_index=0)
+  rest = SimWorkerPool.run_sync_sims(request_hash, req_dict, 3, True, root_seed=7, first_sim_index=1)
+  chunked = first.rows + rest.rows
+  assert [r.seed for r in whole.rows] == [r.seed for r in chunked]
+  assert len(set(r.seed for r in whole.rows)) == 4
+  assert [r.bankroll for r in whole.rows] == [r.bankroll for r in chunked]
+  assert [r.hands for r in whole.rows] == [r.hands for r in chunked]
+
+def test_checked_and_production_sims_match(req_dict, request_hash, monkeypatch):
+  req_dict["fast_kernel"] = False
+  req_dict["bounds"]["human_time_limit"] = 360
+  monkeypatch.setenv("BJE_CHECK_EVERY_X_ROUNDS", "7")
+  checked = SimWorkerPool.run_sync_sims(request_hash, req_dict, 3, True, root_seed=11, sim_mode="checked")
+  production = SimWorkerPool.run_sync_sims(request_hash, req_dict, 3, True, root_seed=11, sim_mode="production")
+  assert [r.bankroll for r in checked.rows] == [r.bankroll for r in production.rows]
+  assert [r.hands for r in checked.rows] == [r.hands for r in production.rows]
+
+def test_unknown_sim_mode_raises(req_dict, request_hash, monkeypatch):
+  with pytest.raises(ValueError):
+    SimWorkerPool.get_runner(request_hash, req_dict, "fast")
+  monkeypatch.setenv("BJE_SIM_MODE", "fast")
+  with pytest.raises(ValueError):
+    SimWorkerPool.get_runner(request_hash, req_dict)
+
+def test_runners_are_cached_per_sim_mode(req_dict, request_hash, monkeypatch):
+  monkeypatch.setenv("BJE_SIM_MODE", "production")
+  production = SimWorkerPool.get_runner(request_hash, req_dict)
+  checked = SimWorkerPool.get_runner(request_hash, req_dict, "checked")
+  assert checked is not production
+  assert SimWorkerPool.get_runner(request_hash, req_dict, "production") is production
+  monkeypatch.setenv("BJE_SIM_MODE", "checked")
+  assert SimWorkerPool.get_runner(request_hash, req_dict) is checked
+  assert checked._SingleSimRunner__checked
+  assert not production._SingleSimRunner__checked
+
+def test_prepare_worker_applies_log_level(monkeypatch):
+  monkeypatch.setenv("BJE_LOG_LEVEL", "debug")
+  try:
+    SimWorkerPool.prepare_worker()
+    assert BlackjackLogger.is_debug_enabled()
+  finally:
+    BlackjackLogger.set_level("INFO")
+
+def test_worker_startup_is_within_budget():
+  # Times what prepare_worker() loads, not the interpreter's own imports, which vary too much between CI runners
+  code = (
+    "import sys\n"
+    "from services.SimWorkerPool import SimWorkerPool\n"
+    "print(SimWorkerPool.prepare_worker())\n"
+    "print('models.core.BasicStrategy' in sys.modules)\n"
+  )
+  env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+  # Compiles (and caches) anything jitted first, so the fresh process only measures loading it
+  SimWorkerPool.prepare_worker()
+  output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+  startup_time, imported_basic_strategy = output.stdout.split()
+  startup_budget = float(os.getenv("BJE_WORKER_STARTUP_BUDGET_SECONDS", "1.0"))
+  assert float(startup_time) < startup_budget
+  assert imported_basic_strategy == "False"
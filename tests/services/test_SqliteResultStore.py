@@ -0,0 +1,58 @@
+# pylint: disable=redefined-outer-name
+# pylint: disable=protected-access
+
+import asyncio
+
+import pytest
+from conftest import make_req, make_results
+from services.ResultStore import ResultStore
+from services.SimDataTransformer import SimDataTransformer
+from services.SqliteResultStore import SqliteResultStore
+
+
+@pytest.fixture
+def results():
+  return make_results(30, seed=11)
+
+@pytest.fixture
+def store(tmp_path):
+  store = SqliteResultStore(tmp_path / "results.sqlite3")
+  store.create_schema()
+  return store
+
+def test_stored_results_read_back_in_order(store, results):
+  req = make_req(1000)
+  store.store_simulation_results_bulk(results[:20], req)
+  store.store_simulation_single_result(results[20], req)
+  store.store_simulation_results_bulk(results[21:], make_req(2000))
+  assert store.get_sim_results(req) == results[:21]
+  assert store.get_sim_results(make_req(2000)) == results[21:]
+  assert store.get_sim_results(make_req(3000)) == []
+
+def test_rollup_matches_results_summed_in_python(store, results):
+  req = make_req(1000)
+  for i in range(0, len(results), 7):
+    store.store_simulation_results_bulk(results[i:i + 7], req)
+  expected = SimDataTransformer().get_multi_sim_results(results)
+  actual = store.get_all_sim_results(req)
+  assert actual is not None and expected is not None
+  assert actual.metadata.sims_run == expected.metadata.sims_run
+  assert actual.metadata.success_rate == pytest.approx(expected.metadata.success_rate)
+  assert actual.metadata.total_hands == expected.metadata.total_hands
+  assert actual.metadata.profit_std_dev == pytest.approx(expected.metadata.profit_std_dev)
+  assert actual.average.bankroll.profit.from_true == pytest.approx(expected.average.bankroll.profit.from_true)
+  assert store.get_all_sim_results(make_req(2000)) is None
+
+def test_async_paths_match_sync_paths(store, results):
+  req = make_req(1000)
+  asyncio.run(store.store_simulation_results_bulk_async(results, req))
+  assert store.get_sim_results(req) == results
+  assert asyncio.run(store.get_all_sim_results_async(req)) == store.get_all_sim_results(req)
+
+def test_from_env_picks_the_configured_store(monkeypatch, tmp_path):
+  monkeypatch.setenv("BJE_RESULT_STORE", "sqlite")
+  monkeypatch.setenv("BJE_SQLITE_PATH", str(tmp_path / "results.sqlite3"))
+  assert isinstance(ResultStore.from_env(), SqliteResultStore)
+  monkeypatch.setenv("BJE_RESULT_STORE", "mongodb")
+  with pytest.raises(ValueError):
+    ResultStore.from_env()
@@ -0,0 +1,25 @@
+import numpy as np
+import services.StrategyTables as StrategyTables
+from models.enums.PlayerDecision import PlayerDecision
+
+
+def test_artifact_matches_compiled_tables():
+  loaded = StrategyTables.load_tables()
+  assert loaded is not None
+  built = StrategyTables.build_tables()
+  for loaded_table, built_table in zip(loaded, built):
+    assert loaded_table.dtype == built_table.dtype
+    assert np.array_equal(loaded_table, built_table)
+
+def test_stale_artifact_is_ignored(tmp_path):
+  path = tmp_path / "tables.npz"
+  tables = StrategyTables.build_tables()
+  np.savez_compressed(path, source_hash=np.array("not-the-current-hash"), **tables._asdict())
+  assert StrategyTables.load_tables(path) is None
+
+def test_missing_artifact_is_ignored(tmp_path):
+  assert StrategyTables.load_tables(tmp_path / "missing.npz") is None
+
+def test_masks_round_trip():
+  decisions = [PlayerDecision.DOUBLE_DOWN, PlayerDecision.HIT, PlayerDecision.STAND]
+  assert StrategyTables.get_decisions(StrategyTables.get_mask(decisions)) == decisions